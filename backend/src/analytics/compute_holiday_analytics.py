@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from src.process.match_output import default_match_path, iter_match_frames
+from src.analytics.match_aggregates import count_match_pairs, popularity_frame, top_dishes_frame
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+POPULARITY_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_popularity.csv"
+TOP_DISHES_PATH = PROJECT_ROOT / "data" / "processed" / "top_dishes_per_holiday.csv"
+
+CHUNK_SIZE = 1_000_000
+
+def compute_holiday_analytics(match_path, popularity_path=POPULARITY_PATH, top_dishes_path=TOP_DISHES_PATH):
+    """
+    Fused analytics stage: reads the match output once and writes both
+    holiday_popularity.csv and top_dishes_per_holiday.csv.
+    Returns the number of match rows read.
+    """
+    holiday_counts, item_counts = count_match_pairs(
+        iter_match_frames(match_path, ["holiday_name", "menu_item"], CHUNK_SIZE)
+    )
+
+    popularity_frame(holiday_counts).to_csv(popularity_path, index=False)
+    top_dishes_frame(item_counts).to_csv(top_dishes_path, index=False)
+    return int(holiday_counts.sum())
+
+def main():
+    print("📥 Computing holiday popularity and top dishes (single pass)...")
+
+    compute_holiday_analytics(default_match_path())
+
+    print("✅ Holiday analytics computed")
+    print(f"📁 Popularity saved to: {POPULARITY_PATH}")
+    print(f"📁 Top dishes saved to: {TOP_DISHES_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,40 @@
-import pandas as pd
 from pathlib import Path
 
+from src.process.match_output import default_match_path, iter_match_frames
+from src.analytics.match_aggregates import popularity_frame
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-INPUT_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_menu_matches.csv"
 OUTPUT_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_popularity.csv"
 
 CHUNK_SIZE = 1_000_000  # safe for your system
 
-def main():
-    print("📥 Computing holiday popularity (chunked)...")
-
+def compute_popularity(match_path, output_path=OUTPUT_PATH):
+    """
+    Counts matches per holiday and writes the popularity CSV.
+    Returns the number of match rows read.
+    """
     holiday_counts = {}
+    total_rows = 0
 
-    for chunk in pd.read_csv(INPUT_PATH, chunksize=CHUNK_SIZE):
+    for chunk in iter_match_frames(match_path, ["holiday_name"], CHUNK_SIZE):
         counts = chunk["holiday_name"].value_counts()
+        counts = counts[counts > 0]  # categoricals also list unseen holidays
 
         for holiday, cnt in counts.items():
             holiday_counts[holiday] = holiday_counts.get(holiday, 0) + cnt
 
+        total_rows += len(chunk)
         print(f"Processed {len(chunk)} rows...")
 
-    # Convert to DataFrame
-    popularity_df = (
-        pd.DataFrame(holiday_counts.items(), columns=["holiday_name", "match_count"])
-        .sort_values("match_count", ascending=False)
-        .reset_index(drop=True)
-    )
+    popularity_df = popularity_frame(holiday_counts)
 
-    # Normalize to 0–100
-    max_count = popularity_df["match_count"].max()
-    popularity_df["popularity_score"] = (
-        (popularity_df["match_count"] / max_count) * 100
-    ).round(2)
+    popularity_df.to_csv(output_path, index=False)
+    return total_rows
+
+def main():
+    print("📥 Computing holiday popularity (chunked)...")
 
-    popularity_df.to_csv(OUTPUT_PATH, index=False)
+    compute_popularity(default_match_path())
 
     print("✅ Holiday popularity computed successfully")
     print(f"📁 Output saved to: {OUTPUT_PATH}")
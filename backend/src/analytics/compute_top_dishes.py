@@ -1,44 +1,31 @@
-import pandas as pd
 from pathlib import Path
-from collections import defaultdict
+
+from src.process.match_output import default_match_path, iter_match_frames
+from src.analytics.match_aggregates import count_match_pairs, top_dishes_frame
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-INPUT_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_menu_matches.csv"
 OUTPUT_PATH = PROJECT_ROOT / "data" / "processed" / "top_dishes_per_holiday.csv"
 
 CHUNK_SIZE = 1_000_000
 
-def main():
-    print("📥 Computing top dishes per holiday (chunked)...")
-
-    counts = defaultdict(int)
-
-    for chunk in pd.read_csv(
-        INPUT_PATH,
-        chunksize=CHUNK_SIZE,
-        usecols=["holiday_name", "menu_item"]
-    ):
-        for _, row in chunk.iterrows():
-            key = (row["holiday_name"], row["menu_item"])
-            counts[key] += 1
+def compute_top_dishes(match_path, output_path=OUTPUT_PATH):
+    """
+    Writes the top dishes per holiday. Returns the number of match rows read.
+    """
+    holiday_counts, counts = count_match_pairs(
+        iter_match_frames(match_path, ["holiday_name", "menu_item"], CHUNK_SIZE)
+    )
 
-        print(f"Processed {len(chunk)} rows...")
+    # Keep top dishes per holiday
+    df = top_dishes_frame(counts)
 
-    # Convert to DataFrame
-    df = pd.DataFrame(
-        [(h, m, c) for (h, m), c in counts.items()],
-        columns=["holiday_name", "menu_item", "match_count"]
-    )
+    df.to_csv(output_path, index=False)
+    return int(holiday_counts.sum())
 
-    # Keep top 5 dishes per holiday
-    df = (
-        df.sort_values(["holiday_name", "match_count"], ascending=[True, False])
-          .groupby("holiday_name")
-          .head(5)
-          .reset_index(drop=True)
-    )
+def main():
+    print("📥 Computing top dishes per holiday (chunked)...")
 
-    df.to_csv(OUTPUT_PATH, index=False)
+    compute_top_dishes(default_match_path())
 
     print("✅ Top dishes per holiday computed")
     print(f"📁 Output saved to: {OUTPUT_PATH}")
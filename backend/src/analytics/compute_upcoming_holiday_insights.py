@@ -9,13 +9,15 @@ POPULARITY_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_popularity.csv"
 TOP_DISHES_PATH = PROJECT_ROOT / "data" / "processed" / "top_dishes_per_holiday.csv"
 OUTPUT_PATH = PROJECT_ROOT / "data" / "processed" / "upcoming_holiday_insights.csv"
 
-def main():
-    today = pd.Timestamp(datetime.today().date())
-    print(f"📅 System date detected as: {today.date()}")
-
+def compute_upcoming_insights(today, holidays_csv=HOLIDAYS_CSV, popularity_path=POPULARITY_PATH,
+                              top_dishes_path=TOP_DISHES_PATH, output_path=OUTPUT_PATH):
+    """
+    Joins upcoming holidays with popularity and their top dish, writes the
+    insights CSV and returns it.
+    """
     # Load holidays from CSV
     holidays = pd.read_csv(
-        HOLIDAYS_CSV,
+        holidays_csv,
         parse_dates=["date"]
     )
 
@@ -29,11 +31,11 @@ def main():
     holidays["days_from_today"] = (holidays["date"] - today).dt.days
 
     # Load popularity
-    popularity = pd.read_csv(POPULARITY_PATH)
+    popularity = pd.read_csv(popularity_path)
 
     # Load top dishes (top 1 dish per holiday)
     top_dishes = (
-        pd.read_csv(TOP_DISHES_PATH)
+        pd.read_csv(top_dishes_path)
         .sort_values(["holiday_name", "match_count"], ascending=[True, False])
         .drop_duplicates("holiday_name")
         [["holiday_name", "menu_item"]]
@@ -49,7 +51,14 @@ def main():
         .reset_index(drop=True)
     )
 
-    insights.to_csv(OUTPUT_PATH, index=False)
+    insights.to_csv(output_path, index=False)
+    return insights
+
+def main():
+    today = pd.Timestamp(datetime.today().date())
+    print(f"📅 System date detected as: {today.date()}")
+
+    insights = compute_upcoming_insights(today)
 
     print("✅ Upcoming holiday insights generated")
     print(f"📁 Output saved to: {OUTPUT_PATH}")
@@ -0,0 +1,164 @@
+import heapq
+import pandas as pd
+from collections import Counter
+
+TOP_N_DISHES = 5
+
+
+class MatchAggregator:
+    """
+    Mergeable match counts: per holiday, per (holiday, menu_item) and per
+    (holiday, restaurant_id). Shards build their own aggregator and the
+    parent merges them.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.holiday_counts = Counter()
+        self.item_counts = Counter()
+        self.restaurant_counts = Counter()
+
+    def add_rows(self, rows):
+        # rows follow MATCH_FIELDS: holiday_name, date, keyword, restaurant_id, menu_item, price
+        for r in rows:
+            self.rows += 1
+            self.holiday_counts[r[0]] += 1
+            if isinstance(r[4], str):
+                self.item_counts[(r[0], r[4])] += 1
+            if r[3] is not None:
+                self.restaurant_counts[(r[0], int(r[3]))] += 1
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.holiday_counts.update(other.holiday_counts)
+        self.item_counts.update(other.item_counts)
+        self.restaurant_counts.update(other.restaurant_counts)
+        return self
+
+
+def popularity_frame(holiday_counts):
+    """
+    holiday -> match_count mapping to the holiday_popularity.csv layout.
+    """
+    popularity_df = (
+        pd.DataFrame(list(holiday_counts.items()), columns=["holiday_name", "match_count"])
+        .sort_values(["match_count", "holiday_name"], ascending=[False, True])
+        .reset_index(drop=True)
+    )
+
+    # Normalize to 0–100
+    max_count = popularity_df["match_count"].max()
+    popularity_df["popularity_score"] = (
+        (popularity_df["match_count"] / max_count) * 100
+    ).round(2)
+
+    return popularity_df
+
+
+def restaurant_counts_frame(restaurant_counts):
+    """
+    (holiday, restaurant_id) -> match_count mapping to the
+    holiday_restaurant_counts.csv layout.
+    """
+    return (
+        pd.DataFrame(
+            [(h, r, c) for (h, r), c in restaurant_counts.items()],
+            columns=["holiday_name", "restaurant_id", "match_count"]
+        )
+        .sort_values(["holiday_name", "match_count", "restaurant_id"], ascending=[True, False, True])
+        .reset_index(drop=True)
+    )
+
+
+class _Descending:
+    """
+    Wraps a value so that it sorts in reverse: used to break count ties
+    alphabetically inside a min-heap.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def top_k_items(item_counts, top_n=TOP_N_DISHES):
+    """
+    Keeps the top N (count desc, then item asc) menu items per holiday with
+    one bounded min-heap per holiday, instead of sorting every pair.
+    item_counts: mapping or Series of (holiday, menu_item) -> count.
+    Returns (holiday, menu_item, count) rows ordered for output.
+    """
+    heaps = {}
+
+    for (holiday, item), count in item_counts.items():
+        heap = heaps.get(holiday)
+        if heap is None:
+            heap = heaps[holiday] = []
+
+        if len(heap) < top_n:
+            heapq.heappush(heap, (count, _Descending(item)))
+        elif count >= heap[0][0]:
+            # Root is the weakest kept item; replace it if this one ranks higher
+            heapq.heappushpop(heap, (count, _Descending(item)))
+
+    rows = []
+    for holiday in sorted(heaps):
+        ranked = sorted(heaps[holiday], reverse=True)
+        rows.extend((holiday, d.value, int(count)) for count, d in ranked)
+    return rows
+
+
+def top_dishes_frame(item_counts, top_n=TOP_N_DISHES):
+    """
+    (holiday, menu_item) -> match_count mapping to the
+    top_dishes_per_holiday.csv layout (top N dishes per holiday).
+    """
+    return pd.DataFrame(
+        top_k_items(item_counts, top_n),
+        columns=["holiday_name", "menu_item", "match_count"]
+    )
+
+
+def _combine_pair_counts(partials):
+    if len(partials) == 1:
+        return partials[0]
+    return pd.concat(partials).groupby(level=[0, 1], sort=False, dropna=False).sum()
+
+
+def count_match_pairs(frames, compact_every=8):
+    """
+    One pass over match frames (holiday_name, menu_item columns) with
+    vectorized groupby on the categorical columns. Partial counts are
+    folded together every `compact_every` chunks to keep memory bounded.
+
+    Returns (holiday_counts, item_counts) as Series: matches per holiday,
+    and matches per (holiday, menu_item) with missing items left out.
+    """
+    partials = []
+    rows = 0
+
+    for chunk in frames:
+        partials.append(
+            chunk.groupby(["holiday_name", "menu_item"], observed=True, sort=False, dropna=False).size()
+        )
+        rows += len(chunk)
+        if len(partials) >= compact_every:
+            partials = [_combine_pair_counts(partials)]
+        print(f"Processed {rows} rows...")
+
+    if not partials:
+        empty = pd.Series(dtype="int64")
+        return empty, empty
+
+    pair_counts = _combine_pair_counts(partials)
+    holiday_counts = pair_counts.groupby(level=0, sort=False).sum()
+    item_counts = pair_counts[pair_counts.index.get_level_values(1).notna()]
+
+    return holiday_counts, item_counts
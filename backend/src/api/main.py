@@ -1,30 +1,72 @@
 import random
 random.seed(42)
 
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
+import hashlib
+import time
 import pandas as pd
-from datetime import date
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
 from pathlib import Path
 
 # Services
-from src.services.mock_data_service import generate_mock_social_series, generate_mock_trends
 from src.services.baseline_service import compute_baseline_and_deviation
 from src.services.momentum_service import compute_momentum
 from src.services.confidence_service import compute_confidence_score
-from src.services.action_window_service import estimate_action_window
-from src.services.platform_bias_service import run_platform_bias_engine
 from src.services.social_ingestion_service import (
     ingest_social_signals,
-    aggregate_to_trend_signal,
-    social_signals_to_series,
     compute_platform_signal_agreement,
     detect_platform_leader,
 )
 from src.services.social_ingestion_service import fetch_recent_raw_social_signals
+from src.services.holiday_index import HolidayIndex
+from src.services.pulse_service import (
+    EXPLAIN_FIELDS,
+    PulseSnapshotCache,
+    build_snapshot,
+    compute_pulse,
+    encode_insights_payload,
+    etag_matches,
+    explain_insight,
+    iter_pulse_ndjson,
+    parse_fields,
+    project_items,
+)
+from src.services.pulse_ranking import DEFAULT_LIMIT, MAX_LIMIT, SORT_KEYS, select_page
+from src.db.connection import close_connections
+from src.schemas.pulse_schema import PulseExplanation, PulseResponse
+from src.schemas.social_signal_schema import SOCIAL_SIGNALS
+from src.api.responses import FastJSONResponse
+
+# Absolute paths relative to project root
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+HOLIDAYS_CSV = ROOT_DIR / "data" / "raw" / "food_holidays_static.csv"
+POPULARITY_CSV = ROOT_DIR / "data" / "processed" / "holiday_popularity.csv"
+
+# Loaded once, reloaded only when one of the CSVs changes
+HOLIDAY_INDEX = HolidayIndex(HOLIDAYS_CSV, POPULARITY_CSV)
 
-app = FastAPI(title="FoodLens API", version="0.1.0")
+# Pulse payloads, recomputed in the background (and ingested, in social mode)
+PULSE_CACHE = PulseSnapshotCache()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Preload so the first request doesn't pay for the CSV parse
+    try:
+        HOLIDAY_INDEX.snapshot()
+    except FileNotFoundError:
+        pass
+    PULSE_CACHE.start()
+    yield
+    PULSE_CACHE.stop()
+    close_connections()
+
+
+app = FastAPI(title="FoodLens API", version="0.1.0", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # CORS (frontend later)
 app.add_middleware(
@@ -34,11 +76,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Absolute paths relative to project root
-ROOT_DIR = Path(__file__).resolve().parent.parent.parent
-HOLIDAYS_CSV = ROOT_DIR / "data" / "raw" / "food_holidays_static.csv"
-POPULARITY_CSV = ROOT_DIR / "data" / "processed" / "holiday_popularity.csv"
-
 
 # -------------------------
 # Health
@@ -59,26 +96,9 @@ def upcoming_holidays(
     """
     Returns upcoming food holidays within N days,
     enriched with historical popularity score.
+    Served from the in-memory holiday index (binary search by date).
     """
 
-    if not HOLIDAYS_CSV.exists() or not POPULARITY_CSV.exists():
-        raise HTTPException(
-            status_code=500,
-            detail="Holiday data files missing. Check data/raw and data/processed folders."
-        )
-
-    df_holidays = pd.read_csv(HOLIDAYS_CSV, parse_dates=["date"])
-    df_pop = pd.read_csv(POPULARITY_CSV)
-
-    df = pd.merge(
-        df_holidays,
-        df_pop,
-        left_on="name",
-        right_on="holiday_name",
-        how="left"
-    )
-    df["popularity_score"] = df["popularity_score"].fillna(0)
-
     if base_date:
         requested_date = pd.to_datetime(base_date)
     else:
@@ -87,16 +107,13 @@ def upcoming_holidays(
     # Temporary static year alignment (to be refactored later)
     search_date = requested_date.replace(year=2025)
 
-    df["days_from_today"] = (df["date"] - search_date).dt.days
-
-    upcoming = df[
-        (df["days_from_today"] >= 0) &
-        (df["days_from_today"] <= days)
-    ].sort_values("date")
-
-    return upcoming[["name", "date", "days_from_today", "popularity_score"]].rename(
-        columns={"name": "holiday_name"}
-    ).to_dict(orient="records")
+    try:
+        return HOLIDAY_INDEX.upcoming(search_date, days)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail="Holiday data files missing. Check data/raw and data/processed folders."
+        )
 
 
 # -------------------------
@@ -135,124 +152,141 @@ def debug_confidence():
 # -------------------------
 # THE PULSE (Unified Intelligence Endpoint)
 # -------------------------
-@app.get("/pulse/trends")
-def pulse_trends(source: str = Query(default="mock")):
-    insights = []
-
-    # --- Ingestion ---
-    if source == "social":
-        social_signals = ingest_social_signals()
-        trend_signals = aggregate_to_trend_signal(social_signals)
-
-
-        trends = [
-            {
-                "entity": t.trend,
-                "category": "Social Trend",
-                "spike": True,
-                "holiday_soon": False,  # social trends not tied to holidays (v1)
-            }
-            for t in trend_signals
-        ]
+@app.get("/pulse/trends", response_model=PulseResponse)
+def pulse_trends(
+    source: str = Query(default="mock"),
+    fresh: bool = Query(default=False),
+    response_format: str = Query(default="json", alias="format", pattern="^(json|ndjson)$"),
+    sort: str | None = Query(default=None, pattern="^(" + "|".join(SORT_KEYS) + ")$"),
+    limit: int | None = Query(default=None, ge=1, le=MAX_LIMIT),
+    cursor: str | None = Query(default=None),
+    momentum_state: list[str] | None = Query(default=None),
+    risk_level: list[str] | None = Query(default=None),
+    urgency: list[str] | None = Query(default=None),
+    platform: str | None = Query(default=None),
+    platform_phase: list[str] | None = Query(default=None),
+    platform_urgency: list[str] | None = Query(default=None),
+    fields: list[str] | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+):
+    """
+    Serves the latest precomputed pulse snapshot from memory. Supports
+    If-None-Match (304 when unchanged); fresh=true recomputes first.
+    format=ndjson returns the same insights one per line; for sources
+    without a snapshot they are streamed as each chunk is inferred.
+
+    Any of sort / limit / cursor / filters returns one ranked page instead:
+    top `limit` by `sort` (default confidence_score, per-platform adjusted
+    confidence when `platform` is set) plus `next_cursor`. Filters take
+    repeated or comma-separated values. Sources without a snapshot are
+    computed for the request and paged the same way.
+
+    fields= (repeated or comma-separated insight keys) returns only those
+    keys per insight, plus entity; explanations are then left out unless
+    asked for (see /pulse/trends/{entity}/explain).
+    """
+    try:
+        fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filters = {
+        name: [v for value in values for v in value.split(",")]
+        for name, values in {
+            "momentum_state": momentum_state,
+            "risk_level": risk_level,
+            "urgency": urgency,
+            "platform_phase": platform_phase,
+            "platform_urgency": platform_urgency,
+        }.items()
+        if values
+    }
+    paged = bool(sort or limit or cursor or filters or platform)
+
+    cached = source in PULSE_CACHE.sources
+    if not cached and not paged:
+        # Unknown sources fall back to the mock pipeline, as before; not cached
+        if response_format == "ndjson":
+            return StreamingResponse(iter_pulse_ndjson(source, fields=fields), media_type="application/x-ndjson")
+        return FastJSONResponse(compute_pulse(source, fields=fields))
+
+    if not cached:
+        # Pages still need the sort/filter columns: index this one computation
+        snapshot = build_snapshot(compute_pulse(source), time.time())
+    elif fresh:
+        snapshot = PULSE_CACHE.refresh(source, newer_than=time.time())
     else:
-        social_signals = None
-        trends = generate_mock_trends()
-
-    # --- Inference Loop ---
-    for t in trends:
-
-        # 1) Time series
-        if source == "social":
-            from src.services.social_ingestion_service import build_entity_time_series_from_db
-            series = build_entity_time_series_from_db(t["entity"], days=14)
-        else:
-            series = generate_mock_social_series(
-                days=14,
-                base=100,
-                spike=t.get("spike", True)
-            )
-
-        # 2) Baseline vs current
-        history = series[:-1]
-        current_value = series[-1]
-        baseline_result = compute_baseline_and_deviation(history, current_value)
-
-        # 3) Momentum
-        momentum = compute_momentum(series)
-
-        # 4) Signal agreement
-        if source == "social":
-            signal_agreement = compute_platform_signal_agreement(social_signals)
-        else:
-            signal_agreement = 0.8 if t["holiday_soon"] else 0.5
-
-        # 5) Context confirmation
-        context_confirmation = 1.0 if t["holiday_soon"] else 0.2
-
-        # 6) Platform leader
-        if source == "social":
-            platform_leader = detect_platform_leader(social_signals)
-        else:
-            platform_leader = None
-
-        # 7) Confidence
-        confidence = compute_confidence_score(
-            deviation_score=baseline_result["deviation_score"],
-            momentum_state=momentum["momentum_state"],
-            signal_agreement=signal_agreement,
-            context_confirmation=context_confirmation,
-            platform_leader=platform_leader,
-        )
+        snapshot = PULSE_CACHE.get(source)
+
+    etag = snapshot.etag
+    if paged or fields or response_format == "ndjson":
+        # A page, projection or NDJSON body is fixed by the snapshot plus the query that selected it
+        page_key = repr((etag, response_format, sort, limit, cursor, sorted(filters.items()), platform, fields))
+        etag = '"' + hashlib.sha1(page_key.encode("utf-8")).hexdigest() + '"'
+
+    headers = {
+        "ETag": etag,
+        "X-Pulse-Version": str(snapshot.version),
+        "X-Pulse-Generated-At": datetime.fromtimestamp(snapshot.generated_at, timezone.utc).isoformat(),
+        "Cache-Control": "no-cache",  # clients may store it, but revalidate with the ETag
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if not paged and not fields and response_format == "json":
+        return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
-        # 8) Action window
-        action_window = estimate_action_window(
-            momentum_state=momentum["momentum_state"],
-            velocity=momentum["velocity"],
-            acceleration=momentum["acceleration"],
-            deviation_score=baseline_result["deviation_score"],
+    if cached:
+        encoded = PULSE_CACHE.items(source, snapshot, fields)
+    else:
+        encoded = project_items(snapshot, fields) if fields else snapshot.index.items
+    if not paged and response_format == "ndjson":
+        return Response(content=b"".join(item + b"\n" for item in encoded),
+                        media_type="application/x-ndjson", headers=headers)
+    if not paged:
+        return Response(content=encode_insights_payload(source, encoded), media_type="application/json", headers=headers)
+
+    try:
+        positions, next_cursor = select_page(
+            snapshot.index,
+            sort=sort or "confidence_score",
+            limit=limit or DEFAULT_LIMIT,
+            cursor=cursor,
+            filters=filters,
+            platform=platform,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    items = [encoded[i] for i in positions]
+    if response_format == "ndjson":
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return Response(content=b"".join(item + b"\n" for item in items),
+                        media_type="application/x-ndjson", headers=headers)
+
+    body = encode_insights_payload(source, items, next_cursor=next_cursor)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/pulse/trends/{entity}/explain", response_model=PulseExplanation)
+def pulse_explain(entity: str, source: str = Query(default="mock")):
+    """
+    The explanation and action-window wording for one entity, with the
+    scores behind them, for views that list insights without them.
+    """
+    if source in PULSE_CACHE.sources:
+        index = PULSE_CACHE.get(source).index
+        position = index.positions.get(entity)
+        insight = None if position is None else index.insights[position]
+    else:
+        insights = compute_pulse(source, fields=EXPLAIN_FIELDS)["insights"]
+        insight = next((i for i in insights if i["entity"] == entity), None)
+
+    if insight is None:
+        raise HTTPException(status_code=404, detail=f"No insight for entity: {entity}")
+    return FastJSONResponse(explain_insight(insight))
 
-        # 9) Action hint
-        if confidence["confidence_score"] > 0.8 and momentum["momentum_state"] == "EMERGING":
-            action_hint = "Launch promotion (early window)"
-        elif confidence["confidence_score"] > 0.6 and momentum["momentum_state"] == "PEAKING":
-            action_hint = "Boost visibility (short window)"
-        elif momentum["momentum_state"] == "FATIGUED":
-            action_hint = "Avoid heavy spend; trend is cooling"
-        else:
-            action_hint = "Monitor"
-
-        # 10) Platform bias
-        platform_bias = run_platform_bias_engine({
-            "momentum_state": momentum["momentum_state"],
-            "velocity": momentum["velocity"],
-            "confidence_score": confidence["confidence_score"],
-        })
-
-        insights.append({
-            "entity": t["entity"],
-            "category": t["category"],
-            "series": series,
-            "baseline": baseline_result["baseline"],
-            "current_value": current_value,
-            "deviation_score": baseline_result["deviation_score"],
-            "velocity": momentum["velocity"],
-            "acceleration": momentum["acceleration"],
-            "momentum_state": momentum["momentum_state"],
-            "confidence_score": confidence["confidence_score"],
-            "risk_level": confidence["risk_level"],
-            "explanation": confidence["explanation"],
-            "action_hint": action_hint,
-            "action_window_hours": action_window["action_window_hours"],
-            "urgency": action_window["urgency"],
-            "window_explanation": action_window["window_explanation"],
-            "platform_bias": platform_bias,
-        })
 
-    return {
-        "pulse_generated_at": source,
-        "insights": insights
-    }
 # -------------------------
 # DEBUG: Pulse Internals (Social Ingestion & Platform Signals)
 # -------------------------
@@ -270,12 +304,13 @@ def pulse_debug():
         signal_agreement = compute_platform_signal_agreement(social_signals)
         platform_leader = detect_platform_leader(social_signals)
 
-    return {
-        "raw_social_signals": [s.dict() for s in social_signals],
+    return FastJSONResponse({
+        # One compiled pydantic-core call for the whole list
+        "raw_social_signals": SOCIAL_SIGNALS.dump_python(social_signals, mode="json"),
         "platform_velocity": platform_velocity,
         "signal_agreement": signal_agreement,
         "platform_leader": platform_leader,
-    }
+    })
 
 @app.get("/debug/social/raw")
 def debug_raw_social(limit: int = 10):
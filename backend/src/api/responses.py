@@ -0,0 +1,14 @@
+# src/api/responses.py
+
+from fastapi.responses import JSONResponse
+
+from src.core.json_codec import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the fast encoder (orjson when installed),
+    NumPy-aware. Return it directly to also skip FastAPI's jsonable_encoder.
+    """
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,82 @@
+# src/benchmarks/bench_analytics.py
+import argparse
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from src.benchmarks.bench_matching import load_benchmark_holidays, make_synthetic_menus
+from src.benchmarks.timing import timed
+from src.analytics.match_aggregates import count_match_pairs, popularity_frame, top_dishes_frame
+from src.process.match_holidays_to_menus import build_holiday_automaton, iter_matches, normalized_menu_rows
+from src.process.match_output import open_match_writer, iter_match_frames
+
+
+def _legacy_analytics(csv_path):
+    # compute_holiday_popularity + compute_top_dishes as they used to run:
+    # two full CSV parses and an iterrows loop over every match
+    holiday_counts = {}
+    for chunk in pd.read_csv(csv_path, chunksize=1_000_000):
+        for holiday, cnt in chunk["holiday_name"].value_counts().items():
+            holiday_counts[holiday] = holiday_counts.get(holiday, 0) + cnt
+
+    counts = defaultdict(int)
+    for chunk in pd.read_csv(csv_path, chunksize=1_000_000, usecols=["holiday_name", "menu_item"]):
+        for _, row in chunk.iterrows():
+            counts[(row["holiday_name"], row["menu_item"])] += 1
+
+    return popularity_frame(holiday_counts), top_dishes_frame(counts)
+
+
+def _fused_analytics(path):
+    holiday_counts, item_counts = count_match_pairs(
+        iter_match_frames(path, ["holiday_name", "menu_item"])
+    )
+    return popularity_frame(holiday_counts), top_dishes_frame(item_counts)
+
+
+def run(rows: int, seed: int):
+    holidays = load_benchmark_holidays()
+    menus = make_synthetic_menus(holidays, rows, seed)
+    automaton, targets = build_holiday_automaton(holidays)
+    matches = list(iter_matches(normalized_menu_rows(menus), automaton, targets))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "matches.csv"
+        parquet_path = Path(tmp) / "matches.parquet"
+        for path in (csv_path, parquet_path):
+            writer = open_match_writer(path)
+            writer.write_rows(matches)
+            writer.close()
+
+        legacy_s, (legacy_pop, legacy_top) = timed(_legacy_analytics, csv_path)
+        fused_csv_s, (csv_pop, csv_top) = timed(_fused_analytics, csv_path)
+        fused_pq_s, (pq_pop, pq_top) = timed(_fused_analytics, parquet_path)
+
+    same = all(
+        a.to_csv(index=False) == b.to_csv(index=False)
+        for a, b in [(legacy_pop, csv_pop), (legacy_pop, pq_pop), (legacy_top, csv_top), (legacy_top, pq_top)]
+    )
+
+    print(f"💾 Match rows: {len(matches)} (from {rows} synthetic menu items)")
+    print(f"{'analytics':<40} {'seconds':>9}")
+    print(f"{'two scripts, CSV + iterrows (before)':<40} {legacy_s:>9.2f}")
+    print(f"{'fused single pass, CSV':<40} {fused_csv_s:>9.2f}")
+    print(f"{'fused single pass, Parquet':<40} {fused_pq_s:>9.2f}")
+    print(f"{'✅' if same else '❌'} Outputs identical: {same}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fused holiday analytics stage.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic menu rows to match")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not run(args.rows, args.seed):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
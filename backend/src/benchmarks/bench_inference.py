@@ -0,0 +1,147 @@
+# src/benchmarks/bench_inference.py
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.services.mock_data_service import generate_mock_social_series
+from src.services.baseline_service import BASELINE_WINDOWS, compute_baseline_and_deviation
+from src.services.momentum_service import compute_momentum
+from src.services.confidence_service import compute_confidence_score
+from src.services.action_window_service import estimate_action_window
+from src.services.platform_bias_service import run_platform_bias_engine
+from src.services.batch_inference_service import run_batch_inference, batch_to_insights
+
+
+def _scalar_baselines(series):
+    # One compute_baseline_and_deviation per trailing window, as BaselineStore.multi_window
+    baselines = {}
+    for window in BASELINE_WINDOWS:
+        points = min(window, len(series) - 1)
+        result = compute_baseline_and_deviation(series[-1 - points:-1], series[-1])
+        note = result["baseline"]["note"]
+        if note is None and points < window:
+            note = f"Only {points} days of history for a {window}-day baseline."
+        baselines[f"{window}d"] = {**result["baseline"], "note": note, "deviation_score": result["deviation_score"]}
+    return baselines
+
+
+def _scalar_insight(t, series, signal_agreement, context_confirmation):
+    # The per-entity body of the /pulse/trends loop before batching
+    history = series[:-1]
+    current_value = series[-1]
+    baseline_result = compute_baseline_and_deviation(history, current_value)
+    momentum = compute_momentum(series)
+    confidence = compute_confidence_score(
+        deviation_score=baseline_result["deviation_score"],
+        momentum_state=momentum["momentum_state"],
+        signal_agreement=signal_agreement,
+        context_confirmation=context_confirmation,
+        platform_leader=None,
+    )
+    action_window = estimate_action_window(
+        momentum_state=momentum["momentum_state"],
+        velocity=momentum["velocity"],
+        acceleration=momentum["acceleration"],
+        deviation_score=baseline_result["deviation_score"],
+    )
+
+    if confidence["confidence_score"] > 0.8 and momentum["momentum_state"] == "EMERGING":
+        action_hint = "Launch promotion (early window)"
+    elif confidence["confidence_score"] > 0.6 and momentum["momentum_state"] == "PEAKING":
+        action_hint = "Boost visibility (short window)"
+    elif momentum["momentum_state"] == "FATIGUED":
+        action_hint = "Avoid heavy spend; trend is cooling"
+    else:
+        action_hint = "Monitor"
+
+    platform_bias = run_platform_bias_engine({
+        "momentum_state": momentum["momentum_state"],
+        "velocity": momentum["velocity"],
+        "confidence_score": confidence["confidence_score"],
+    })
+
+    return {
+        "entity": t["entity"],
+        "category": t["category"],
+        "series": series,
+        "baseline": baseline_result["baseline"],
+        "current_value": current_value,
+        "deviation_score": baseline_result["deviation_score"],
+        "baselines": _scalar_baselines(series),
+        "velocity": momentum["velocity"],
+        "acceleration": momentum["acceleration"],
+        "momentum_state": momentum["momentum_state"],
+        "confidence_score": confidence["confidence_score"],
+        "risk_level": confidence["risk_level"],
+        "explanation": confidence["explanation"],
+        "action_hint": action_hint,
+        "action_window_hours": action_window["action_window_hours"],
+        "urgency": action_window["urgency"],
+        "window_explanation": action_window["window_explanation"],
+        "platform_bias": platform_bias,
+    }
+
+
+def make_entities(n: int, days: int, seed: int):
+    """
+    Mock trends with a mix of spiking and flat series, as the mock source makes them.
+    """
+    random.seed(seed)
+    trends = []
+    series = []
+    for i in range(n):
+        spike = random.random() < 0.5
+        trends.append({"entity": f"entity_{i}", "category": "Benchmark", "holiday_soon": random.random() < 0.3})
+        series.append(generate_mock_social_series(days=days, base=random.randint(1, 500), spike=spike))
+    return trends, series
+
+
+def run(entities: int, days: int, seed: int):
+    trends, series = make_entities(entities, days, seed)
+    signal_agreement = [0.8 if t["holiday_soon"] else 0.5 for t in trends]
+    context_confirmation = [1.0 if t["holiday_soon"] else 0.2 for t in trends]
+
+    start = time.perf_counter()
+    scalar = [
+        _scalar_insight(t, s, sa, cc)
+        for t, s, sa, cc in zip(trends, series, signal_agreement, context_confirmation)
+    ]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = run_batch_inference(
+        np.array(series, dtype=np.float64),
+        signal_agreement=np.array(signal_agreement),
+        context_confirmation=np.array(context_confirmation),
+    )
+    arrays_seconds = time.perf_counter() - start
+    batch = batch_to_insights(trends, series, result)
+    batch_seconds = time.perf_counter() - start
+
+    same = scalar == batch
+
+    print(f"📈 Entities: {entities} x {days} days")
+    print(f"{'engine':<34} {'seconds':>9} {'entities/s':>12}")
+    print(f"{'scalar services loop (before)':<34} {scalar_seconds:>9.3f} {entities / scalar_seconds:>12,.0f}")
+    print(f"{'batch arrays only':<34} {arrays_seconds:>9.3f} {entities / arrays_seconds:>12,.0f}")
+    print(f"{'batch + insight dicts (after)':<34} {batch_seconds:>9.3f} {entities / batch_seconds:>12,.0f}")
+    print(f"{'✅' if same else '❌'} Results identical: {same}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch vs per-entity trend inference.")
+    parser.add_argument("--entities", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for n in args.entities:
+        run(n, args.days, args.seed)
+        print()
+
+
+if __name__ == "__main__":
+    main()
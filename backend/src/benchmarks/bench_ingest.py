@@ -0,0 +1,141 @@
+# src/benchmarks/bench_ingest.py
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.db.connection import close_connections, get_connection
+from src.db.init_db import init_db
+from src.schemas.social_signal_schema import SocialSignal
+from src.services.social_ingestion_service import save_raw_social_signals
+
+PLATFORMS = ["tiktok", "instagram", "youtube"]
+FOODS = ["nachos", "ramen", "boba", "birria", "matcha", "dumplings", "croissant", "tteokbokki"]
+
+TARGET_ROWS_PER_S = 50_000
+
+
+def make_signals(n: int, seed: int):
+    """
+    `n` signals with unique (platform, post_id), shaped like DummySocialSource output.
+    """
+    random.seed(seed)
+    signals = []
+    for i in range(n):
+        platform = PLATFORMS[i % len(PLATFORMS)]
+        foods = random.sample(FOODS, random.randint(1, 2))
+        signals.append(SocialSignal(
+            platform=platform,
+            post_id=f"{platform}_{i}",
+            timestamp="2026-02-15T10:00:00Z",
+            text=f"Trending {foods[0]} content",
+            hashtags=[f"#{f}" for f in foods] + ["#foodtrend"],
+            food_entities=foods,
+            engagement={
+                "likes": random.randint(300, 5000),
+                "comments": random.randint(20, 300),
+                "shares": random.randint(5, 80),
+            },
+            creator_followers=random.randint(5000, 150000),
+            geo="US",
+        ))
+    return signals
+
+
+def _per_row_save(signals, db_path):
+    # The writer before bulk upserts: one INSERT and one json.dumps(s.dict()) per signal
+    conn = get_connection(db_path)
+    with conn:
+        cursor = conn.cursor()
+        entity_rows = []
+        for s in signals:
+            backdated_time = datetime.utcnow() - timedelta(days=random.randint(0, 6))
+            cursor.execute("""
+                INSERT INTO raw_social_signals (
+                    platform, post_id, posted_at, text,
+                    hashtags, food_entities,
+                    likes, comments, shares, views,
+                    creator_followers, geo, ingested_at,
+                    raw_payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                s.platform, s.post_id, s.timestamp, s.text,
+                json.dumps(s.hashtags), json.dumps(s.food_entities),
+                s.engagement.get("likes", 0), s.engagement.get("comments", 0),
+                s.engagement.get("shares", 0), s.engagement.get("views", 0),
+                s.creator_followers, s.geo, backdated_time.isoformat(),
+                json.dumps(s.dict()),
+            ))
+            entity_rows.extend((food, cursor.lastrowid) for food in set(s.food_entities))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO social_signal_entities (entity, signal_id) VALUES (?, ?)",
+            entity_rows,
+        )
+
+
+def _counts(db_path):
+    conn = get_connection(db_path)
+    signals = conn.execute("SELECT COUNT(*) FROM raw_social_signals").fetchone()[0]
+    mappings = conn.execute("SELECT COUNT(*) FROM social_signal_entities").fetchone()[0]
+    return signals, mappings
+
+
+def _fresh_db(root: Path, name: str):
+    db_path = root / name
+    init_db(db_path)
+    return db_path
+
+
+def run(n: int, batch_size: int, seed: int):
+    signals = make_signals(n, seed)
+    expected_mappings = sum(len(set(s.food_entities)) for s in signals)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        per_row_db = _fresh_db(root, "per_row.db")
+        start = time.perf_counter()
+        _per_row_save(signals, per_row_db)
+        per_row_seconds = time.perf_counter() - start
+
+        bulk_db = _fresh_db(root, "bulk.db")
+        first = save_raw_social_signals(signals, batch_size=batch_size, db_path=bulk_db)
+
+        # Same posts again with fresh counters: rows are updated, not duplicated
+        for s in signals:
+            s.engagement["likes"] += 1
+        again = save_raw_social_signals(signals, batch_size=batch_size, db_path=bulk_db)
+
+        rows, mappings = _counts(bulk_db)
+        likes = get_connection(bulk_db).execute("SELECT SUM(likes) FROM raw_social_signals").fetchone()[0]
+        idempotent = rows == n and mappings == expected_mappings and likes == sum(s.engagement["likes"] for s in signals)
+        close_connections()
+
+    print(f"📥 Signals: {n:,} (batch size {batch_size:,})")
+    print(f"{'writer':<30} {'seconds':>9} {'rows/s':>12}")
+    print(f"{'per-row inserts (before)':<30} {per_row_seconds:>9.3f} {n / per_row_seconds:>12,.0f}")
+    print(f"{'bulk upsert, new rows':<30} {first['seconds']:>9.3f} {first['rows_per_s']:>12,.0f}")
+    print(f"{'bulk upsert, re-ingest':<30} {again['seconds']:>9.3f} {again['rows_per_s']:>12,.0f}")
+    print(f"{'✅' if idempotent else '❌'} Re-ingest kept {rows:,} rows / {mappings:,} entity links, counters updated: {idempotent}")
+    met = min(first["rows_per_s"], again["rows_per_s"]) >= TARGET_ROWS_PER_S
+    print(f"{'✅' if met else '⚠️'} Target {TARGET_ROWS_PER_S:,} rows/s: {'met' if met else 'missed'}")
+    return idempotent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk upserts into raw_social_signals.")
+    parser.add_argument("--signals", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for n in args.signals:
+        run(n, args.batch_size, args.seed)
+        print()
+
+
+if __name__ == "__main__":
+    main()
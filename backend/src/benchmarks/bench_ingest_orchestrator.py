@@ -0,0 +1,84 @@
+# src/benchmarks/bench_ingest_orchestrator.py
+import argparse
+import asyncio
+import inspect
+import tempfile
+import time
+from pathlib import Path
+
+from src.db.connection import close_connections, get_connection
+from src.db.init_db import init_db
+from src.ingestion.fake_ingestors import BlockingFakeIngestor, FakeLatencyIngestor
+from src.ingestion.orchestrator import ingest_all, register_source
+from src.services.social_ingestion_service import save_raw_social_signals
+
+
+def make_ingestors(slow_latency_s: float, posts: int):
+    # Two quick platforms (one async, one blocking + rate limited) and one slow, flaky one
+    return [
+        (FakeLatencyIngestor("tiktok", latency_s=0.02, jitter_s=0.01, posts_per_keyword=posts), {}),
+        (BlockingFakeIngestor("instagram", latency_s=0.05, jitter_s=0.02, posts_per_keyword=posts), {"rate_per_s": 50, "burst": 5}),
+        (FakeLatencyIngestor("youtube", latency_s=slow_latency_s, posts_per_keyword=posts, fail_rate=0.05), {"max_concurrency": 2}),
+    ]
+
+
+def sequential(ingestors, keywords, db_path):
+    # How sources are called today: one call after another, one write per call
+    for ingestor, _ in ingestors:
+        for keyword in keywords:
+            try:
+                signals = ingestor.fetch_recent_signals(keyword)
+                if inspect.isawaitable(signals):
+                    signals = asyncio.run(signals)
+            except ConnectionError:
+                continue
+            save_raw_social_signals(signals, db_path=db_path)
+
+
+def _row_count(db_path):
+    return get_connection(db_path).execute("SELECT COUNT(*) FROM raw_social_signals").fetchone()[0]
+
+
+def run(keywords: int, slow_latency_s: float, posts: int, max_concurrency: int):
+    keyword_list = [f"food_{i}" for i in range(keywords)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seq_db = Path(tmp) / "sequential.db"
+        init_db(seq_db)
+        start = time.perf_counter()
+        sequential(make_ingestors(slow_latency_s, posts), keyword_list, seq_db)
+        seq_seconds = time.perf_counter() - start
+        seq_rows = _row_count(seq_db)
+
+        async_db = Path(tmp) / "orchestrated.db"
+        init_db(async_db)
+        sources = [register_source(i, **limits) for i, limits in make_ingestors(slow_latency_s, posts)]
+        stats = ingest_all(sources, keyword_list, max_concurrency=max_concurrency, db_path=async_db)
+        async_rows = _row_count(async_db)
+        close_connections()
+
+    print(f"📡 {len(sources)} fake sources x {keywords} keywords ({posts} posts each, slow source {slow_latency_s}s/call)")
+    print(f"{'source':<12} {'calls':>6} {'signals':>8} {'errors':>7} {'done at s':>10}")
+    for name, s in stats["sources"].items():
+        print(f"{name:<12} {s['calls']:>6} {s['signals']:>8} {s['errors']:>7} {s['finished_at']:>10.2f}")
+    print(f"{'sequential (before)':<28} {seq_seconds:>8.2f}s {seq_rows:>8,} rows")
+    print(f"{'orchestrated (after)':<28} {stats['seconds']:>8.2f}s {async_rows:>8,} rows in {stats['writes']} writes")
+
+    same = seq_rows == async_rows
+    print(f"{'✅' if same else '❌'} Same rows written: {same}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark async ingestion against sequential source calls.")
+    parser.add_argument("--keywords", type=int, default=30)
+    parser.add_argument("--slow-latency", type=float, default=0.5)
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    run(args.keywords, args.slow_latency, args.posts, args.max_concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# src/benchmarks/bench_json_encode.py
+import argparse
+import json
+import warnings
+
+from fastapi.encoders import jsonable_encoder
+
+from src.benchmarks.bench_pulse_snapshot import make_compute
+from src.benchmarks.timing import p50_ms
+from src.core.json_codec import dumps, orjson
+from src.ingestion.fake_ingestors import FakeLatencyIngestor
+from src.schemas.pulse_schema import PulseInsight, PulseResponse
+from src.schemas.social_signal_schema import SOCIAL_SIGNALS
+
+
+def _stdlib_dumps(content) -> bytes:
+    # starlette's JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _row(label, ms, baseline_ms, body):
+    print(f"{label:<44} {ms:>10.1f} {baseline_ms / ms:>8.1f}x {len(body) / 1024:>10.0f}")
+
+
+def run(entities: int, seed: int, repeat: int):
+    payload = make_compute(entities, 14, seed)("mock")
+    # The payload must still be what docs/api_contract_v1.md describes
+    for insight in payload["insights"]:
+        PulseInsight.model_validate(insight)
+    model = PulseResponse.model_validate(payload)
+
+    old_body = _stdlib_dumps(jsonable_encoder(payload))
+    new_body = dumps(payload)
+    same = json.loads(old_body) == json.loads(new_body)
+
+    print(f"📦 /pulse/trends payload: {entities:,} insights (encoder: {'orjson' if orjson else 'stdlib json'})")
+    print(f"{'path':<44} {'p50 ms':>10} {'speedup':>9} {'KiB':>10}")
+    old = p50_ms(lambda: _stdlib_dumps(jsonable_encoder(payload)), repeat)
+    _row("jsonable_encoder + json.dumps (before)", old, old, old_body)
+    _row("json.dumps only", p50_ms(lambda: _stdlib_dumps(payload), repeat), old, old_body)
+    _row("dumps (after)", p50_ms(lambda: dumps(payload), repeat), old, new_body)
+    _row("typed: PulseResponse model -> dump_json", p50_ms(lambda: model.model_dump_json(), repeat), old,
+         model.model_dump_json())
+    print(f"{'✅' if same else '❌'} Decoded bodies identical: {same}")
+
+    signals = FakeLatencyIngestor("tiktok", posts_per_keyword=entities // 10, seed=seed)
+    signals = [s for keyword in range(10) for s in signals._signals(f"food{keyword}")]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        old = p50_ms(lambda: _stdlib_dumps(jsonable_encoder({"raw_social_signals": [s.dict() for s in signals]})), repeat)
+    new = p50_ms(lambda: dumps({"raw_social_signals": SOCIAL_SIGNALS.dump_python(signals, mode="json")}), repeat)
+    print(f"\n📦 /pulse/debug signals: {len(signals):,}")
+    print(f"{'.dict() + jsonable_encoder + json.dumps (before)':<50} {old:>8.1f} ms")
+    print(f"{'SOCIAL_SIGNALS.dump_python + dumps (after)':<50} {new:>8.1f} ms  ({old / new:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API response encoding: before vs fast JSON path.")
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.entities, args.seed, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
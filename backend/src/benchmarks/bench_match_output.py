@@ -0,0 +1,92 @@
+# src/benchmarks/bench_match_output.py
+import argparse
+import csv
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from src.benchmarks.bench_matching import load_benchmark_holidays, make_synthetic_menus
+from src.benchmarks.timing import timed
+from src.process.match_holidays_to_menus import build_holiday_automaton, iter_matches, normalized_menu_rows
+from src.process.match_output import MATCH_FIELDS, open_match_writer, iter_match_frames
+
+
+def _size(path):
+    path = Path(path)
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.glob("*"))
+    return path.stat().st_size
+
+
+def _write_legacy_csv(path, rows):
+    # One DictWriter.writerow call per match, as the matcher used to do
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MATCH_FIELDS)
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(dict(zip(MATCH_FIELDS, r)))
+
+
+def _write_batched(path, rows, batch_size=200_000):
+    writer = open_match_writer(path)
+    for start in range(0, len(rows), batch_size):
+        writer.write_rows(rows[start:start + batch_size])
+    writer.close()
+
+
+def _read_popularity_legacy(path):
+    # compute_holiday_popularity used to parse every column
+    for chunk in pd.read_csv(path, chunksize=1_000_000):
+        chunk["holiday_name"].value_counts()
+
+
+def _read_columns(path, columns):
+    for chunk in iter_match_frames(path, columns):
+        chunk[columns[0]].value_counts()
+
+
+def run(rows: int, seed: int):
+    holidays = load_benchmark_holidays()
+    menus = make_synthetic_menus(holidays, rows, seed)
+    automaton, targets = build_holiday_automaton(holidays)
+    matches = list(iter_matches(normalized_menu_rows(menus), automaton, targets))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_csv = os.path.join(tmp, "legacy.csv")
+        batched_csv = os.path.join(tmp, "batched.csv")
+        parquet = os.path.join(tmp, "matches.parquet")
+
+        results = [
+            ("CSV, writerow per match", legacy_csv, timed(_write_legacy_csv, legacy_csv, matches)[0]),
+            ("CSV, batched", batched_csv, timed(_write_batched, batched_csv, matches)[0]),
+            ("Parquet zstd, dictionary", parquet, timed(_write_batched, parquet, matches)[0]),
+        ]
+
+        print(f"💾 Match rows: {len(matches)} (from {rows} synthetic menu items)")
+        print(f"{'format':<26} {'size MB':>9} {'write s':>9}")
+        for name, path, seconds in results:
+            print(f"{name:<26} {_size(path) / 1e6:>9.2f} {seconds:>9.2f}")
+
+        print(f"\n{'downstream read':<44} {'seconds':>9}")
+        reads = [
+            ("popularity: CSV, all columns (before)", _read_popularity_legacy, legacy_csv),
+            ("popularity: Parquet, holiday_name", lambda p: _read_columns(p, ["holiday_name"]), parquet),
+            ("top dishes: CSV, 2 columns (before)", lambda p: _read_columns(p, ["holiday_name", "menu_item"]), legacy_csv),
+            ("top dishes: Parquet, 2 columns", lambda p: _read_columns(p, ["holiday_name", "menu_item"]), parquet),
+        ]
+        for name, fn, path in reads:
+            print(f"{name:<44} {timed(fn, path)[0]:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV and Parquet match output size, write and read time.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic menu rows to match")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
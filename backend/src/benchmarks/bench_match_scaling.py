@@ -0,0 +1,75 @@
+# src/benchmarks/bench_match_scaling.py
+import argparse
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.benchmarks.bench_matching import load_benchmark_holidays, make_synthetic_menus
+from src.process.match_holidays_to_menus import match_menus
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def run(rows: int, max_workers: int, shard_size: int, seed: int):
+    holidays = load_benchmark_holidays()
+    menus = make_synthetic_menus(holidays, rows, seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "uber_eats.db"
+        conn = sqlite3.connect(db_path)
+        menus.drop(columns=["clean_name", "clean_description"]).to_sql("menus", conn, index=False)
+        conn.close()
+
+        print(f"🍽 Menu rows: {rows} | Shard size: {shard_size} | CPUs: {os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>9} {'rows/s':>12} {'speedup':>8}  output")
+
+        baseline_seconds = None
+        reference_digest = None
+        deterministic = True
+
+        for workers in range(1, max_workers + 1):
+            output_path = Path(tmp) / f"matches_{workers}.csv"
+
+            start = time.perf_counter()
+            total_menus, _, _ = match_menus(db_path, holidays, output_path, workers=workers, shard_size=shard_size)
+            elapsed = time.perf_counter() - start
+
+            digest = _file_digest(output_path)
+            if reference_digest is None:
+                reference_digest = digest
+                baseline_seconds = elapsed
+            same = digest == reference_digest
+            deterministic &= same
+
+            print(
+                f"{workers:>8} {elapsed:>9.2f} {total_menus / elapsed:>12,.0f} "
+                f"{baseline_seconds / elapsed:>7.2f}x  {'identical' if same else 'DIFFERENT'}"
+            )
+
+    print(f"{'✅' if deterministic else '❌'} Output identical across worker counts: {deterministic}")
+    return deterministic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput scaling of sharded holiday-menu matching.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not run(args.rows, args.max_workers, args.shard_size, args.seed):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
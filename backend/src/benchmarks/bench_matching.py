@@ -0,0 +1,106 @@
+# src/benchmarks/bench_matching.py
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.process.generate_holiday_keywords import generate_keyword_list
+from src.process.match_holidays_to_menus import (
+    normalize_text,
+    build_holiday_automaton,
+    iter_matches,
+    normalized_menu_rows,
+    iter_matches_per_keyword,
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+HOLIDAYS_CSV = PROJECT_ROOT / "data" / "raw" / "food_holidays_static.csv"
+
+FILLER_WORDS = [
+    "grilled", "crispy", "spicy", "house", "special", "combo", "fresh",
+    "large", "small", "side", "plate", "bowl", "classic", "deluxe",
+    "with", "served", "sauce", "topped", "homemade", "original",
+]
+
+
+def load_benchmark_holidays():
+    """
+    Holiday keywords derived from the static holiday CSV, so the benchmark
+    does not need the processed SQLite databases.
+    """
+    holidays = pd.read_csv(HOLIDAYS_CSV)[["name", "date"]]
+    holidays["keywords"] = holidays["name"].apply(lambda x: ", ".join(generate_keyword_list(str(x))))
+    return holidays
+
+
+def make_synthetic_menus(holidays, rows: int, seed: int = 42):
+    """
+    Deterministic menu items: filler words with roughly one in three
+    names/descriptions containing a real holiday keyword.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = sorted({kw for kws in holidays["keywords"] for kw in kws.split(", ") if kw})
+
+    def text(n_words):
+        words = list(rng.choice(FILLER_WORDS, size=n_words))
+        if rng.random() < 0.33:
+            words.insert(int(rng.integers(0, n_words + 1)), str(rng.choice(vocab)))
+        return " ".join(words).title()
+
+    menus = pd.DataFrame({
+        "restaurant_id": rng.integers(1, max(rows // 20, 2), size=rows),
+        "name": [text(3) for _ in range(rows)],
+        "description": [text(12) for _ in range(rows)],
+        "price": np.round(rng.uniform(50, 500, size=rows), 2),
+    })
+    menus["clean_name"] = menus["name"].apply(normalize_text)
+    menus["clean_description"] = menus["description"].apply(normalize_text)
+    return menus
+
+
+def _as_sorted_tuples(rows):
+    return sorted(tuple(map(str, r)) for r in rows)
+
+
+def run(rows: int, seed: int):
+    holidays = load_benchmark_holidays()
+    menus = make_synthetic_menus(holidays, rows, seed)
+
+    start = time.perf_counter()
+    legacy = list(iter_matches_per_keyword(menus, holidays))
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    automaton, targets = build_holiday_automaton(holidays)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = list(iter_matches(normalized_menu_rows(menus), automaton, targets))
+    scan_seconds = time.perf_counter() - start
+
+    identical = _as_sorted_tuples(legacy) == _as_sorted_tuples(fast)
+
+    print(f"🍽 Menu rows: {rows} | 🎉 Holidays: {len(holidays)} | 🔑 Keywords: {len(automaton)}")
+    print(f"🐢 Per-keyword loop : {legacy_seconds:8.2f}s  ({len(legacy)} matches)")
+    print(f"⚡ Automaton build  : {build_seconds:8.3f}s")
+    print(f"⚡ Automaton scan   : {scan_seconds:8.2f}s  ({len(fast)} matches)")
+    print(f"🚀 Speedup          : {legacy_seconds / max(build_seconds + scan_seconds, 1e-9):8.1f}x")
+    print(f"{'✅' if identical else '❌'} Outputs identical: {identical}")
+
+    return identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-keyword matching against the keyword automaton.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Synthetic menu rows to match")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not run(args.rows, args.seed):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
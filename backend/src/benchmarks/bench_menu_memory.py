@@ -0,0 +1,101 @@
+# src/benchmarks/bench_menu_memory.py
+import argparse
+import multiprocessing as mp
+import resource
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.benchmarks.bench_matching import load_benchmark_holidays, make_synthetic_menus
+from src.process.match_holidays_to_menus import (
+    CHUNK_SIZE,
+    build_holiday_automaton,
+    iter_matches,
+    match_menus,
+    normalize_text,
+    normalized_menu_rows,
+)
+from src.process.match_output import open_match_writer
+
+
+def _match_whole_table(db_path, holidays, output_path):
+    # The pre-streaming pattern: SELECT * into pandas, then add normalized columns
+    conn = sqlite3.connect(db_path)
+    menus = pd.read_sql("SELECT * FROM menus", conn)
+    conn.close()
+
+    menus["clean_name"] = menus["name"].apply(normalize_text)
+    menus["clean_description"] = menus["description"].apply(normalize_text)
+
+    automaton, targets = build_holiday_automaton(holidays)
+    writer = open_match_writer(output_path)
+    for start in range(0, len(menus), CHUNK_SIZE):
+        writer.write_rows(list(iter_matches(normalized_menu_rows(menus.iloc[start:start + CHUNK_SIZE]), automaton, targets)))
+    writer.close()
+
+
+def _match_streaming(db_path, holidays, output_path):
+    match_menus(db_path, holidays, output_path, workers=1)
+
+
+def _idle(db_path, holidays, output_path):
+    pass
+
+
+def _child(fn, args, queue):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is reported in KiB on Linux
+    queue.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, result))
+
+
+def measure(fn, *args):
+    """
+    Runs fn in a fresh (spawned) interpreter and returns
+    (seconds, peak RSS MiB, fn's return value).
+    """
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(fn, args, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def run(rows: int, seed: int):
+    holidays = load_benchmark_holidays()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "uber_eats.db"
+        menus = make_synthetic_menus(holidays, rows, seed).drop(columns=["clean_name", "clean_description"])
+        conn = sqlite3.connect(db_path)
+        menus.to_sql("menus", conn, index=False)
+        conn.close()
+        del menus
+
+        print(f"🍽 Menu rows: {rows}")
+        print(f"{'reader':<32} {'seconds':>9} {'peak RSS MiB':>13}")
+        for name, fn in [
+            ("interpreter + imports only", _idle),
+            ("SELECT * into pandas (before)", _match_whole_table),
+            ("cursor batches (after)", _match_streaming),
+        ]:
+            seconds, peak, _ = measure(fn, db_path, holidays, Path(tmp) / "matches.csv")
+            print(f"{name:<32} {seconds:>9.2f} {peak:>13.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of whole-table vs streaming menu reads.")
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
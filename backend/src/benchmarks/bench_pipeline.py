@@ -0,0 +1,246 @@
+# src/benchmarks/bench_pipeline.py
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.benchmarks.bench_matching import HOLIDAYS_CSV, load_benchmark_holidays
+from src.benchmarks.bench_menu_memory import measure
+from src.process.generate_big_data import generate_synthetic_data
+from src.process.load_to_sqlite import load_all
+from src.process.generate_holiday_keywords import generate_keywords
+from src.process.match_holidays_to_menus import load_holidays, match_menus
+from src.analytics.compute_holiday_popularity import compute_popularity
+from src.analytics.compute_top_dishes import compute_top_dishes
+from src.analytics.compute_upcoming_holiday_insights import compute_upcoming_insights
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+RESULTS_DIR = PROJECT_ROOT / "data" / "benchmarks"
+
+# Every holiday in the static CSV is upcoming from here, so the last stage does full work
+INSIGHTS_DATE = pd.Timestamp("2025-01-01")
+
+DEFAULT_THRESHOLD = 0.10   # 10% slower / bigger counts as a regression
+DEFAULT_MIN_SECONDS = 0.05  # ignore timing noise on stages this short
+
+
+def parse_rows(text):
+    """
+    '10k' -> 10_000, '1M' -> 1_000_000, '250000' -> 250_000.
+    """
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    suffix = text[-1].lower()
+    if suffix in multipliers:
+        return int(float(text[:-1]) * multipliers[suffix])
+    return int(text)
+
+
+# -------------------------
+# Stages (each runs in its own spawned interpreter, returns rows processed)
+# -------------------------
+def _quietly(fn, *args):
+    # Stage scripts print progress per chunk; keep the benchmark output readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return fn(*args)
+
+
+def _stage_generate(ws, rows, seed):
+    vocab = {kw for kws in load_benchmark_holidays()["keywords"] for kw in kws.split(", ") if kw}
+    return _quietly(generate_synthetic_data, rows, vocab, str(ws["raw"]), seed)
+
+
+def _stage_load(ws, rows, seed):
+    return _quietly(load_all, str(ws["raw"]), str(ws["menus_db"]))
+
+
+def _stage_keywords(ws, rows, seed):
+    return len(_quietly(generate_keywords, ws["holidays_db"]))
+
+
+def _stage_match(ws, rows, seed):
+    holidays = load_holidays(ws["holidays_db"])
+    total_menus, _, _ = _quietly(match_menus, ws["menus_db"], holidays, ws["matches"])
+    return total_menus
+
+
+def _stage_popularity(ws, rows, seed):
+    return _quietly(compute_popularity, ws["matches"], ws["popularity"])
+
+
+def _stage_top_dishes(ws, rows, seed):
+    return _quietly(compute_top_dishes, ws["matches"], ws["top_dishes"])
+
+
+def _stage_insights(ws, rows, seed):
+    insights = _quietly(
+        compute_upcoming_insights, INSIGHTS_DATE, HOLIDAYS_CSV, ws["popularity"], ws["top_dishes"], ws["insights"],
+    )
+    return len(insights)
+
+
+STAGES = [
+    ("generate_big_data", _stage_generate),
+    ("load_to_sqlite", _stage_load),
+    ("generate_holiday_keywords", _stage_keywords),
+    ("match_holidays_to_menus", _stage_match),
+    ("compute_holiday_popularity", _stage_popularity),
+    ("compute_top_dishes", _stage_top_dishes),
+    ("compute_upcoming_holiday_insights", _stage_insights),
+]
+
+
+def _workspace(root):
+    raw = root / "raw"
+    processed = root / "processed"
+    raw.mkdir(parents=True, exist_ok=True)
+    processed.mkdir(parents=True, exist_ok=True)
+
+    ws = {
+        "raw": raw,
+        "menus_db": processed / "uber_eats.db",
+        "holidays_db": processed / "food_holidays.db",
+        "matches": processed / "holiday_menu_matches.parquet",
+        "popularity": processed / "holiday_popularity.csv",
+        "top_dishes": processed / "top_dishes_per_holiday.csv",
+        "insights": processed / "upcoming_holiday_insights.csv",
+    }
+
+    # load_to_sqlite appends, so a reused workdir starts from an empty database
+    ws["menus_db"].unlink(missing_ok=True)
+
+    # Stand-in for load_holidays_static, which rewrites the CSV in place
+    conn = sqlite3.connect(ws["holidays_db"])
+    pd.read_csv(HOLIDAYS_CSV).to_sql("food_holidays", conn, if_exists="replace", index=False)
+    conn.close()
+    return ws
+
+
+def run_scale(rows, seed, workdir=None):
+    """
+    Runs every stage once at `rows` menu rows and returns the per-stage results.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(workdir) / f"rows_{rows}" if workdir else Path(tmp)
+        ws = _workspace(root)
+
+        stages = []
+        for name, fn in STAGES:
+            seconds, peak, stage_rows = measure(fn, ws, rows, seed)
+            stages.append({
+                "stage": name,
+                "seconds": round(seconds, 4),
+                "rows": int(stage_rows),
+                "rows_per_s": round(stage_rows / max(seconds, 1e-9), 1),
+                "peak_rss_mib": round(peak, 1),
+            })
+            print(f"  {name:<36} {seconds:>9.2f} {stage_rows:>12,} {stage_rows / max(seconds, 1e-9):>14,.0f} {peak:>10.1f}")
+
+    return stages
+
+
+def run(scales, seed, output_path, workdir=None):
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "runs": [],
+    }
+
+    for rows in scales:
+        print(f"\n🍽 Menu rows: {rows:,}")
+        print(f"  {'stage':<36} {'seconds':>9} {'rows':>12} {'rows/s':>14} {'peak MiB':>10}")
+        results["runs"].append({"menu_rows": rows, "stages": run_scale(rows, seed, workdir)})
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2))
+    print(f"\n📁 Results saved to: {output_path}")
+    return results
+
+
+# -------------------------
+# Comparison
+# -------------------------
+def compare(baseline, candidate, threshold=DEFAULT_THRESHOLD, min_seconds=DEFAULT_MIN_SECONDS):
+    """
+    Compares two results files stage by stage at every scale present in
+    both. A stage regresses if it got more than `threshold` slower (and by
+    at least `min_seconds`) or its peak memory grew by more than `threshold`.
+    Returns the list of regressions.
+    """
+    base_runs = {r["menu_rows"]: {s["stage"]: s for s in r["stages"]} for r in baseline["runs"]}
+    regressions = []
+
+    for run_ in candidate["runs"]:
+        rows = run_["menu_rows"]
+        if rows not in base_runs:
+            print(f"⚠️ No baseline for {rows:,} menu rows, skipping.")
+            continue
+
+        print(f"\n🍽 Menu rows: {rows:,}")
+        print(f"  {'stage':<36} {'seconds':>20} {'change':>7} {'peak MiB':>18} {'change':>7}")
+        for stage in run_["stages"]:
+            base = base_runs[rows].get(stage["stage"])
+            if base is None:
+                continue
+
+            time_change = stage["seconds"] / max(base["seconds"], 1e-9) - 1
+            mem_change = stage["peak_rss_mib"] / max(base["peak_rss_mib"], 1e-9) - 1
+
+            flags = []
+            if time_change > threshold and stage["seconds"] - base["seconds"] >= min_seconds:
+                flags.append("time")
+            if mem_change > threshold:
+                flags.append("memory")
+            for flag in flags:
+                regressions.append({"menu_rows": rows, "stage": stage["stage"], "metric": flag})
+
+            print(
+                f"  {stage['stage']:<36} {base['seconds']:>9.2f}->{stage['seconds']:<9.2f} {time_change:>+7.1%} "
+                f"{base['peak_rss_mib']:>8.1f}->{stage['peak_rss_mib']:<8.1f} {mem_change:>+7.1%}"
+                f"{'  ❌ ' + ', '.join(flags) if flags else ''}"
+            )
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {threshold:.0%}")
+    else:
+        print(f"\n✅ No regressions over {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every batch pipeline stage on synthetic data.")
+    parser.add_argument("--rows", nargs="+", default=["10k"],
+                        help="Menu row scales, e.g. 10k 1M 10M (default: 10k)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results JSON (default: data/benchmarks/pipeline_<timestamp>.json)")
+    parser.add_argument("--workdir", help="Keep generated data and outputs here instead of a temp dir")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+                        help="Compare two results files instead of running")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown / memory growth that counts as a regression (default: 0.10)")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, candidate = (json.loads(Path(p).read_text()) for p in args.compare)
+        regressions = compare(baseline, candidate, args.threshold, args.min_seconds)
+        sys.exit(1 if regressions else 0)
+
+    output = args.output or RESULTS_DIR / f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json"
+    run([parse_rows(r) for r in args.rows], args.seed, output, args.workdir)
+
+
+if __name__ == "__main__":
+    main()
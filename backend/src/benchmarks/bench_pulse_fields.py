@@ -0,0 +1,65 @@
+# src/benchmarks/bench_pulse_fields.py
+import argparse
+import time
+
+import numpy as np
+
+from src.benchmarks.bench_inference import make_entities
+from src.benchmarks.timing import p50_ms
+from src.services.batch_inference_service import run_batch_inference, batch_to_insights
+from src.services.pulse_service import PulseSnapshotCache, encode_insights_payload, encode_payload, parse_fields
+
+# What a scores-only dashboard asks for
+DASHBOARD_FIELDS = "confidence_score,risk_level,momentum_state,deviation_score,velocity,urgency"
+
+
+def run(entities: int, days: int, seed: int, repeat: int, fields: str):
+    trends, series = make_entities(entities, days, seed)
+    matrix = np.array(series, dtype=np.float64)
+    signal_agreement = np.array([0.8 if t["holiday_soon"] else 0.5 for t in trends])
+    context_confirmation = np.array([1.0 if t["holiday_soon"] else 0.2 for t in trends])
+    projection = parse_fields([fields])
+
+    def live(selected):
+        # compute + encode, as the ndjson / unknown-source paths do per request
+        result = run_batch_inference(matrix, signal_agreement, context_confirmation, fields=selected)
+        return encode_payload({"pulse_generated_at": "mock", "insights": batch_to_insights(trends, series, result, selected)})
+
+    full_live = p50_ms(lambda: live(None), repeat)
+    lean_live = p50_ms(lambda: live(projection), repeat)
+
+    payload = {"pulse_generated_at": "mock", "insights": batch_to_insights(
+        trends, series, run_batch_inference(matrix, signal_agreement, context_confirmation))}
+    cache = PulseSnapshotCache(sources=["mock"], compute=lambda source, signals: payload, ingest=None)
+    snapshot = cache.refresh("mock")
+
+    start = time.perf_counter()
+    cache.items("mock", snapshot, projection)
+    first_projection = (time.perf_counter() - start) * 1000
+    cached = p50_ms(lambda: encode_insights_payload("mock", cache.items("mock", snapshot, projection)), repeat)
+    lean_body = encode_insights_payload("mock", cache.items("mock", snapshot, projection))
+
+    print(
+        f"{entities:>9,} {len(snapshot.body) / 1024:>10.0f} {len(lean_body) / 1024:>10.0f} "
+        f"{full_live:>10.1f} {lean_live:>10.1f} {first_projection:>10.1f} {cached:>10.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /pulse/trends fields= projections: size and latency.")
+    parser.add_argument("--entities", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fields", default=DASHBOARD_FIELDS)
+    args = parser.parse_args()
+
+    print(f"📐 fields={args.fields}")
+    print(f"{'entities':>9} {'full KiB':>10} {'fields KiB':>10} {'live ms':>10} {'live f ms':>10} "
+          f"{'proj 1st':>10} {'proj ms':>10}")
+    for n in args.entities:
+        run(n, args.days, args.seed, args.repeat, args.fields)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# src/benchmarks/bench_pulse_snapshot.py
+import argparse
+
+import numpy as np
+
+from src.benchmarks.bench_inference import make_entities
+from src.benchmarks.timing import p50_ms
+from src.services.batch_inference_service import run_batch_inference, batch_to_insights
+from src.services.pulse_service import PulseSnapshotCache, encode_payload, etag_matches
+
+
+def make_compute(entities: int, days: int, seed: int):
+    # Stand-in for compute_pulse with a chosen number of entities
+    trends, series = make_entities(entities, days, seed)
+
+    def compute(source, social_signals=None):
+        result = run_batch_inference(
+            np.array(series, dtype=np.float64),
+            signal_agreement=np.array([0.8 if t["holiday_soon"] else 0.5 for t in trends]),
+            context_confirmation=np.array([1.0 if t["holiday_soon"] else 0.2 for t in trends]),
+        )
+        return {"pulse_generated_at": source, "insights": batch_to_insights(trends, series, result)}
+
+    return compute
+
+
+def run(entities: int, days: int, seed: int, repeat: int):
+    compute = make_compute(entities, days, seed)
+    cache = PulseSnapshotCache(sources=["mock"], compute=compute, ingest=None)
+    snapshot = cache.refresh("mock")
+
+    # Before: compute + encode on every GET
+    per_request = p50_ms(lambda: encode_payload(compute("mock")), max(1, repeat // 100))
+    # After: the snapshot bytes, or a 304 when the client's ETag still matches
+    cached = p50_ms(lambda: cache.get("mock").body, repeat)
+    conditional = p50_ms(lambda: etag_matches(snapshot.etag, cache.get("mock").etag), repeat)
+
+    print(f"{entities:>9,} {len(snapshot.body) / 1024:>10.0f} {per_request:>14.3f} {cached:>12.4f} {conditional:>12.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /pulse/trends reads: recompute vs snapshot.")
+    parser.add_argument("--entities", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'entities':>9} {'body KiB':>10} {'recompute ms':>14} {'snapshot ms':>12} {'304 ms':>12}")
+    for n in args.entities:
+        run(n, args.days, args.seed, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
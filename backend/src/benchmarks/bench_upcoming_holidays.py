@@ -0,0 +1,105 @@
+# src/benchmarks/bench_upcoming_holidays.py
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.benchmarks.bench_matching import HOLIDAYS_CSV
+from src.services.holiday_index import HolidayIndex
+
+
+def _legacy_upcoming(holidays_csv, popularity_csv, search_date, days):
+    # /holidays/upcoming as it used to run: read, merge and filter per request
+    df_holidays = pd.read_csv(holidays_csv, parse_dates=["date"])
+    df_pop = pd.read_csv(popularity_csv)
+
+    df = pd.merge(df_holidays, df_pop, left_on="name", right_on="holiday_name", how="left")
+    df["popularity_score"] = df["popularity_score"].fillna(0)
+    df["days_from_today"] = (df["date"] - search_date).dt.days
+
+    upcoming = df[
+        (df["days_from_today"] >= 0) &
+        (df["days_from_today"] <= days)
+    ].sort_values("date", kind="stable")
+
+    return upcoming[["name", "date", "days_from_today", "popularity_score"]].rename(
+        columns={"name": "holiday_name"}
+    ).to_dict(orient="records")
+
+
+def _write_popularity(path, seed):
+    rng = random.Random(seed)
+    names = pd.read_csv(HOLIDAYS_CSV)["name"].drop_duplicates()
+    # Leave some holidays out so the left join's fillna path is exercised
+    kept = [n for n in names if rng.random() < 0.8]
+    pd.DataFrame({
+        "holiday_name": kept,
+        "match_count": [rng.randint(1, 50_000) for _ in kept],
+        "popularity_score": [round(rng.uniform(0, 100), 2) for _ in kept],
+    }).to_csv(path, index=False)
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return pick(0.50), pick(0.99)
+
+
+def _time_requests(fn, queries):
+    samples = []
+    for search_date, days in queries:
+        start = time.perf_counter()
+        fn(search_date, days)
+        samples.append(time.perf_counter() - start)
+    return _percentiles(samples)
+
+
+def run(requests: int, seed: int):
+    rng = random.Random(seed)
+    start_2025 = pd.Timestamp("2025-01-01")
+    queries = [(start_2025 + pd.Timedelta(days=rng.randrange(365)), rng.randint(1, 60)) for _ in range(requests)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        popularity_csv = Path(tmp) / "holiday_popularity.csv"
+        _write_popularity(popularity_csv, seed)
+        index = HolidayIndex(HOLIDAYS_CSV, popularity_csv)
+
+        # Same answers as the per-request pandas path, for every day of the year
+        same = all(
+            index.upcoming(start_2025 + pd.Timedelta(days=d), n)
+            == _legacy_upcoming(HOLIDAYS_CSV, popularity_csv, start_2025 + pd.Timedelta(days=d), n)
+            for d in range(365)
+            for n in (1, 10, 60)
+        )
+
+        legacy_p50, legacy_p99 = _time_requests(
+            lambda d, n: _legacy_upcoming(HOLIDAYS_CSV, popularity_csv, d, n), queries[:max(1, requests // 10)]
+        )
+        index_p50, index_p99 = _time_requests(index.upcoming, queries)
+
+        # A rewritten popularity file must show up on the next lookup
+        _write_popularity(popularity_csv, seed + 1)
+        reloaded = index.upcoming(start_2025, 60) == _legacy_upcoming(HOLIDAYS_CSV, popularity_csv, start_2025, 60)
+
+    print(f"🎉 Requests: {requests} (random base dates, 1-60 day windows)")
+    print(f"{'handler':<34} {'p50 ms':>9} {'p99 ms':>9}")
+    print(f"{'read + merge per request (before)':<34} {legacy_p50:>9.3f} {legacy_p99:>9.3f}")
+    print(f"{'in-memory index (after)':<34} {index_p50:>9.3f} {index_p99:>9.3f}")
+    print(f"{'✅' if same else '❌'} Results identical: {same}")
+    print(f"{'✅' if reloaded else '❌'} Reloaded after file change: {reloaded}")
+    return same and reloaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /holidays/upcoming lookups.")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.requests, args.seed)
+
+
+if __name__ == "__main__":
+    main()
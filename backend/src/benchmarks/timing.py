@@ -0,0 +1,25 @@
+# src/benchmarks/timing.py
+# Timing helpers shared by the benchmark scripts
+import statistics
+import time
+
+
+def timed(fn, *args):
+    """
+    (seconds, result) of one fn(*args) call.
+    """
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def p50_ms(fn, repeat: int) -> float:
+    """
+    Median wall time of `repeat` fn() calls, in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
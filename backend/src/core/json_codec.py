@@ -0,0 +1,58 @@
+# src/core/json_codec.py
+
+import json
+import math
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pinned in requirements.txt; the stdlib fallback produces the same JSON, slower
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+
+
+def _default(obj):
+    # NumPy values the encoder doesn't take natively (object arrays, or any with the stdlib)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj):
+    # Copy of `obj` with NaN/inf floats as None, which orjson writes as null
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    if isinstance(obj, np.ndarray):
+        return _finite(obj.tolist())
+    if isinstance(obj, np.generic):
+        return _finite(obj.item())
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def _stdlib_dumps(content) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def dumps(content) -> bytes:
+    """
+    Compact UTF-8 JSON for API responses. Uses orjson when installed;
+    NumPy scalars and arrays are encoded directly, without tolist().
+    NaN and infinity are written as null either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    try:
+        return _stdlib_dumps(content)
+    except ValueError:
+        # Out-of-range floats somewhere; only then pay for a sanitized copy
+        return _stdlib_dumps(_finite(content))
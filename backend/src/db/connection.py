@@ -0,0 +1,74 @@
+# src/db/connection.py
+
+import sqlite3
+import threading
+from pathlib import Path
+
+# Path to SQLite DB file
+DB_PATH = Path(__file__).resolve().parent / "foodlens.db"
+
+# Prepared statements kept per connection (sqlite3 caches them by SQL text)
+CACHED_STATEMENTS = 256
+BUSY_TIMEOUT_S = 30
+
+PRAGMAS = {
+    # Readers work from a snapshot and never block the writer (and vice versa)
+    "journal_mode": "WAL",
+    # Durable at checkpoints; safe with WAL and much cheaper than FULL per commit
+    "synchronous": "NORMAL",
+    "cache_size": -32_000,          # KiB (negative = size, not pages): ~32 MB page cache
+    "mmap_size": 268_435_456,       # 256 MB memory-mapped reads
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+_local = threading.local()
+_all_connections = []
+_all_lock = threading.Lock()
+_generation = 0  # bumped by close_connections so threads drop stale handles
+
+
+def _open(db_path) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_S,
+        cached_statements=CACHED_STATEMENTS,
+        # Only the owning thread uses it; this just lets close_connections close it
+        check_same_thread=False,
+    )
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def get_connection(db_path=DB_PATH) -> sqlite3.Connection:
+    """
+    This thread's connection to `db_path`, opened (and tuned) on first use
+    and reused afterwards. Connections are never shared across threads.
+    Use `with conn:` around writes so each batch commits as one transaction.
+    """
+    key = str(db_path)
+    if getattr(_local, "generation", None) != _generation:
+        _local.connections = {}
+        _local.generation = _generation
+    connections = _local.connections
+
+    conn = connections.get(key)
+    if conn is None:
+        conn = connections[key] = _open(db_path)
+        with _all_lock:
+            _all_connections.append(conn)
+    return conn
+
+
+def close_connections():
+    """
+    Closes every connection opened by get_connection, in any thread
+    (e.g. on shutdown, or before swapping DB_PATH in a script).
+    """
+    global _generation
+    with _all_lock:
+        for conn in _all_connections:
+            conn.close()
+        _all_connections.clear()
+        _generation += 1
@@ -1,13 +1,20 @@
 # src/db/init_db.py
 
-import sqlite3
-from pathlib import Path
+from src.db.connection import DB_PATH, get_connection
+from src.services.social_rollup_service import rebuild_rollups
 
-# Path to SQLite DB file
-DB_PATH = Path(__file__).resolve().parent / "foodlens.db"
+# Every stored copy of a (platform, post_id) but the latest one
+DUPLICATE_SIGNAL_IDS_SQL = """
+    SELECT id FROM raw_social_signals
+    WHERE platform IS NOT NULL AND post_id IS NOT NULL
+      AND id NOT IN (
+        SELECT MAX(id) FROM raw_social_signals GROUP BY platform, post_id
+      )
+"""
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
+def init_db(db_path=DB_PATH):
+    # Opening through the shared manager also switches the file to WAL
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -30,9 +37,87 @@ def init_db():
     )
     """)
 
+    rollups_exist = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'social_engagement_rollups'"
+    ).fetchone() is not None
+
+    # One row per (signal, food entity), so per-entity reads are index lookups
+    # instead of LIKE scans over the food_entities JSON
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS social_signal_entities (
+        entity TEXT NOT NULL,
+        signal_id INTEGER NOT NULL REFERENCES raw_social_signals(id),
+        PRIMARY KEY (entity, signal_id)
+    ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_social_signal_entities_signal
+    ON social_signal_entities (signal_id)
+    """)
+
+    # Collapse duplicate posts from before ingest became an upsert (latest row
+    # wins), then make (platform, post_id) the upsert key. Their mappings go
+    # first: with foreign_keys on, the rows they reference can't be deleted.
+    cursor.execute(f"""
+    DELETE FROM social_signal_entities
+    WHERE signal_id IN ({DUPLICATE_SIGNAL_IDS_SQL})
+    """)
+    cursor.execute(f"""
+    DELETE FROM raw_social_signals
+    WHERE id IN ({DUPLICATE_SIGNAL_IDS_SQL})
+    """)
+    deduplicated = cursor.rowcount
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_raw_social_signals_platform_post
+    ON raw_social_signals (platform, post_id)
+    """)
+
+    # Drop mappings left pointing at signals that no longer exist
+    cursor.execute("""
+    DELETE FROM social_signal_entities
+    WHERE signal_id NOT IN (SELECT id FROM raw_social_signals)
+    """)
+
+    # Backfill signals stored before the mapping table existed
+    cursor.execute("""
+    INSERT OR IGNORE INTO social_signal_entities (entity, signal_id)
+    SELECT j.value, r.id
+    FROM raw_social_signals r, json_each(r.food_entities) j
+    WHERE json_valid(r.food_entities)
+    """)
+
+    # Engagement per (entity, platform, hour/day bucket), kept current by ingest
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS social_engagement_rollups (
+        granularity TEXT NOT NULL,  -- 'day' | 'hour'
+        entity TEXT NOT NULL,
+        bucket TEXT NOT NULL,       -- ingested_at prefix: YYYY-MM-DD / YYYY-MM-DDTHH
+        platform TEXT NOT NULL,
+        likes INTEGER NOT NULL DEFAULT 0,
+        comments INTEGER NOT NULL DEFAULT 0,
+        shares INTEGER NOT NULL DEFAULT 0,
+        views INTEGER NOT NULL DEFAULT 0,
+        posts INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (granularity, entity, bucket, platform)
+    ) WITHOUT ROWID
+    """)
+
+    # Streaming baseline/momentum state per entity, advanced by each pulse run
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS entity_stream_state (
+        entity TEXT PRIMARY KEY,
+        bucket TEXT NOT NULL,       -- newest bucket the state covers (YYYY-MM-DD)
+        state TEXT NOT NULL         -- EntityState.to_json()
+    ) WITHOUT ROWID
+    """)
+
     conn.commit()
-    conn.close()
-    print("✅ DB initialized at", DB_PATH)
+
+    # Backfill a new rollup table, or refresh one the cleanup above made stale
+    if not rollups_exist or deduplicated > 0:
+        rebuild_rollups(db_path)
+
+    print("✅ DB initialized at", db_path)
 
 
 if __name__ == "__main__":
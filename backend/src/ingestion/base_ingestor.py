@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List
-from src.models.social_signal import SocialSignal
+from src.schemas.social_signal_schema import SocialSignal
 
 class BaseIngestor(ABC):
     platform: str
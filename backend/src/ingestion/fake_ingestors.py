@@ -0,0 +1,69 @@
+# src/ingestion/fake_ingestors.py
+import asyncio
+import random
+import time
+from typing import List
+
+from src.ingestion.base_ingestor import BaseIngestor
+from src.schemas.social_signal_schema import SocialSignal
+
+
+class FakeLatencyIngestor(BaseIngestor):
+    """
+    Local stand-in for a platform API: waits `latency_s` (+ up to `jitter_s`)
+    per call, then returns `posts_per_keyword` signals with stable post ids,
+    so repeated runs upsert the same rows. Fails for a `fail_rate` share of
+    keywords. Content and failures depend only on (platform, keyword, seed),
+    not on call order.
+    """
+    def __init__(self, platform: str, latency_s: float = 0.05, jitter_s: float = 0.0,
+                 posts_per_keyword: int = 10, fail_rate: float = 0.0, seed: int = 42):
+        self.platform = platform
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.posts_per_keyword = posts_per_keyword
+        self.fail_rate = fail_rate
+        self.seed = seed
+        self._random = random.Random(f"{platform}-{seed}")
+
+    def _delay(self) -> float:
+        return self.latency_s + self._random.uniform(0, self.jitter_s)
+
+    def _signals(self, keyword: str) -> List[SocialSignal]:
+        rng = random.Random(f"{self.platform}-{keyword}-{self.seed}")
+        if rng.random() < self.fail_rate:
+            raise ConnectionError(f"{self.platform} fake API error")
+
+        return [
+            SocialSignal(
+                platform=self.platform,
+                post_id=f"{self.platform}_{keyword}_{i}",
+                timestamp="2026-02-15T10:00:00Z",
+                text=f"Trending {keyword} content",
+                hashtags=[f"#{keyword}", "#foodtrend"],
+                food_entities=[keyword],
+                engagement={
+                    "likes": rng.randint(300, 5000),
+                    "comments": rng.randint(20, 300),
+                    "shares": rng.randint(5, 80),
+                },
+                creator_followers=rng.randint(5000, 150000),
+                geo="US",
+            )
+            for i in range(self.posts_per_keyword)
+        ]
+
+    # Async on purpose: the orchestrator awaits it like a non-blocking HTTP client
+    async def fetch_recent_signals(self, keyword: str) -> List[SocialSignal]:
+        await asyncio.sleep(self._delay())
+        return self._signals(keyword)
+
+
+class BlockingFakeIngestor(FakeLatencyIngestor):
+    """
+    Same as FakeLatencyIngestor, but sleeps in the calling thread like a
+    requests-based client, so it exercises the orchestrator's thread pool.
+    """
+    def fetch_recent_signals(self, keyword: str) -> List[SocialSignal]:
+        time.sleep(self._delay())
+        return self._signals(keyword)
@@ -1,6 +1,6 @@
 from typing import List
 from src.ingestion.base_ingestor import BaseIngestor
-from src.models.social_signal import SocialSignal
+from src.schemas.social_signal_schema import SocialSignal
 
 class InstagramIngestor(BaseIngestor):
     platform = "instagram"
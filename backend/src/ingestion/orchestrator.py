@@ -0,0 +1,278 @@
+# src/ingestion/orchestrator.py
+import argparse
+import asyncio
+import functools
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from src.db.connection import DB_PATH
+from src.ingestion.base_ingestor import BaseIngestor
+from src.ingestion.instagram_ingestor import InstagramIngestor
+from src.ingestion.youtube_ingestor import YouTubeIngestor
+from src.schemas.social_signal_schema import SocialSignal
+from src.services import social_ingestion_service, social_sources
+from src.services.dummy_social_source import DummySocialSource as DummyPostSource
+from src.services.social_ingestion_service import INGEST_BATCH_SIZE, save_raw_social_signals
+
+DEFAULT_KEYWORDS = ["nachos", "ramen", "boba"]
+
+MAX_CONCURRENCY = 16            # fetches in flight across all sources
+SOURCE_CONCURRENCY = 4          # per source, so one slow platform can't take every slot
+SOURCE_TIMEOUT_S = 30
+QUEUE_SIZE = 64                 # fetched batches waiting for the writer
+
+_DONE = object()
+
+# Every write goes through this one thread, so it owns the only writer connection
+_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-writer")
+
+
+# -------------------------
+# Rate limiting
+# -------------------------
+class RateLimiter:
+    """
+    Token bucket: at most `rate` calls per second, with bursts of up to `burst`.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+
+# -------------------------
+# Source registry
+# -------------------------
+def post_to_signal(post: social_sources.SocialPost) -> SocialSignal:
+    """
+    SocialPost (social_sources) -> SocialSignal, with the topic as the food entity.
+    """
+    return SocialSignal(
+        platform=post["platform"],
+        post_id=post["post_id"],
+        timestamp=post["posted_at"].isoformat(),
+        food_entities=[post["topic"]],
+        engagement={"likes": post["likes"], "comments": post["comments"], "views": post["views"]},
+        creator_followers=0,
+    )
+
+
+class RegisteredSource:
+    """
+    One source behind a common `fetch(keyword) -> List[SocialSignal]`, with
+    its own rate limit, concurrency cap and timeout. Keyword-less sources
+    (fetch_signals) are called once per run instead of once per keyword.
+    """
+    def __init__(self, name: str, fetch: Callable, keyword_based: bool, convert: Optional[Callable] = None,
+                 rate_per_s: Optional[float] = None, burst: int = 1,
+                 max_concurrency: int = SOURCE_CONCURRENCY, timeout_s: float = SOURCE_TIMEOUT_S):
+        self.name = name
+        self.fetch = fetch
+        self.keyword_based = keyword_based
+        self.convert = convert
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s
+
+
+def _bind(method, make_args):
+    # fetch(keyword) -> method(*make_args(keyword)), still a coroutine function if method is one
+    if inspect.iscoroutinefunction(method):
+        async def fetch(keyword):
+            return await method(*make_args(keyword))
+    else:
+        def fetch(keyword):
+            return method(*make_args(keyword))
+    return fetch
+
+
+def register_source(source, name: Optional[str] = None, **limits) -> RegisteredSource:
+    """
+    Wraps any of the three source abstractions:
+      - ingestion.BaseIngestor.fetch_recent_signals(keyword)
+      - social_sources.SocialSource.fetch_posts([keyword])
+      - social_ingestion_service.SocialSource.fetch_signals()
+    `limits` are RegisteredSource's rate_per_s / burst / max_concurrency / timeout_s.
+    """
+    if isinstance(source, BaseIngestor):
+        name = name or source.platform
+        return RegisteredSource(name, source.fetch_recent_signals, True, **limits)
+
+    if isinstance(source, social_sources.SocialSource):
+        name = name or type(source).__name__
+        fetch = _bind(source.fetch_posts, lambda keyword: ([keyword],))
+        return RegisteredSource(name, fetch, True,
+                                convert=lambda posts: [post_to_signal(p) for p in posts], **limits)
+
+    if isinstance(source, social_ingestion_service.SocialSource):
+        name = name or type(source).__name__
+        return RegisteredSource(name, _bind(source.fetch_signals, lambda keyword: ()), False, **limits)
+
+    raise TypeError(f"Unsupported source type: {type(source).__name__}")
+
+
+def default_sources() -> List[RegisteredSource]:
+    return [
+        register_source(social_ingestion_service.DummySocialSource(), name="dummy_signals"),
+        register_source(DummyPostSource(), name="dummy_posts"),
+        register_source(InstagramIngestor()),
+        register_source(YouTubeIngestor()),
+    ]
+
+
+# -------------------------
+# Orchestrator
+# -------------------------
+async def _call(fetch, keyword, executor):
+    # Async sources are awaited; blocking ones run in the fetch pool
+    if inspect.iscoroutinefunction(fetch):
+        return await fetch(keyword)
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(fetch, keyword))
+
+
+async def _fetch_job(source, keyword, state, queue, global_slots, executor, stats):
+    source_stats = stats["sources"][source.name]
+    # Take the source's own slot first, so a saturated source waits without holding a global one
+    async with state["slots"], global_slots:
+        if state["limiter"]:
+            await state["limiter"].acquire()
+        start = time.perf_counter()
+        try:
+            signals = await asyncio.wait_for(_call(source.fetch, keyword, executor), source.timeout_s)
+            if source.convert:
+                signals = source.convert(signals)
+        except Exception as e:
+            source_stats["errors"] += 1
+            print(f"⚠️ {source.name} failed for {keyword!r}: {type(e).__name__}: {e}")
+            return
+        finally:
+            source_stats["calls"] += 1
+            source_stats["busy_seconds"] += time.perf_counter() - start
+            source_stats["finished_at"] = round(time.perf_counter() - stats["_start"], 4)
+
+    source_stats["signals"] += len(signals)
+    if signals:
+        # Backpressure: blocks only this job when the writer falls behind
+        await queue.put(signals)
+
+
+async def _writer(queue, batch_size, db_path, save, stats):
+    loop = asyncio.get_running_loop()
+    done = False
+    while not done:
+        batch = []
+        item = await queue.get()
+        # Drain whatever is already waiting so small fetches share a transaction
+        while True:
+            if item is _DONE:
+                done = True
+                break
+            batch.extend(item)
+            if len(batch) >= batch_size or queue.empty():
+                break
+            item = queue.get_nowait()
+
+        if batch:
+            await loop.run_in_executor(_WRITER, save, batch, batch_size, db_path)
+            stats["written"] += len(batch)
+            stats["writes"] += 1
+
+
+async def run_ingestion(sources: Optional[List[RegisteredSource]] = None, keywords: Optional[List[str]] = None,
+                        max_concurrency: int = MAX_CONCURRENCY, queue_size: int = QUEUE_SIZE,
+                        batch_size: int = INGEST_BATCH_SIZE, db_path=DB_PATH, save=save_raw_social_signals):
+    """
+    Fetches every (source, keyword) pair concurrently and streams the results
+    through a bounded queue into a single batched DB writer.
+    Returns run stats, including per-source calls / signals / errors.
+    """
+    sources = default_sources() if sources is None else sources
+    keywords = DEFAULT_KEYWORDS if keywords is None else keywords
+
+    stats = {
+        "_start": time.perf_counter(),
+        "written": 0,
+        "writes": 0,
+        "sources": {
+            s.name: {"calls": 0, "signals": 0, "errors": 0, "busy_seconds": 0.0, "finished_at": None}
+            for s in sources
+        },
+    }
+
+    queue = asyncio.Queue(maxsize=queue_size)
+    global_slots = asyncio.Semaphore(max_concurrency)
+    writer = asyncio.create_task(_writer(queue, batch_size, db_path, save, stats))
+
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ingest-fetch")
+    jobs = []
+    for source in sources:
+        state = {
+            "slots": asyncio.Semaphore(source.max_concurrency),
+            "limiter": RateLimiter(source.rate_per_s, source.burst) if source.rate_per_s else None,
+        }
+        for keyword in (keywords if source.keyword_based else [None]):
+            jobs.append(_fetch_job(source, keyword, state, queue, global_slots, executor, stats))
+
+    fetching = asyncio.gather(*jobs)
+    try:
+        # If the writer dies, stop fetching instead of blocking on a full queue
+        await asyncio.wait({fetching, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if writer.done():
+            fetching.cancel()
+            await asyncio.gather(fetching, return_exceptions=True)
+            writer.result()
+        await fetching
+        await queue.put(_DONE)
+        await writer
+    finally:
+        # Blocking fetches that timed out may still be running; don't wait for them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    seconds = time.perf_counter() - stats.pop("_start")
+    stats["seconds"] = round(seconds, 4)
+    stats["signals_per_s"] = round(stats["written"] / max(seconds, 1e-9), 1)
+    for source_stats in stats["sources"].values():
+        source_stats["busy_seconds"] = round(source_stats["busy_seconds"], 4)
+    return stats
+
+
+def ingest_all(sources: Optional[List[RegisteredSource]] = None, keywords: Optional[List[str]] = None, **options):
+    """
+    Blocking wrapper around run_ingestion for scripts and cron jobs.
+    """
+    return asyncio.run(run_ingestion(sources, keywords, **options))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest social signals from every registered source.")
+    parser.add_argument("--keywords", nargs="+", default=DEFAULT_KEYWORDS)
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    args = parser.parse_args()
+
+    stats = ingest_all(keywords=args.keywords, max_concurrency=args.max_concurrency, batch_size=args.batch_size)
+
+    for name, s in stats["sources"].items():
+        print(f"  {name:<16} calls={s['calls']:<4} signals={s['signals']:<6} errors={s['errors']}")
+    print(f"✅ Wrote {stats['written']:,} signals in {stats['writes']} batches "
+          f"({stats['seconds']:.2f}s, {stats['signals_per_s']:,.0f} signals/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,56 +7,131 @@ import os
 # -----------------------------
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 RAW_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw')
-os.makedirs(RAW_PATH, exist_ok=True)
 
-# -----------------------------
-# Load original restaurants CSV
-# -----------------------------
-restaurants = pd.read_csv(os.path.join(RAW_PATH, 'restaurants.csv'))
+RESTAURANTS_BIG_CSV = 'restaurants_big.csv'
+MENUS_BIG_CSV = 'restaurant_menus_big.csv'
+
+MENUS_PER_RESTAURANT = 20
+FILLER_WORDS = [
+    "grilled", "crispy", "spicy", "house", "special", "combo", "fresh",
+    "large", "small", "side", "plate", "bowl", "classic", "deluxe",
+    "with", "served", "sauce", "topped", "homemade", "original",
+]
+
 
 # -----------------------------
-# Expand restaurants (manageable)
+# Expand the real Kaggle CSVs
 # -----------------------------
-scale_restaurants = 50  # adjust to get ~2.5M restaurants if original ~50k
-restaurants_big = pd.concat([restaurants]*scale_restaurants, ignore_index=True)
-restaurants_big['restaurant_id'] = range(1, len(restaurants_big)+1)
-restaurants_big['rating'] = np.round(np.random.uniform(1, 5, size=len(restaurants_big)), 2)
+def expand_real_data(raw_path=RAW_PATH, scale_restaurants=50, chunksize=500_000, rng=np.random):
+    # -----------------------------
+    # Load original restaurants CSV
+    # -----------------------------
+    restaurants = pd.read_csv(os.path.join(raw_path, 'restaurants.csv'))
+
+    # -----------------------------
+    # Expand restaurants (manageable)
+    # -----------------------------
+    # scale_restaurants=50 gives ~2.5M restaurants if original ~50k
+    restaurants_big = pd.concat([restaurants]*scale_restaurants, ignore_index=True)
+    restaurants_big['restaurant_id'] = range(1, len(restaurants_big)+1)
+    restaurants_big['rating'] = np.round(rng.uniform(1, 5, size=len(restaurants_big)), 2)
+
+    restaurants_big.to_csv(os.path.join(raw_path, RESTAURANTS_BIG_CSV), index=False)
+    print(f"✅ Restaurants expanded: {len(restaurants_big)} rows")
+
+    # -----------------------------
+    # Read and expand menu in chunks
+    # -----------------------------
+    menu_csv_path = os.path.join(raw_path, MENUS_BIG_CSV)
+
+    # Create iterator
+    menu_reader = pd.read_csv(
+        os.path.join(raw_path, 'restaurant-menus.csv'),
+        engine='python',
+        on_bad_lines='skip',
+        chunksize=chunksize
+    )
+
+    for i, chunk in enumerate(menu_reader):
+        try:
+            # Process the chunk
+            chunk['menu_id'] = range(i*chunksize + 1, i*chunksize + len(chunk) + 1)
+            chunk['restaurant_id'] = rng.choice(restaurants_big['restaurant_id'], size=len(chunk))
+            chunk['price'] = np.round(rng.uniform(50, 500, size=len(chunk)), 2)
+
+            # Write to CSV
+            if i == 0:
+                chunk.to_csv(menu_csv_path, index=False)
+            else:
+                chunk.to_csv(menu_csv_path, index=False, mode='a', header=False)
+
+            print(f"✅ Chunk {i+1} processed and written")
+
+        except Exception as e:
+            print(f"⚠️ Warning: skipping chunk {i+1} due to error: {e}")
+            continue
+
+    print(f"✅ Big data CSVs generated in {raw_path}")
 
-restaurants_big.to_csv(os.path.join(RAW_PATH, 'restaurants_big.csv'), index=False)
-print(f"✅ Restaurants expanded: {len(restaurants_big)} rows")
 
 # -----------------------------
-# Read and expand menu in chunks
+# Deterministic synthetic data
 # -----------------------------
-chunksize = 500_000  # 0.5M rows per chunk
-menu_csv_path = os.path.join(RAW_PATH, 'restaurant_menus_big.csv')
-chunksize = 500_000
-
-# Create iterator
-menu_reader = pd.read_csv(
-    os.path.join(RAW_PATH, 'restaurant-menus.csv'),
-    engine='python',
-    on_bad_lines='skip',
-    chunksize=chunksize
-)
-
-for i, chunk in enumerate(menu_reader):
-    try:
-        # Process the chunk
-        chunk['menu_id'] = range(i*chunksize + 1, i*chunksize + len(chunk) + 1)
-        chunk['restaurant_id'] = np.random.choice(restaurants_big['restaurant_id'], size=len(chunk))
-        chunk['price'] = np.round(np.random.uniform(50, 500, size=len(chunk)), 2)
-
-        # Write to CSV
-        if i == 0:
-            chunk.to_csv(menu_csv_path, index=False)
-        else:
-            chunk.to_csv(menu_csv_path, index=False, mode='a', header=False)
-
-        print(f"✅ Chunk {i+1} processed and written")
-        
-    except Exception as e:
-        print(f"⚠️ Warning: skipping chunk {i+1} due to error: {e}")
-        continue
-
-print(f"✅ Big data CSVs generated in {RAW_PATH}")
\ No newline at end of file
+def _synthetic_text(rng, n, n_words, vocab, keyword_rate):
+    # Filler words, with one slot swapped for a holiday keyword in ~keyword_rate of rows
+    words = rng.choice(FILLER_WORDS, size=(n, n_words)).astype(object)
+    has_kw = rng.random(n) < keyword_rate
+    slots = rng.integers(0, n_words, size=n)
+    words[has_kw, slots[has_kw]] = rng.choice(vocab, size=int(has_kw.sum()))
+
+    text = pd.Series(words[:, 0])
+    return text.str.cat([pd.Series(words[:, i]) for i in range(1, n_words)], sep=" ").str.title()
+
+
+def generate_synthetic_data(menu_rows, vocab, raw_path=RAW_PATH, seed=42,
+                            chunksize=500_000, keyword_rate=0.33):
+    """
+    Writes restaurants_big.csv and restaurant_menus_big.csv with the same
+    columns as expand_real_data, without needing the Kaggle files.
+    The output depends only on (menu_rows, vocab, seed), so benchmark runs
+    at the same scale see identical data. Returns the menu row count.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array(sorted(vocab), dtype=object)
+    n_restaurants = max(menu_rows // MENUS_PER_RESTAURANT, 1)
+
+    restaurants_big = pd.DataFrame({
+        'id': range(1, n_restaurants + 1),
+        'name': [f"Restaurant {i}" for i in range(1, n_restaurants + 1)],
+        'score': np.round(rng.uniform(3, 5, size=n_restaurants), 1),
+        'category': rng.choice(["American", "Mexican", "Italian", "Desserts", "Breakfast"], size=n_restaurants),
+    })
+    restaurants_big['restaurant_id'] = restaurants_big['id']
+    restaurants_big['rating'] = np.round(rng.uniform(1, 5, size=n_restaurants), 2)
+    restaurants_big.to_csv(os.path.join(raw_path, RESTAURANTS_BIG_CSV), index=False)
+    print(f"✅ Synthetic restaurants: {n_restaurants} rows")
+
+    menu_csv_path = os.path.join(raw_path, MENUS_BIG_CSV)
+    for i, start in enumerate(range(0, menu_rows, chunksize)):
+        n = min(chunksize, menu_rows - start)
+        chunk = pd.DataFrame({
+            'restaurant_id': rng.integers(1, n_restaurants + 1, size=n),
+            'category': rng.choice(["Entrees", "Sides", "Desserts", "Drinks"], size=n),
+            'name': _synthetic_text(rng, n, 3, vocab, keyword_rate),
+            'description': _synthetic_text(rng, n, 12, vocab, keyword_rate),
+            'price': np.round(rng.uniform(50, 500, size=n), 2),
+            'menu_id': range(start + 1, start + n + 1),
+        })
+        chunk.to_csv(menu_csv_path, index=False, mode='w' if i == 0 else 'a', header=(i == 0))
+        print(f"✅ Synthetic menu chunk {i+1} written ({start + n}/{menu_rows})")
+
+    return menu_rows
+
+
+def main():
+    os.makedirs(RAW_PATH, exist_ok=True)
+    expand_real_data(RAW_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -33,8 +33,12 @@ def generate_keyword_list(name):
 
     return list(keywords)
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
+def generate_keywords(db_path=DB_PATH):
+    """
+    Builds the food_holiday_keywords table from food_holidays.
+    Returns the holidays with their keywords.
+    """
+    conn = sqlite3.connect(db_path)
     df = pd.read_sql("SELECT * FROM food_holidays", conn)
 
     df["keywords"] = df["name"].apply(lambda x: ", ".join(generate_keyword_list(str(x))))
@@ -43,6 +47,10 @@ def main():
     df.to_sql("food_holiday_keywords", conn, if_exists="replace", index=False)
 
     conn.close()
+    return df
+
+def main():
+    df = generate_keywords()
 
     print("✅ Keyword generation complete!")
     print(df[["name", "keywords"]].head(10))
@@ -0,0 +1,117 @@
+# src/process/keyword_automaton.py
+import re
+from collections import deque
+
+
+def normalize_text(text):
+    """
+    Text form used for keyword matching: ASCII letters, digits and
+    whitespace only, lower-cased.
+    """
+    if not isinstance(text, str):
+        return ""
+    return re.sub(r"[^a-zA-Z0-9\s]", "", text).lower()
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+
+    All keywords are compiled once into a single DFA, so a text is scanned
+    exactly once no matter how many keywords there are. `find` returns the
+    ids of every keyword that occurs as a substring of the text, which is the
+    same thing `str.contains(kw)` checks for one keyword at a time.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._outputs = [set()]
+        self._keywords = []
+        self._delta = None
+        self._out = None
+
+    def add(self, keyword: str) -> int:
+        """
+        Adds a keyword and returns its id. Adding the same keyword twice
+        returns the existing id.
+        """
+        if self._delta is not None:
+            raise RuntimeError("Automaton is already built; create a new one to add keywords.")
+        if not keyword:
+            raise ValueError("Keyword must be a non-empty string.")
+
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._outputs.append(set())
+                self._goto[state][ch] = nxt
+            state = nxt
+
+        if not self._outputs[state]:
+            self._outputs[state].add(len(self._keywords))
+            self._keywords.append(keyword)
+
+        return next(iter(self._outputs[state]))
+
+    def build(self):
+        """
+        Computes failure links and flattens them into a full transition
+        table, so scanning never has to walk the failure chain.
+        """
+        goto = self._goto
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        outputs = self._outputs
+
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            # Failure links point to shallower states, which are already final
+            outputs[state] |= outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                delta[state][ch] = nxt
+                queue.append(nxt)
+
+        self._delta = delta
+        self._out = [frozenset(o) if o else None for o in outputs]
+        self._goto = None
+        return self
+
+    @property
+    def keywords(self):
+        return list(self._keywords)
+
+    def __len__(self):
+        return len(self._keywords)
+
+    def find(self, text: str, hits: set | None = None) -> set:
+        """
+        Returns the set of keyword ids found in `text`.
+        Pass an existing set as `hits` to accumulate across several texts.
+        """
+        if self._delta is None:
+            raise RuntimeError("Call build() before find().")
+
+        if hits is None:
+            hits = set()
+        if not text:
+            return hits
+
+        delta = self._delta
+        out = self._out
+        state = 0
+
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state] is not None:
+                hits |= out[state]
+
+        return hits
@@ -2,49 +2,74 @@ import os
 import sqlite3
 import pandas as pd
 
+from src.process.menu_search_index import refresh_menu_index
+
 # Paths
 RAW_PATH = os.path.join(os.getcwd(), 'data', 'raw')
 PROCESSED_PATH = os.path.join(os.getcwd(), 'data', 'processed')
 DB_PATH = os.path.join(PROCESSED_PATH, 'uber_eats.db')
 
-restaurants_csv = os.path.join(RAW_PATH, 'restaurants_big.csv')
-menus_csv = os.path.join(RAW_PATH, 'restaurant_menus_big.csv')
-
-# Create processed folder if it doesn't exist
-os.makedirs(PROCESSED_PATH, exist_ok=True)
-
-# Connect to SQLite (creates file if not exists)
-conn = sqlite3.connect(DB_PATH)
-print("✅ Connected to SQLite database:", DB_PATH)
+RESTAURANTS_CSV = 'restaurants_big.csv'
+MENUS_CSV = 'restaurant_menus_big.csv'
 
 # ----------------------------
 # Helper function to load CSV in chunks
 # ----------------------------
-def load_csv_to_sqlite(csv_path, table_name, chunk_size=100_000, max_chunks=None):
+def load_csv_to_sqlite(conn, csv_path, table_name, chunk_size=100_000, max_chunks=None):
+    """
+    Appends a CSV to `table_name` chunk by chunk. Returns the rows written.
+    """
     print(f"➡️ Loading {csv_path} into table '{table_name}' with chunksize={chunk_size}")
+    written = 0
     try:
         chunk_iter = pd.read_csv(csv_path, chunksize=chunk_size, on_bad_lines='skip', engine='python')
         for i, chunk in enumerate(chunk_iter, start=1):
             chunk.to_sql(table_name, conn, if_exists='append', index=False)
+            written += len(chunk)
             print(f"✅ Chunk {i} written to '{table_name}'")
             if max_chunks and i >= max_chunks:
                 print(f"⚠️ Stopping after {max_chunks} chunks (for testing)")
                 break
     except Exception as e:
         print(f"❌ Error loading {table_name}: {e}")
+    return written
 
-# ----------------------------
-# Load Restaurants
-# ----------------------------
-load_csv_to_sqlite(restaurants_csv, 'restaurants', chunk_size=100_000)
+def load_all(raw_path=RAW_PATH, db_path=DB_PATH):
+    """
+    Loads restaurants and menus into SQLite and refreshes the menu keyword
+    index. Returns the number of menu rows loaded.
+    """
+    # Create processed folder if it doesn't exist
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
-# ----------------------------
-# Load Menus
-# ----------------------------
-load_csv_to_sqlite(menus_csv, 'menus', chunk_size=100_000)
+    # Connect to SQLite (creates file if not exists)
+    conn = sqlite3.connect(db_path)
+    print("✅ Connected to SQLite database:", db_path)
 
-# ----------------------------
-# Close connection
-# ----------------------------
-conn.close()
-print("✅ All data loaded into SQLite successfully!")
\ No newline at end of file
+    # ----------------------------
+    # Load Restaurants
+    # ----------------------------
+    load_csv_to_sqlite(conn, os.path.join(raw_path, RESTAURANTS_CSV), 'restaurants', chunk_size=100_000)
+
+    # ----------------------------
+    # Load Menus
+    # ----------------------------
+    menu_rows = load_csv_to_sqlite(conn, os.path.join(raw_path, MENUS_CSV), 'menus', chunk_size=100_000)
+
+    # ----------------------------
+    # Refresh menu keyword index (only new rows)
+    # ----------------------------
+    refresh_menu_index(conn)
+
+    # ----------------------------
+    # Close connection
+    # ----------------------------
+    conn.close()
+    return menu_rows
+
+def main():
+    load_all()
+    print("✅ All data loaded into SQLite successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -1,113 +1,435 @@
-import csv
+import argparse
+import multiprocessing as mp
 import sqlite3
+import time
 import pandas as pd
-import re
 from pathlib import Path
 
+from src.analytics.match_aggregates import (
+    MatchAggregator,
+    popularity_frame,
+    top_dishes_frame,
+    restaurant_counts_frame,
+)
+from src.process.keyword_automaton import KeywordAutomaton, normalize_text
+from src.process.match_output import (
+    PARQUET_PATH,
+    CSV_PATH,
+    open_match_writer,
+    drop_holidays,
+)
+from src.process.menu_search_index import has_menu_index, indexed_watermark, search_menus
+from src.process.match_state import (
+    open_state,
+    holiday_keyword_hashes,
+    get_watermark,
+    get_keyword_hashes,
+    save_state,
+    load_aggregates,
+)
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "processed" / "uber_eats.db"
 HOLIDAY_DB_PATH = PROJECT_ROOT / "data" / "processed" / "food_holidays.db"
-OUTPUT_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_menu_matches.csv"
+OUTPUT_PATHS = {"parquet": PARQUET_PATH, "csv": CSV_PATH}
+POPULARITY_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_popularity.csv"
+TOP_DISHES_PATH = PROJECT_ROOT / "data" / "processed" / "top_dishes_per_holiday.csv"
+RESTAURANT_COUNTS_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_restaurant_counts.csv"
 
 CHUNK_SIZE = 200_000  # safe for your system
+MENU_BATCH_SIZE = 20_000  # rows fetched from SQLite per cursor batch
 
-def normalize_text(text):
-    if not isinstance(text, str):
-        return ""
-    return re.sub(r"[^a-zA-Z0-9\s]", "", text).lower()
+# Only the columns matching needs, in the order iter_menu_batches yields them
+MENU_COLUMNS = "rowid, restaurant_id, name, description, price"
+NORMALIZED_FIELDS = ["restaurant_id", "name", "price", "clean_name", "clean_description"]
 
-def main():
-    print("🔌 Connecting to SQLite databases...")
-    conn_menus = sqlite3.connect(DB_PATH)
-    conn_holidays = sqlite3.connect(HOLIDAY_DB_PATH)
+def iter_holiday_keywords(holidays):
+    """
+    Yields (holiday, date, keyword) for every usable keyword,
+    using the same cleaning rules as the original per-keyword loop.
+    """
+    for h in holidays.itertuples(index=False):
+        for kw in str(h.keywords).split(", "):
+            kw = kw.strip().lower()
+            if not kw or len(kw) < 4:
+                continue
+            yield h.name, h.date, kw
+
+def build_holiday_automaton(holidays):
+    """
+    Compiles every holiday keyword into one automaton.
+    Returns (automaton, targets) where targets[keyword_id] lists the
+    (holiday, date) pairs that keyword belongs to.
+    """
+    automaton = KeywordAutomaton()
+    targets = []
+
+    for holiday, date, kw in iter_holiday_keywords(holidays):
+        kw_id = automaton.add(kw)
+        if kw_id == len(targets):
+            targets.append([])
+        targets[kw_id].append((holiday, date))
+
+    automaton.build()
+    return automaton, targets
+
+def iter_menu_batches(conn, min_rowid, max_rowid, batch_size=MENU_BATCH_SIZE):
+    """
+    Streams menu rows in a rowid window with a plain cursor, fetching
+    `batch_size` rows at a time and normalizing each batch on the fly.
+    Yields lists of (restaurant_id, name, price, clean_name, clean_description),
+    so memory stays bounded by the batch size, not the table size.
+    """
+    cursor = conn.execute(
+        f"SELECT {MENU_COLUMNS} FROM menus WHERE rowid BETWEEN ? AND ? ORDER BY rowid",
+        (min_rowid, max_rowid),
+    )
+
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield [
+            (restaurant_id, name, price, normalize_text(name), normalize_text(description))
+            for _, restaurant_id, name, description, price in rows
+        ]
+
+def normalized_menu_rows(menus):
+    """
+    Same tuples as iter_menu_batches, from a DataFrame that already has
+    clean_name / clean_description columns.
+    """
+    return menus[NORMALIZED_FIELDS].itertuples(index=False, name=None)
+
+def iter_matches(menu_rows, automaton, targets):
+    """
+    Single pass over the menu rows: each row is scanned once and every
+    (holiday, keyword) hit on its name or description is emitted.
+    menu_rows: iterable of (restaurant_id, name, price, clean_name, clean_description).
+    """
+    keywords = automaton.keywords
+
+    for restaurant_id, name, price, clean_name, clean_description in menu_rows:
+        hits = automaton.find(clean_name)
+        automaton.find(clean_description, hits)
+        if not hits:
+            continue
+
+        for kw_id in sorted(hits):
+            kw = keywords[kw_id]
+            for holiday, date in targets[kw_id]:
+                yield (holiday, date, kw, restaurant_id, name, price)
+
+def iter_matches_per_keyword(menus, holidays):
+    """
+    Original holidays x keywords x chunks loop, one `str.contains` scan per
+    keyword. Kept as the reference implementation for benchmarks.
+    """
+    for holiday, date, kw in iter_holiday_keywords(holidays):
+        for start in range(0, len(menus), CHUNK_SIZE):
+            end = start + CHUNK_SIZE
+            chunk = menus.iloc[start:end]
 
-    print("📥 Loading menus and holiday keywords...")
-    menus = pd.read_sql("SELECT * FROM menus", conn_menus)
+            mask = (
+                chunk["clean_name"].str.contains(kw, na=False)
+                | chunk["clean_description"].str.contains(kw, na=False)
+            )
+
+            for _, m in chunk[mask].iterrows():
+                yield (holiday, date, kw, m["restaurant_id"], m["name"], m["price"])
+
+def load_holidays(db_path=HOLIDAY_DB_PATH):
+    conn = sqlite3.connect(db_path)
     holidays = pd.read_sql(
         "SELECT name, date, keywords FROM food_holiday_keywords",
-        conn_holidays
+        conn
+    )
+    conn.close()
+    return holidays
+
+def menu_shards(db_path, shard_size=CHUNK_SIZE, min_rowid=None, max_rowid=None):
+    """
+    Splits the menus table (optionally limited to a rowid window)
+    into contiguous rowid ranges with inclusive bounds.
+    """
+    conn = sqlite3.connect(db_path)
+    lo, hi = conn.execute("SELECT MIN(rowid), MAX(rowid) FROM menus").fetchone()
+    conn.close()
+
+    if lo is None:
+        return []
+
+    lo = lo if min_rowid is None else max(lo, min_rowid)
+    hi = hi if max_rowid is None else min(hi, max_rowid)
+
+    return [(start, min(start + shard_size - 1, hi)) for start in range(lo, hi + 1, shard_size)]
+
+def max_menu_rowid(db_path):
+    conn = sqlite3.connect(db_path)
+    hi = conn.execute("SELECT MAX(rowid) FROM menus").fetchone()[0]
+    conn.close()
+    return hi or 0
+
+# -------------------------
+# Shard workers
+# -------------------------
+_worker_state = {}
+
+def _init_worker(db_path, holidays, keep_rows=True):
+    automaton, targets = build_holiday_automaton(holidays)
+    _worker_state["db_path"] = db_path
+    _worker_state["automaton"] = automaton
+    _worker_state["targets"] = targets
+    _worker_state["keep_rows"] = keep_rows
+
+def _iter_shard(bounds):
+    """
+    Streams one rowid range batch by batch, yielding
+    (menu_rows, match_rows, aggregator) per cursor batch.
+    Without keep_rows the match rows are only counted, and an
+    empty list is yielded in their place.
+    """
+    conn = sqlite3.connect(_worker_state["db_path"])
+    keep_rows = _worker_state["keep_rows"]
+    try:
+        for batch in iter_menu_batches(conn, *bounds):
+            matches = iter_matches(batch, _worker_state["automaton"], _worker_state["targets"])
+            if keep_rows:
+                rows = list(matches)
+                yield len(batch), rows, MatchAggregator().add_rows(rows)
+            else:
+                yield len(batch), [], MatchAggregator().add_rows(matches)
+    finally:
+        conn.close()
+
+def _match_shard(bounds):
+    """
+    Matches a whole rowid range inside a pool worker and returns
+    (menu_rows, match_rows, aggregator) for it.
+    """
+    total_menus = 0
+    shard_rows = []
+    shard_aggregator = MatchAggregator()
+
+    for n_menus, rows, aggregator in _iter_shard(bounds):
+        total_menus += n_menus
+        shard_rows.extend(rows)
+        shard_aggregator.merge(aggregator)
+
+    return total_menus, shard_rows, shard_aggregator
+
+def match_menus(db_path, holidays, output_path, workers=1, shard_size=CHUNK_SIZE,
+                min_rowid=None, max_rowid=None, append=False):
+    """
+    Matches every menu shard and writes the results to `output_path`
+    (Parquet or CSV, by suffix). Shards are written back in rowid order,
+    so the output is identical for any number of workers. With
+    append=True rows are added to the existing output instead of
+    replacing it. With output_path=None no raw rows are kept at all,
+    only the aggregates.
+    Returns (menu_rows, match_rows, aggregator).
+    """
+    shards = menu_shards(db_path, shard_size, min_rowid, max_rowid)
+    aggregator = MatchAggregator()
+    total_menus = 0
+    keep_rows = output_path is not None
+
+    writer = open_match_writer(output_path, append=append) if keep_rows else None
+
+    if workers > 1:
+        # Each worker holds one shard's matches; keep shard_size modest
+        pool = mp.Pool(workers, initializer=_init_worker, initargs=(db_path, holidays, keep_rows))
+        results = pool.imap(_match_shard, shards)
+    else:
+        # Inline: stream cursor batches straight to the writer
+        pool = None
+        _init_worker(db_path, holidays, keep_rows)
+        results = (batch for bounds in shards for batch in _iter_shard(bounds))
+
+    try:
+        for n_menus, rows, batch_aggregator in results:
+            if writer is not None:
+                writer.write_rows(rows)
+            aggregator.merge(batch_aggregator)
+            total_menus += n_menus
+            print(f"🎯 Menu items: {total_menus} | Total matches so far: {aggregator.rows}")
+    finally:
+        if writer is not None:
+            writer.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return total_menus, aggregator.rows, aggregator
+
+def match_holidays_via_index(db_path, holidays, output_path, max_rowid=None):
+    """
+    Matches `holidays` through the menu keyword index: one indexed lookup
+    per keyword instead of a scan of every menu row. Emits the same rows
+    as a scan (grouped by keyword rather than by menu row) and appends
+    them to `output_path` (or only counts them when it is None).
+    Returns (match_rows, aggregator).
+    """
+    targets = {}
+    for holiday, date, kw in iter_holiday_keywords(holidays):
+        targets.setdefault(kw, []).append((holiday, date))
+
+    conn = sqlite3.connect(db_path)
+    writer = open_match_writer(output_path, append=True) if output_path is not None else None
+    aggregator = MatchAggregator()
+
+    try:
+        for kw, kw_targets in targets.items():
+            rows = [
+                (holiday, date, kw, restaurant_id, name, price)
+                for _, restaurant_id, name, price in search_menus(conn, kw, max_rowid)
+                for holiday, date in kw_targets
+            ]
+            if writer is not None:
+                writer.write_rows(rows)
+            aggregator.add_rows(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+        conn.close()
+
+    return aggregator.rows, aggregator
+
+def menu_index_covers(db_path, rowid):
+    conn = sqlite3.connect(db_path)
+    covered = has_menu_index(conn) and indexed_watermark(conn) >= rowid
+    conn.close()
+    return covered
+
+# -------------------------
+# Full + incremental runs
+# -------------------------
+def write_aggregates(aggregator):
+    """
+    Writes the popularity, top-dish and per-restaurant CSVs straight from
+    match counts, so none of them needs the raw match rows.
+    """
+    popularity_frame(aggregator.holiday_counts).to_csv(POPULARITY_PATH, index=False)
+    top_dishes_frame(aggregator.item_counts).to_csv(TOP_DISHES_PATH, index=False)
+    restaurant_counts_frame(aggregator.restaurant_counts).to_csv(RESTAURANT_COUNTS_PATH, index=False)
+    print(f"📊 Wrote {POPULARITY_PATH.name}, {TOP_DISHES_PATH.name} and {RESTAURANT_COUNTS_PATH.name}.")
+
+def run_full(holidays, output_path, workers=1, shard_size=CHUNK_SIZE):
+    """
+    Matches every menu row. output_path=None skips the raw match file
+    and keeps only the aggregates.
+    """
+    watermark = max_menu_rowid(DB_PATH)
+    total_menus, total_written, aggregator = match_menus(
+        DB_PATH, holidays, output_path,
+        workers=workers, shard_size=shard_size, max_rowid=watermark,
     )
 
-    conn_menus.close()
-    conn_holidays.close()
+    # Record what was matched so the next run can be incremental
+    state = open_state()
+    save_state(state, watermark, holiday_keyword_hashes(iter_holiday_keywords(holidays)), aggregator, full=True)
+    state.close()
 
-    print(f"🍽 Loaded {len(menus)} menu items.")
+    write_aggregates(aggregator)
+    return total_menus, total_written
+
+def run_incremental(holidays, output_path, workers=1, shard_size=CHUNK_SIZE):
+    """
+    Matches only what changed since the last run:
+      - menu rows above the stored rowid watermark, against every holiday
+      - menu rows at or below it, against holidays whose keywords changed
+        (through the menu keyword index when it covers those rows)
+    Rows of changed or removed holidays are replaced in the match file (if
+    one is kept) and in the stored counts, and the aggregate CSVs are
+    rewritten from those counts. Menus are assumed append-only (as
+    load_to_sqlite does).
+    """
+    state = open_state()
+    watermark = get_watermark(state)
+
+    if watermark is None or (output_path is not None and not output_path.exists()):
+        state.close()
+        print("🆕 No previous match state found, running a full match.")
+        total_menus, total_written = run_full(holidays, output_path, workers, shard_size)
+    else:
+        hashes = holiday_keyword_hashes(iter_holiday_keywords(holidays))
+        stored_hashes = get_keyword_hashes(state)
+        changed = sorted(h for h, digest in hashes.items() if stored_hashes.get(h) != digest)
+        removed = sorted(set(stored_hashes) - set(hashes))
+        new_watermark = max(watermark, max_menu_rowid(DB_PATH))
+
+        print(f"📌 Watermark: rowid {watermark} -> {new_watermark}")
+        print(f"🔁 Holidays changed: {len(changed)} | removed: {len(removed)}")
+
+        if output_path is not None and (changed or removed):
+            dropped = drop_holidays(output_path, changed + removed)
+            print(f"🧹 Dropped {dropped} stale match rows.")
+
+        aggregator = MatchAggregator()
+        total_menus = total_written = 0
+
+        if changed and menu_index_covers(DB_PATH, watermark):
+            print("🗂 Rematching changed holidays through the menu index...")
+            n_written, changed_aggregator = match_holidays_via_index(
+                DB_PATH, holidays[holidays["name"].isin(changed)], output_path, max_rowid=watermark,
+            )
+            aggregator.merge(changed_aggregator)
+            total_written += n_written
+        elif changed:
+            n_menus, n_written, changed_aggregator = match_menus(
+                DB_PATH, holidays[holidays["name"].isin(changed)], output_path,
+                workers=workers, shard_size=shard_size, max_rowid=watermark, append=True,
+            )
+            aggregator.merge(changed_aggregator)
+            total_menus += n_menus
+            total_written += n_written
+
+        if new_watermark > watermark:
+            n_menus, n_written, new_aggregator = match_menus(
+                DB_PATH, holidays, output_path,
+                workers=workers, shard_size=shard_size,
+                min_rowid=watermark + 1, max_rowid=new_watermark, append=True,
+            )
+            aggregator.merge(new_aggregator)
+            total_menus += n_menus
+            total_written += n_written
+
+        save_state(state, new_watermark, hashes, aggregator, replace_holidays=changed + removed)
+        write_aggregates(load_aggregates(state))
+        state.close()
+
+    return total_menus, total_written
+
+def main():
+    parser = argparse.ArgumentParser(description="Match food holiday keywords against menu items.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1, max useful: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=CHUNK_SIZE, help="Menu rowids per shard")
+    parser.add_argument("--format", choices=sorted(OUTPUT_PATHS), default="parquet",
+                        help="Match output format (default: parquet)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only match new menu rows and holidays whose keywords changed")
+    parser.add_argument("--no-raw", action="store_true",
+                        help="Skip the raw match file; only write the aggregate CSVs")
+    args = parser.parse_args()
+
+    print("📥 Loading holiday keywords...")
+    holidays = load_holidays()
     print(f"🎉 Loaded {len(holidays)} holidays.")
 
-    menus["clean_name"] = menus["name"].apply(normalize_text)
-    menus["clean_description"] = menus["description"].apply(normalize_text)
-
-    # Create CSV file + header ONCE
-    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "holiday_name",
-                "date",
-                "matched_keyword",
-                "restaurant_id",
-                "menu_item",
-                "price",
-            ],
-        )
-        writer.writeheader()
-
-    print("🔎 Matching holidays to menus (streaming)...")
-
-    total_written = 0
-
-    with open(OUTPUT_PATH, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "holiday_name",
-                "date",
-                "matched_keyword",
-                "restaurant_id",
-                "menu_item",
-                "price",
-            ],
-        )
-
-        for _, h in holidays.iterrows():
-            holiday = h["name"]
-            date = h["date"]
-            keywords = str(h["keywords"]).split(", ")
-
-            for kw in keywords:
-                kw = kw.strip().lower()
-                if not kw or len(kw) < 4:
-                    continue
-
-                for start in range(0, len(menus), CHUNK_SIZE):
-                    end = start + CHUNK_SIZE
-                    chunk = menus.iloc[start:end]
-
-                    mask = (
-                        chunk["clean_name"].str.contains(kw, na=False)
-                        | chunk["clean_description"].str.contains(kw, na=False)
-                    )
-
-                    matched = chunk[mask]
-
-                    for _, m in matched.iterrows():
-                        writer.writerow({
-                            "holiday_name": holiday,
-                            "date": date,
-                            "matched_keyword": kw,
-                            "restaurant_id": m["restaurant_id"],
-                            "menu_item": m["name"],
-                            "price": m["price"],
-                        })
-                        total_written += 1
-
-                    del chunk, matched, mask
-
-            print(f"🎯 Completed: {holiday} | Total matches so far: {total_written}")
+    output_path = None if args.no_raw else OUTPUT_PATHS[args.format]
+
+    print(f"🔎 Matching holidays to menus ({args.workers} worker(s))...")
+    start = time.perf_counter()
+    if args.incremental:
+        total_menus, total_written = run_incremental(holidays, output_path, args.workers, args.shard_size)
+    else:
+        total_menus, total_written = run_full(holidays, output_path, args.workers, args.shard_size)
+    elapsed = time.perf_counter() - start
 
     print(f"\n✅ MATCHING COMPLETE")
-    print(f"💾 Total rows written: {total_written}")
-    print(f"📁 Output file: {OUTPUT_PATH}")
+    print(f"🍽 Menu items scanned: {total_menus} ({total_menus / max(elapsed, 1e-9):,.0f} rows/s)")
+    print(f"💾 Total matches: {total_written}")
+    print(f"📁 Output file: {output_path or 'none (--no-raw)'}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,213 @@
+# src/process/match_output.py
+import csv
+import math
+import os
+import re
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PARQUET_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_menu_matches.parquet"
+CSV_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_menu_matches.csv"
+
+ROW_GROUP_SIZE = 1_000_000
+COMPRESSION = "zstd"
+# First number in a price string: "12.99 USD", "$1,299.00", "12,99 €"
+PRICE_PATTERN = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+
+MATCH_FIELDS = [
+    "holiday_name",
+    "date",
+    "matched_keyword",
+    "restaurant_id",
+    "menu_item",
+    "price",
+]
+PRICE_INDEX = MATCH_FIELDS.index("price")
+
+# Holiday, date and keyword repeat millions of times: store them as dictionaries
+MATCH_SCHEMA = pa.schema([
+    ("holiday_name", pa.dictionary(pa.int32(), pa.string())),
+    ("date", pa.dictionary(pa.int32(), pa.string())),
+    ("matched_keyword", pa.dictionary(pa.int32(), pa.string())),
+    ("restaurant_id", pa.int64()),
+    ("menu_item", pa.string()),
+    ("price", pa.float64()),
+])
+
+
+def default_match_path():
+    """
+    Parquet output if it exists, otherwise the legacy CSV.
+    """
+    return PARQUET_PATH if PARQUET_PATH.exists() else CSV_PATH
+
+
+def _is_parquet(path):
+    return Path(path).suffix == ".parquet"
+
+
+def parse_price(value):
+    """
+    Menu price as a float, or None when missing or unparseable.
+    Strings keep their first number ("12.99 USD" -> 12.99); a lone comma
+    followed by two digits is a decimal comma ("12,99" -> 12.99).
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+
+    match = PRICE_PATTERN.search(str(value))
+    if match is None:
+        return None
+    number = match.group()
+    if re.fullmatch(r"-?\d+,\d{2}", number):
+        return float(number.replace(",", "."))
+    return float(number.replace(",", ""))
+
+
+# -------------------------
+# Writers
+# -------------------------
+class CsvMatchWriter:
+    def __init__(self, path, append=False):
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if not append:
+            self._writer.writerow(MATCH_FIELDS)
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetMatchWriter:
+    """
+    Writes match rows to a Parquet dataset directory (one file per run,
+    row groups of ROW_GROUP_SIZE). Appending adds a new part file, so
+    earlier parts are never rewritten.
+    """
+
+    def __init__(self, path, append=False, row_group_size=ROW_GROUP_SIZE):
+        path = Path(path)
+        if not append and path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        part = len(list(path.glob("part-*.parquet")))
+        self._writer = pq.ParquetWriter(
+            path / f"part-{part:05d}.parquet",
+            MATCH_SCHEMA,
+            compression=COMPRESSION,
+            use_dictionary=True,
+        )
+        self._row_group_size = row_group_size
+        self._pending = []
+        self._pending_rows = 0
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        # Convert each batch to Arrow right away; columnar buffers are far
+        # smaller than the row tuples they come from
+        columns = list(zip(*rows))
+        arrays = []
+        for index, (col, field) in enumerate(zip(columns, MATCH_SCHEMA)):
+            try:
+                arrays.append(pa.array(col, type=field.type, from_pandas=True))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                if index != PRICE_INDEX:
+                    raise
+                # Scraped menus store some prices as text ("12.99 USD")
+                arrays.append(pa.array([parse_price(v) for v in col], type=field.type))
+        self._pending.append(pa.Table.from_arrays(arrays, schema=MATCH_SCHEMA))
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        self._writer.write_table(pa.concat_tables(self._pending), row_group_size=self._row_group_size)
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def open_match_writer(path, append=False):
+    if _is_parquet(path):
+        return ParquetMatchWriter(path, append=append)
+    return CsvMatchWriter(path, append=append)
+
+
+# -------------------------
+# Readers
+# -------------------------
+def iter_match_frames(path, columns, chunk_size=ROW_GROUP_SIZE):
+    """
+    Yields DataFrames holding only `columns` of the match output.
+    Parquet reads just those column chunks (string columns come back as
+    categoricals); CSV falls back to chunked pandas parsing.
+    """
+    if _is_parquet(path):
+        for part in sorted(Path(path).glob("part-*.parquet")):
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+
+def drop_holidays(path, holiday_names):
+    """
+    Removes the rows of the given holidays from the match output.
+    Returns the number of rows dropped.
+    """
+    holiday_names = set(holiday_names)
+    dropped = 0
+
+    if _is_parquet(path):
+        value_set = pa.array(sorted(holiday_names), type=pa.string())
+        for part in sorted(Path(path).glob("part-*.parquet")):
+            tmp_part = part.with_suffix(".tmp")
+            part_dropped = 0
+
+            with pq.ParquetWriter(tmp_part, MATCH_SCHEMA, compression=COMPRESSION, use_dictionary=True) as writer:
+                for batch in pq.ParquetFile(part).iter_batches(batch_size=ROW_GROUP_SIZE):
+                    names = batch.column("holiday_name").cast(pa.string())
+                    kept = batch.filter(pc.invert(pc.is_in(names, value_set=value_set)))
+                    part_dropped += batch.num_rows - kept.num_rows
+                    writer.write_table(pa.Table.from_batches([kept]), row_group_size=ROW_GROUP_SIZE)
+
+            if part_dropped:
+                os.replace(tmp_part, part)
+                dropped += part_dropped
+            else:
+                os.remove(tmp_part)
+        return dropped
+
+    tmp_path = Path(path).with_suffix(".tmp")
+    with open(path, newline="", encoding="utf-8") as src, \
+         open(tmp_path, "w", newline="", encoding="utf-8") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        writer.writerow(next(reader))
+
+        for row in reader:
+            if row[0] in holiday_names:
+                dropped += 1
+                continue
+            writer.writerow(row)
+
+    os.replace(tmp_path, path)
+    return dropped
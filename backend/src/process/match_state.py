@@ -0,0 +1,136 @@
+# src/process/match_state.py
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+from src.analytics.match_aggregates import MatchAggregator
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+STATE_DB_PATH = PROJECT_ROOT / "data" / "processed" / "holiday_match_state.db"
+
+MENU_WATERMARK = "menus_rowid"
+COUNT_TABLES = ("holiday_match_counts", "holiday_item_counts", "holiday_restaurant_counts")
+
+
+def open_state(db_path=STATE_DB_PATH):
+    """
+    State for incremental matching: the last matched menu rowid, a keyword
+    hash per holiday, and the running match counts behind the popularity,
+    top-dish and per-restaurant outputs.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS match_watermarks (
+            name TEXT PRIMARY KEY,
+            value INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS holiday_keyword_hashes (
+            holiday_name TEXT PRIMARY KEY,
+            keyword_hash TEXT
+        );
+        CREATE TABLE IF NOT EXISTS holiday_match_counts (
+            holiday_name TEXT PRIMARY KEY,
+            match_count INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS holiday_item_counts (
+            holiday_name TEXT,
+            menu_item TEXT,
+            match_count INTEGER,
+            PRIMARY KEY (holiday_name, menu_item)
+        );
+        CREATE TABLE IF NOT EXISTS holiday_restaurant_counts (
+            holiday_name TEXT,
+            restaurant_id INTEGER,
+            match_count INTEGER,
+            PRIMARY KEY (holiday_name, restaurant_id)
+        );
+    """)
+    return conn
+
+
+def holiday_keyword_hashes(holiday_keywords):
+    """
+    holiday_keywords: iterable of (holiday, date, keyword).
+    Returns holiday -> hash of everything that affects its match rows.
+    """
+    entries = {}
+    for holiday, date, kw in holiday_keywords:
+        entries.setdefault(holiday, []).append([str(date), kw])
+
+    return {
+        holiday: hashlib.sha1(json.dumps(sorted(items)).encode("utf-8")).hexdigest()
+        for holiday, items in entries.items()
+    }
+
+
+def get_watermark(conn, name=MENU_WATERMARK):
+    row = conn.execute("SELECT value FROM match_watermarks WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def get_keyword_hashes(conn):
+    return dict(conn.execute("SELECT holiday_name, keyword_hash FROM holiday_keyword_hashes"))
+
+
+def save_state(conn, watermark, keyword_hashes, aggregator, replace_holidays=(), full=False):
+    """
+    Applies one matching run to the stored state in a single transaction.
+
+    full=True discards all previous counts; otherwise counts for
+    `replace_holidays` are dropped and the aggregator's counts are added
+    on top of what is already stored.
+    """
+    with conn:
+        for table in COUNT_TABLES:
+            if full:
+                conn.execute(f"DELETE FROM {table}")
+            else:
+                conn.executemany(
+                    f"DELETE FROM {table} WHERE holiday_name = ?",
+                    [(h,) for h in replace_holidays],
+                )
+
+        conn.executemany("""
+            INSERT INTO holiday_match_counts (holiday_name, match_count) VALUES (?, ?)
+            ON CONFLICT(holiday_name) DO UPDATE SET match_count = match_count + excluded.match_count
+        """, aggregator.holiday_counts.items())
+        conn.executemany("""
+            INSERT INTO holiday_item_counts (holiday_name, menu_item, match_count) VALUES (?, ?, ?)
+            ON CONFLICT(holiday_name, menu_item) DO UPDATE SET match_count = match_count + excluded.match_count
+        """, ((h, m, c) for (h, m), c in aggregator.item_counts.items()))
+        conn.executemany("""
+            INSERT INTO holiday_restaurant_counts (holiday_name, restaurant_id, match_count) VALUES (?, ?, ?)
+            ON CONFLICT(holiday_name, restaurant_id) DO UPDATE SET match_count = match_count + excluded.match_count
+        """, ((h, r, c) for (h, r), c in aggregator.restaurant_counts.items()))
+
+        conn.execute("DELETE FROM holiday_keyword_hashes")
+        conn.executemany(
+            "INSERT INTO holiday_keyword_hashes (holiday_name, keyword_hash) VALUES (?, ?)",
+            keyword_hashes.items(),
+        )
+        conn.execute("""
+            INSERT INTO match_watermarks (name, value) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET value = excluded.value
+        """, (MENU_WATERMARK, watermark))
+
+
+def load_aggregates(conn):
+    """
+    Stored counts as a MatchAggregator, ready for the CSV writers.
+    """
+    aggregator = MatchAggregator()
+    aggregator.holiday_counts.update(dict(conn.execute(
+        "SELECT holiday_name, match_count FROM holiday_match_counts WHERE match_count > 0"
+    )))
+    aggregator.item_counts.update({
+        (h, m): c for h, m, c in conn.execute(
+            "SELECT holiday_name, menu_item, match_count FROM holiday_item_counts WHERE match_count > 0"
+        )
+    })
+    aggregator.restaurant_counts.update({
+        (h, r): c for h, r, c in conn.execute(
+            "SELECT holiday_name, restaurant_id, match_count FROM holiday_restaurant_counts WHERE match_count > 0"
+        )
+    })
+    return aggregator
@@ -0,0 +1,114 @@
+# src/process/menu_search_index.py
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from src.process.keyword_automaton import normalize_text
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DB_PATH = PROJECT_ROOT / "data" / "processed" / "uber_eats.db"
+INDEX_TABLE = "menus_fts"
+BATCH_SIZE = 100_000
+
+
+def has_menu_index(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (INDEX_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def indexed_watermark(conn):
+    """
+    Highest menus rowid already in the index (0 if none).
+    """
+    if not has_menu_index(conn):
+        return 0
+    row = conn.execute(f"SELECT rowid FROM {INDEX_TABLE} ORDER BY rowid DESC LIMIT 1").fetchone()
+    return row[0] if row else 0
+
+
+def refresh_menu_index(conn, batch_size=BATCH_SIZE):
+    """
+    Creates the FTS5 index over normalized menu name/description if needed
+    and adds every menu row above the indexed watermark. The trigram
+    tokenizer makes MATCH a substring search, the same rule the matcher uses.
+    Returns the number of rows added.
+    """
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE}
+        USING fts5(clean_name, clean_description, tokenize = 'trigram')
+    """)
+
+    watermark = indexed_watermark(conn)
+    cursor = conn.execute(
+        "SELECT rowid, name, description FROM menus WHERE rowid > ? ORDER BY rowid",
+        (watermark,),
+    )
+
+    added = 0
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        with conn:
+            conn.executemany(
+                f"INSERT INTO {INDEX_TABLE} (rowid, clean_name, clean_description) VALUES (?, ?, ?)",
+                ((rowid, normalize_text(name), normalize_text(desc)) for rowid, name, desc in rows),
+            )
+        added += len(rows)
+        print(f"🗂 Indexed {added} menu rows (up to rowid {rows[-1][0]})")
+
+    return added
+
+
+def search_menus(conn, keyword, max_rowid=None):
+    """
+    Menu rows whose normalized name or description contains `keyword`.
+    Returns (rowid, restaurant_id, name, price) tuples in rowid order.
+    """
+    keyword = normalize_text(keyword).strip()
+    if len(keyword) < 3:
+        raise ValueError("Keyword must be at least 3 characters for trigram search.")
+
+    query = f"""
+        SELECT m.rowid, m.restaurant_id, m.name, m.price
+        FROM {INDEX_TABLE} f
+        JOIN menus m ON m.rowid = f.rowid
+        WHERE {INDEX_TABLE} MATCH ?
+    """
+    params = [f'"{keyword}"']
+    if max_rowid is not None:
+        query += " AND f.rowid <= ?"
+        params.append(max_rowid)
+
+    return conn.execute(query + " ORDER BY f.rowid", params).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the menu keyword index.")
+    parser.add_argument("--query", help="Keyword to look up, e.g. 'chocolate cake'")
+    parser.add_argument("--limit", type=int, default=10, help="Rows to print for --query")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+
+    if args.query:
+        start = time.perf_counter()
+        rows = search_menus(conn, args.query)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"🔎 '{args.query}': {len(rows)} menu items in {elapsed:.1f} ms")
+        for rowid, restaurant_id, name, price in rows[:args.limit]:
+            print(f"  #{rowid} | restaurant {restaurant_id} | {name} | {price}")
+    else:
+        print(f"🔌 Refreshing menu index in {DB_PATH}")
+        added = refresh_menu_index(conn)
+        print(f"✅ Menu index up to date ({added} new rows)")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
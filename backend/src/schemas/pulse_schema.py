@@ -0,0 +1,85 @@
+# src/schemas/pulse_schema.py
+# Response shapes of docs/api_contract_v1.md
+
+from pydantic import BaseModel, create_model
+from typing import Dict, List, Literal, Optional
+
+MomentumState = Literal["EMERGING", "FLAT", "PEAKING", "FATIGUED"]
+
+
+class Baseline(BaseModel):
+    mean: float
+    std: float
+    window: str
+    note: Optional[str] = None
+
+
+class WindowBaseline(Baseline):
+    deviation_score: float
+
+
+class PlatformBias(BaseModel):
+    adjusted_phase: MomentumState
+    adjusted_confidence: float
+    urgency: Literal["LOW", "MEDIUM", "HIGH"]
+    recommended_action: str
+
+
+class PulseInsight(BaseModel):
+    entity: str
+    category: str
+
+    series: List[float]
+    baseline: Baseline
+    current_value: float
+    deviation_score: float
+    baselines: Dict[str, WindowBaseline]   # "7d", "14d", "28d", "90d"
+
+    velocity: float
+    acceleration: float
+    momentum_state: MomentumState
+
+    confidence_score: float
+    risk_level: Literal["LOW", "MEDIUM", "HIGH"]
+    explanation: str
+
+    action_hint: str
+    action_window_hours: int
+    urgency: Literal["NOW", "SOON", "NORMAL"]
+    window_explanation: str
+
+    platform_bias: Dict[str, PlatformBias]   # one entry per configured platform
+
+
+# What /pulse/trends?fields=... returns per insight: `entity` plus whichever
+# PulseInsight fields were asked for (all of them without fields=)
+PulseInsightFields = create_model(
+    "PulseInsightFields",
+    entity=(str, ...),
+    **{
+        name: (Optional[field.annotation], None)
+        for name, field in PulseInsight.model_fields.items()
+        if name != "entity"
+    },
+)
+
+
+class PulseResponse(BaseModel):
+    pulse_generated_at: str
+    insights: List[PulseInsightFields]
+    next_cursor: Optional[str] = None      # ranked pages only
+
+
+class PulseExplanation(BaseModel):
+    entity: str
+    deviation_score: float
+    momentum_state: MomentumState
+    velocity: float
+    acceleration: float
+    confidence_score: float
+    risk_level: Literal["LOW", "MEDIUM", "HIGH"]
+    explanation: str
+    action_window_hours: int
+    urgency: Literal["NOW", "SOON", "NORMAL"]
+    window_explanation: str
+
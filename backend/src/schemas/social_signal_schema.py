@@ -1,6 +1,6 @@
 # src/schemas/social_signal_schema.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional, Dict
 
 class SocialSignal(BaseModel):
@@ -13,3 +13,7 @@ class SocialSignal(BaseModel):
     engagement: Dict[str, int] # {"likes": 1200, "comments": 34, "shares": 10}
     creator_followers: int
     geo: Optional[str] = None  # "US", "CA"
+
+
+# Compiled once; serializes a whole batch in one call
+SOCIAL_SIGNALS = TypeAdapter(List[SocialSignal])
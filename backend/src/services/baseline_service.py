@@ -56,3 +56,171 @@ def compute_baseline_and_deviation(history: List[float], current_value: float) -
         "current_value": current_value,
         "deviation_score": deviation_score
     }
+
+
+# -------------------------
+# Multi-window baselines
+# -------------------------
+BASELINE_WINDOWS = (7, 14, 28, 90)
+_PREFIX_NOISE = 64 * np.finfo(np.float64).eps
+# Bound on an incrementally computed (prefix-sum or running) mean/std error,
+# relative to the window's magnitude. A value closer than this to a rounding
+# boundary is recomputed from the window itself, so rounding matches
+# compute_baseline_stats.
+_ROUNDING_SLACK = 1e-9
+
+
+def py_round(values, ndigits: int) -> np.ndarray:
+    """
+    Element-wise round(x, ndigits) with Python's semantics.
+
+    np.round rounds x * 10**ndigits, and that product can land on the other
+    side of a .5 boundary from the exact value Python rounds. Only elements
+    that close to a tie can differ, so those few go through the builtin.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.round(values, ndigits)
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values * 10.0 ** ndigits
+        near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 1e-6 * np.maximum(1.0, np.abs(scaled))
+
+    if near_tie.any():
+        out[near_tie] = [round(v, ndigits) for v in values[near_tie].tolist()]
+    return out
+
+
+def _round_margin(values, ndigits: int) -> np.ndarray:
+    # Distance from each value to its nearest rounding boundary, in value units
+    scaled = np.abs(values) * 10.0 ** ndigits
+    return np.abs(scaled - np.floor(scaled) - 0.5) / 10.0 ** ndigits
+
+
+def rounds_exactly(mean, std, points):
+    """
+    Whether an approximate (mean, std) over `points` values rounds to 2
+    decimals exactly as the values' own mean/std would, per element (works
+    on scalars too). False near a rounding boundary, or for a (near-)constant
+    window whose std == 0 check must see the exact value.
+    """
+    # Largest |value| in the window is at most |mean| + std * sqrt(points)
+    scale = 1.0 + np.abs(mean) + std * np.sqrt(points)
+    with np.errstate(divide="ignore"):
+        return (
+            (_round_margin(mean, 2) > _ROUNDING_SLACK * scale)
+            & (std > _ROUNDING_SLACK * scale)
+            & (_round_margin(std, 2) > _ROUNDING_SLACK * scale * scale / std)
+        )
+
+
+class BaselineStore:
+    """
+    Prefix sums and prefix sums of squares of each row of an
+    (entities x days) matrix, so the mean/std of any window of any row is
+    O(1) and a window over every row is one vectorized step.
+    Integer series (engagement counts) are summed exactly in int64; other
+    series are shifted by their row mean first to keep the variance stable.
+    """
+    def __init__(self, matrix):
+        values = np.asarray(matrix, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        self.n_entities, self.n_days = values.shape
+        self.values = values
+
+        # window * sum(x^2) and sum(x)^2 must both fit in int64
+        self.exact = bool(
+            values.size and np.all(values == np.round(values))
+            and float(np.abs(values).max()) ** 2 * self.n_days ** 2 < 2.0 ** 62
+        )
+        if self.exact:
+            self.shift = np.zeros((self.n_entities, 1))
+            summed = values.astype(np.int64)
+        else:
+            self.shift = values.mean(axis=1, keepdims=True) if self.n_days else np.zeros((self.n_entities, 1))
+            summed = values - self.shift
+
+        zeros = np.zeros((self.n_entities, 1), dtype=summed.dtype)
+        self.prefix = np.concatenate([zeros, np.cumsum(summed, axis=1)], axis=1)
+        self.prefix_sq = np.concatenate([zeros, np.cumsum(summed * summed, axis=1)], axis=1)
+
+    def window_stats(self, window: int, end: int = None):
+        """
+        Unrounded (mean, std) per row over the `window` days before day
+        index `end` (exclusive; default: the last day).
+        """
+        end = self.n_days if end is None else end
+        start = end - window
+        s1 = self.prefix[:, end] - self.prefix[:, start]
+        s2 = self.prefix_sq[:, end] - self.prefix_sq[:, start]
+
+        if self.exact:
+            variance = (window * s2 - s1 * s1) / (window * window)
+            return s1 / window, np.sqrt(variance)
+
+        centered_mean = s1 / window
+        variance = s2 / window - centered_mean ** 2
+        # Differences of large prefix sums leave rounding noise; a variance
+        # within it is a constant window
+        noise = _PREFIX_NOISE * np.maximum(self.prefix_sq[:, end], self.prefix_sq[:, start]) / window
+        variance = np.where(variance <= noise, 0.0, variance)
+        return self.shift[:, 0] + centered_mean, np.sqrt(variance)
+
+    def baseline_and_deviation(self, window: int) -> Dict:
+        """
+        compute_baseline_and_deviation for every row, with the baseline
+        taken over (at most) the `window` days before the last one.
+        """
+        current = self.values[:, -1]
+        points = min(window, self.n_days - 1)
+
+        if points < 3:
+            mean = np.zeros(self.n_entities)
+            std = np.ones(self.n_entities)
+            note = "Insufficient history; using fallback baseline."
+        else:
+            end = self.n_days - 1
+            mean, std = self.window_stats(points, end=end)
+            redo = ~rounds_exactly(mean, std, points)
+            if redo.any():
+                history = self.values[redo, end - points:end]
+                mean[redo] = history.mean(axis=1)
+                std[redo] = history.std(axis=1)
+            mean = py_round(mean, 2)
+            std = py_round(np.where(std == 0, 1.0, std), 2)
+            note = None if points == window else f"Only {points} days of history for a {window}-day baseline."
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviation = py_round((current - mean) / std, 2)
+
+        return {
+            "mean": mean,
+            "std": std,
+            "window": f"{points}_points",
+            "note": note,
+            "deviation_score": deviation,
+        }
+
+    def multi_window(self, windows=BASELINE_WINDOWS) -> Dict[str, Dict]:
+        """
+        baseline_and_deviation for each window, keyed "7d", "14d", ...
+        """
+        return {f"{window}d": self.baseline_and_deviation(window) for window in windows}
+
+
+def compute_multi_window_baselines(series: List[float], windows=BASELINE_WINDOWS) -> Dict[str, Dict]:
+    """
+    Baseline stats and deviation score of the last point of `series`
+    against each trailing window, e.g. {"7d": {...}, "90d": {...}}.
+    """
+    baselines = BaselineStore(series).multi_window(windows)
+    return {
+        key: {
+            "mean": float(b["mean"][0]),
+            "std": float(b["std"][0]),
+            "window": b["window"],
+            "note": b["note"],
+            "deviation_score": float(b["deviation_score"][0]),
+        }
+        for key, b in baselines.items()
+    }
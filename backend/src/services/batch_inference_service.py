@@ -0,0 +1,490 @@
+# src/services/batch_inference_service.py
+"""
+Array versions of the per-trend services, for scoring many entities at once.
+
+Every function takes one value per entity (or an entities x days matrix)
+and returns arrays that match, element for element, what the scalar
+services return for that entity: the same float operations in the same
+order, and Python's round() semantics via py_round.
+"""
+
+from typing import Collection, Dict, List, Optional
+
+import numpy as np
+
+from src.services.baseline_service import BaselineStore, py_round
+from src.services.momentum_service import compute_velocity
+from src.services.platform_bias_service import PLATFORM_ACTIONS
+from src.services.platform_profiles import PLATFORM_GRID, PlatformGrid
+
+# Same weights as compute_confidence_score
+MOMENTUM_WEIGHTS = {
+    "EMERGING": 1.0,
+    "PEAKING": 0.7,
+    "FATIGUED": 0.3,
+    "FLAT": 0.1,
+}
+
+# Keys of a /pulse/trends insight, in payload order
+INSIGHT_FIELDS = (
+    "entity", "category", "series", "baseline", "current_value", "deviation_score", "baselines",
+    "velocity", "acceleration", "momentum_state", "confidence_score", "risk_level", "explanation",
+    "action_hint", "action_window_hours", "urgency", "window_explanation", "platform_bias",
+)
+
+# np.add.reduce sums fewer than 8 values strictly left to right
+_SEQUENTIAL_SUM_MAX = 7
+
+
+def _select(conditions, choices, default) -> np.ndarray:
+    # np.select over labels: pick an index per entity, then gather the label
+    labels = np.empty(len(choices) + 1, dtype=object)
+    labels[:] = list(choices) + [default]
+    return labels[np.select(conditions, np.arange(len(choices)), default=len(choices))]
+
+
+def _join_parts(parts) -> np.ndarray:
+    """
+    ". ".join(parts) + "." per entity. Each part is an object array of
+    strings; an empty string drops that part (and its separator).
+    """
+    return np.array(
+        [". ".join([p for p in row if p]) + "." for row in zip(*(part.tolist() for part in parts))],
+        dtype=object,
+    )
+
+
+def _float_text(values) -> np.ndarray:
+    # f"{x}" for Python floats
+    return np.array([repr(v) for v in np.asarray(values, dtype=np.float64).tolist()], dtype=object)
+
+
+# -------------------------
+# Baseline
+# -------------------------
+def batch_baseline_and_deviation(matrix: np.ndarray) -> Dict:
+    """
+    compute_baseline_and_deviation(series[:-1], series[-1]) for every row.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    n_entities, n_days = matrix.shape
+    history = matrix[:, :-1]
+    current = matrix[:, -1]
+    window = f"{n_days - 1}_points"
+
+    if n_days - 1 < 3:
+        mean = np.zeros(n_entities)
+        std = np.ones(n_entities)
+        note = "Insufficient history; using fallback baseline."
+    else:
+        mean = py_round(history.mean(axis=1), 2)
+        std = history.std(axis=1)
+        std = py_round(np.where(std == 0, 1.0, std), 2)
+        note = None
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = py_round((current - mean) / std, 2)
+
+    return {
+        "mean": mean,
+        "std": std,
+        "window": window,
+        "note": note,
+        "deviation_score": deviation,
+    }
+
+
+# -------------------------
+# Momentum
+# -------------------------
+def batch_velocity(matrix: np.ndarray, window: int = 3) -> np.ndarray:
+    """
+    compute_velocity for every row: mean % change over the last `window`
+    steps, skipping steps that start from 0.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    n_entities, n_days = matrix.shape
+
+    if n_days < window + 1:
+        return np.zeros(n_entities)
+
+    if window > _SEQUENTIAL_SUM_MAX:
+        # np.mean switches to pairwise summation here; defer to the scalar path
+        return np.array([compute_velocity(row, window=window) for row in matrix.tolist()])
+
+    recent = matrix[:, -(window + 1):]
+    prev = recent[:, :-1]
+    curr = recent[:, 1:]
+    kept = prev != 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_changes = np.where(kept, (curr - prev) / prev, 0.0)
+
+    # Left-to-right, like np.mean on the scalar list; skipped steps add an exact 0.0
+    total = pct_changes[:, 0].copy()
+    for i in range(1, window):
+        total += pct_changes[:, i]
+
+    count = kept.sum(axis=1)
+    velocity = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+    return py_round(velocity, 3)
+
+
+def batch_acceleration(matrix: np.ndarray, window: int = 3) -> np.ndarray:
+    """
+    compute_acceleration for every row.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    n_entities, n_days = matrix.shape
+
+    if n_days < 2 * window + 1:
+        return np.zeros(n_entities)
+
+    v1 = batch_velocity(matrix[:, -(2 * window + 1):-(window + 1)], window=window)
+    v2 = batch_velocity(matrix[:, -(window + 1):], window=window)
+    return py_round(v2 - v1, 3)
+
+
+def batch_classify_momentum_state(velocity: np.ndarray, acceleration: np.ndarray) -> np.ndarray:
+    return _select(
+        [
+            (velocity > 0.2) & (acceleration > 0),
+            (velocity > 0.2) & (np.abs(acceleration) <= 0.05),
+            (velocity > 0.1) & (acceleration < 0),
+        ],
+        ["EMERGING", "PEAKING", "FATIGUED"],
+        "FLAT",
+    )
+
+
+def batch_momentum(matrix: np.ndarray) -> Dict:
+    velocity = batch_velocity(matrix)
+    acceleration = batch_acceleration(matrix)
+    return {
+        "velocity": velocity,
+        "acceleration": acceleration,
+        "momentum_state": batch_classify_momentum_state(velocity, acceleration),
+    }
+
+
+# -------------------------
+# Confidence
+# -------------------------
+def batch_confidence_score(
+    deviation_score: np.ndarray,
+    momentum_state: np.ndarray,
+    signal_agreement=1.0,
+    context_confirmation=0.0,
+    platform_leader=None,
+    explain: bool = True,
+) -> Dict:
+    """
+    compute_confidence_score for every entity. signal_agreement,
+    context_confirmation and platform_leader may be scalars or per-entity.
+    explain=False leaves out the explanation strings.
+    """
+    n = len(deviation_score)
+    signal_agreement = np.broadcast_to(np.asarray(signal_agreement, dtype=np.float64), (n,))
+    context_confirmation = np.broadcast_to(np.asarray(context_confirmation, dtype=np.float64), (n,))
+    if platform_leader is None or isinstance(platform_leader, str):
+        platform_leader = [platform_leader] * n
+
+    deviation_component = np.minimum(np.maximum(deviation_score / 3.0, 0.0), 1.0)
+    momentum_component = _select(
+        [momentum_state == s for s in MOMENTUM_WEIGHTS], list(MOMENTUM_WEIGHTS.values()), 0.1
+    ).astype(np.float64)
+
+    confidence = (
+        0.4 * deviation_component +
+        0.3 * momentum_component +
+        0.2 * signal_agreement +
+        0.1 * context_confirmation
+    )
+    confidence = py_round(np.minimum(confidence, 1.0), 3)
+
+    risk = _select([confidence >= 0.75, confidence >= 0.45], ["LOW", "MEDIUM"], "HIGH")
+
+    result = {
+        "confidence_score": confidence,
+        "risk_level": risk,
+    }
+    if explain:
+        result["explanation"] = batch_explanation(
+            deviation_score, momentum_state, signal_agreement, context_confirmation,
+            confidence, risk, platform_leader,
+        )
+    return result
+
+
+def _leader_part(platform_leader: str) -> str:
+    if not platform_leader or platform_leader == "unknown":
+        return ""
+    if platform_leader == "both":
+        return "Momentum is similar across platforms"
+    return f"{platform_leader.capitalize()} is leading this trend"
+
+
+def batch_explanation(
+    deviation_score,
+    momentum_state,
+    signal_agreement,
+    context_confirmation,
+    confidence,
+    risk,
+    platform_leader: List[Optional[str]],
+) -> np.ndarray:
+    """
+    generate_explanation for every entity.
+    """
+    leader_parts = {leader: _leader_part(leader) for leader in set(platform_leader)}
+
+    return _join_parts([
+        _select(
+            [deviation_score > 2, deviation_score > 1],
+            ["Buzz is significantly above normal baseline", "Buzz is moderately above baseline"],
+            "Buzz is close to normal levels",
+        ),
+        _select(
+            [momentum_state == "EMERGING", momentum_state == "PEAKING", momentum_state == "FATIGUED"],
+            [
+                "Momentum is building rapidly (early trend phase)",
+                "Trend is near peak attention",
+                "Momentum is slowing down",
+            ],
+            "Trend momentum is flat",
+        ),
+        _select(
+            [signal_agreement >= 0.75, signal_agreement >= 0.55],
+            ["Signals strongly align across platforms", "Signals are moderately aligned across platforms"],
+            "Signals diverge across platforms, reducing confidence",
+        ),
+        np.array([leader_parts[leader] for leader in platform_leader], dtype=object),
+        _select(
+            [context_confirmation > 0.5],
+            ["Context signals support this trend (e.g., holiday/event)"],
+            "Context signals provide limited support for this trend",
+        ),
+        "Overall confidence: " + _float_text(confidence) + " (Risk: " + risk + ")",
+    ])
+
+
+# -------------------------
+# Action window
+# -------------------------
+def batch_action_window(momentum_state, velocity, acceleration, deviation_score, explain: bool = True) -> Dict:
+    """
+    estimate_action_window for every entity (explain=False: without the
+    window_explanation strings).
+    """
+    base_hours = _select(
+        [momentum_state == "EMERGING", momentum_state == "PEAKING", momentum_state == "FATIGUED"],
+        [72, 24, 8],
+        48,
+    ).astype(np.float64)
+
+    base_hours = np.where(deviation_score > 3, base_hours * 0.7,
+                          np.where(deviation_score < 1, base_hours * 1.2, base_hours))
+    base_hours = np.where(acceleration < 0, base_hours * 0.6,
+                          np.where(acceleration > 0.2, base_hours * 0.8, base_hours))
+
+    hours = np.maximum(6, np.trunc(base_hours).astype(np.int64))
+
+    urgency = _select([hours <= 18, hours <= 48], ["NOW", "SOON"], "NORMAL")
+
+    result = {
+        "action_window_hours": hours,
+        "urgency": urgency,
+    }
+    if not explain:
+        return result
+
+    result["window_explanation"] = _join_parts([
+        _select(
+            [momentum_state == "EMERGING", momentum_state == "PEAKING", momentum_state == "FATIGUED"],
+            ["Trend is in early growth phase", "Trend is near peak attention", "Trend momentum is declining"],
+            "Trend momentum is stable",
+        ),
+        _select([deviation_score > 3], ["High spike suggests short-lived hype cycle"], ""),
+        _select([acceleration < 0], ["Engagement growth is slowing"], ""),
+        "Estimated effective window: ~" + hours.astype(str).astype(object) + " hours",
+    ])
+    return result
+
+
+# -------------------------
+# Action hint + platform bias
+# -------------------------
+def batch_action_hint(confidence_score, momentum_state) -> np.ndarray:
+    return _select(
+        [
+            (confidence_score > 0.8) & (momentum_state == "EMERGING"),
+            (confidence_score > 0.6) & (momentum_state == "PEAKING"),
+            momentum_state == "FATIGUED",
+        ],
+        [
+            "Launch promotion (early window)",
+            "Boost visibility (short window)",
+            "Avoid heavy spend; trend is cooling",
+        ],
+        "Monitor",
+    )
+
+
+def platform_bias_grid(momentum_state, velocity, confidence_score, grid: PlatformGrid = PLATFORM_GRID) -> Dict:
+    """
+    adjust_for_platform for every (entity, platform) pair in one step:
+    each field is an (entities x platforms) array, columns in
+    grid.platforms order. Phases are worked out as small integer codes and
+    only turned into labels at the end, through per-phase lookup tables.
+    """
+    momentum_state = np.asarray(momentum_state, dtype=object)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    confidence_score = np.asarray(confidence_score, dtype=np.float64)
+
+    # Code every phase label; the fixed phases come first
+    states, state_codes = np.unique(momentum_state.astype(str), return_inverse=True)
+    labels = list(PLATFORM_ACTIONS) + [str(s) for s in states if s not in PLATFORM_ACTIONS]
+    code_of = {label: code for code, label in enumerate(labels)}
+    state_codes = np.array([code_of[str(s)] for s in states], dtype=np.intp)[state_codes.reshape(-1)]
+
+    fast_platform = grid.trend_latency_hours <= 8
+    phase = np.where(
+        (velocity > 0.6)[:, None] & fast_platform[None, :], code_of["PEAKING"],
+        np.where((velocity < 0.2)[:, None], code_of["FATIGUED"], state_codes[:, None]),
+    )
+
+    label_table = np.array(labels, dtype=object)
+    urgency_table = np.array(
+        ["HIGH" if label == "PEAKING" else "MEDIUM" if label == "EMERGING" else "LOW" for label in labels], dtype=object
+    )
+    action_table = np.array([PLATFORM_ACTIONS.get(label, "Monitor") for label in labels], dtype=object)
+
+    return {
+        "adjusted_phase": label_table[phase],
+        "adjusted_confidence": py_round(confidence_score[:, None] * grid.data_maturity[None, :], 2),
+        "urgency": urgency_table[phase],
+        "recommended_action": action_table[phase],
+    }
+
+
+def batch_platform_bias(momentum_state, velocity, confidence_score, grid: PlatformGrid = PLATFORM_GRID) -> Dict[str, Dict]:
+    """
+    run_platform_bias_engine for every entity: platform -> column arrays.
+    """
+    scores = platform_bias_grid(momentum_state, velocity, confidence_score, grid)
+    return {
+        platform: {field: values[:, j] for field, values in scores.items()}
+        for j, platform in enumerate(grid.platforms)
+    }
+
+
+# -------------------------
+# Full pass
+# -------------------------
+def run_batch_inference(
+    matrix: np.ndarray,
+    signal_agreement=1.0,
+    context_confirmation=0.0,
+    platform_leader=None,
+    baseline: Optional[Dict] = None,
+    momentum: Optional[Dict] = None,
+    history: Optional[np.ndarray] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Dict:
+    """
+    Scores every row of an (entities x days) matrix in one pass.
+    Returns column arrays keyed like the /pulse/trends insight fields.
+    `baseline` / `momentum` may be passed in already computed (same shape
+    as batch_baseline_and_deviation / batch_momentum), e.g. from the
+    streaming entity states. `history`, a longer matrix ending with the
+    same days, feeds the multi-window baselines (default: `matrix`).
+    With `fields`, the optional parts (multi-window baselines, the two
+    explanations, platform bias) are only computed if listed.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    wanted = set(INSIGHT_FIELDS if fields is None else fields)
+
+    if baseline is None:
+        baseline = batch_baseline_and_deviation(matrix)
+    if momentum is None:
+        momentum = batch_momentum(matrix)
+    confidence = batch_confidence_score(
+        baseline["deviation_score"], momentum["momentum_state"],
+        signal_agreement, context_confirmation, platform_leader,
+        explain="explanation" in wanted,
+    )
+    action_window = batch_action_window(
+        momentum["momentum_state"], momentum["velocity"], momentum["acceleration"], baseline["deviation_score"],
+        explain="window_explanation" in wanted,
+    )
+
+    result = {
+        "baseline": baseline,
+        **momentum,
+        "deviation_score": baseline["deviation_score"],
+        **confidence,
+        **action_window,
+        "action_hint": batch_action_hint(confidence["confidence_score"], momentum["momentum_state"]),
+    }
+    if "baselines" in wanted:
+        result["baselines"] = BaselineStore(matrix if history is None else history).multi_window()
+    if "platform_bias" in wanted:
+        result["platform_bias"] = batch_platform_bias(
+            momentum["momentum_state"], momentum["velocity"], confidence["confidence_score"],
+        )
+    return result
+
+
+def batch_to_insights(trends: List[Dict], series: List[List[float]], result: Dict,
+                      fields: Optional[Collection[str]] = None) -> List[Dict]:
+    """
+    Per-entity insight dicts, shaped exactly like the /pulse/trends loop
+    output, or holding only `fields` (in the usual key order).
+    """
+    wanted = [key for key in INSIGHT_FIELDS if fields is None or key in fields]
+    columns = {}
+
+    for key in wanted:
+        if key in ("entity", "category"):
+            columns[key] = [t[key] for t in trends]
+        elif key == "series":
+            columns[key] = series
+        elif key == "current_value":
+            columns[key] = [row[-1] for row in series]
+        elif key == "baseline":
+            baseline = result["baseline"]
+            columns[key] = [
+                {"mean": mean, "std": std, "window": baseline["window"], "note": baseline["note"]}
+                for mean, std in zip(baseline["mean"].tolist(), baseline["std"].tolist())
+            ]
+        elif key == "baselines":
+            windows = [
+                (name, b["mean"].tolist(), b["std"].tolist(), b["window"], b["note"], b["deviation_score"].tolist())
+                for name, b in result["baselines"].items()
+            ]
+            columns[key] = [
+                {
+                    name: {
+                        "mean": means[i],
+                        "std": stds[i],
+                        "window": window,
+                        "note": note,
+                        "deviation_score": deviations[i],
+                    }
+                    for name, means, stds, window, note, deviations in windows
+                }
+                for i in range(len(trends))
+            ]
+        elif key == "platform_bias":
+            bias = [
+                (platform, [(field, values.tolist()) for field, values in platform_fields.items()])
+                for platform, platform_fields in result["platform_bias"].items()
+            ]
+            columns[key] = [
+                {platform: {field: values[i] for field, values in platform_fields} for platform, platform_fields in bias}
+                for i in range(len(trends))
+            ]
+        else:
+            columns[key] = result[key].tolist()
+
+    return [dict(zip(wanted, row)) for row in zip(*(columns[key] for key in wanted))]
@@ -3,7 +3,7 @@ import random
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from services.social_sources import SocialSource, SocialPost
+from src.services.social_sources import SocialSource, SocialPost
 
 
 class DummySocialSource(SocialSource):
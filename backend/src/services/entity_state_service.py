@@ -0,0 +1,303 @@
+# src/services/entity_state_service.py
+
+import json
+import math
+from collections import deque
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.db.connection import DB_PATH, get_connection
+from src.services.baseline_service import compute_baseline_stats, compute_deviation_score, rounds_exactly
+from src.services.momentum_service import classify_momentum_state
+
+SERIES_DAYS = 14         # buckets per entity window, as /pulse/trends uses
+VELOCITY_WINDOW = 3      # compute_velocity / compute_acceleration default
+RESYNC_EVERY = 64        # slides between exact recomputes of the running sums
+
+
+def _velocity(changes, n_values: int, window: int) -> float:
+    """
+    compute_velocity over a slice of `n_values` points whose % changes
+    (None where the step starts from 0) are `changes`.
+    """
+    if n_values < window + 1:
+        return 0.0
+    kept = [c for c in changes if c is not None]
+    if not kept:
+        return 0.0
+    return round(float(np.mean(kept)), 3)
+
+
+class EntityState:
+    """
+    Streaming baseline and momentum for one entity's last `size` buckets.
+    push() appends a bucket and revise() replaces the newest one, both in
+    O(1): a sliding Welford mean/variance over the history (every bucket
+    but the newest) and the last `window` % changes. baseline() and
+    momentum() return exactly what compute_baseline_and_deviation(series[:-1],
+    series[-1]) and compute_momentum(series) return for the same window.
+    """
+    def __init__(self, size: int = SERIES_DAYS, window: int = VELOCITY_WINDOW):
+        self.size = size
+        self.window = window
+        self.bucket: Optional[str] = None   # label of the newest bucket
+        self.values = deque(maxlen=size)
+        self.changes = deque(maxlen=window)
+        self.momentum_state: Optional[str] = None
+        # Welford sums over the history, values[:-1]
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._slides = 0
+
+    # -------------------------
+    # Updates
+    # -------------------------
+    def _resync(self):
+        history = list(self.values)[:-1]
+        self._n = len(history)
+        self._mean = float(np.mean(history)) if history else 0.0
+        self._m2 = float(np.sum((np.asarray(history, dtype=np.float64) - self._mean) ** 2)) if history else 0.0
+        self._slides = 0
+
+    def _history_add(self, x):
+        self._n += 1
+        delta = x - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (x - self._mean)
+
+    def _history_replace(self, old, new):
+        # Same count: `old` leaves the window as `new` joins it
+        delta = new - old
+        previous_mean = self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (new - self._mean + old - previous_mean)
+        self._slides += 1
+
+    def _change(self, prev, curr):
+        return None if prev == 0 else (curr - prev) / prev
+
+    def push(self, value, bucket: Optional[str] = None):
+        """
+        Appends the next bucket; the previous newest one joins the history.
+        """
+        if self.values:
+            newest = self.values[-1]
+            self.changes.append(self._change(newest, value))
+            if len(self.values) < self.size:
+                self._history_add(newest)
+            elif self._n:
+                # The oldest bucket leaves the window (and the history)
+                self._history_replace(self.values[0], newest)
+        self.values.append(value)
+        if self._slides >= RESYNC_EVERY:
+            self._resync()
+        self.bucket = bucket
+        self._classify()
+
+    def revise(self, value):
+        """
+        Replaces the newest bucket's value, e.g. today's engagement growing
+        between pulse runs. The history is unaffected.
+        """
+        if not self.values:
+            self.push(value, self.bucket)
+            return
+        self.values[-1] = value
+        if len(self.values) > 1:
+            self.changes[-1] = self._change(self.values[-2], value)
+        self._classify()
+
+    # -------------------------
+    # Outputs
+    # -------------------------
+    def baseline(self) -> Dict:
+        """
+        compute_baseline_and_deviation(series[:-1], series[-1]).
+        """
+        current = self.values[-1]
+        stats = self._baseline_stats()
+        return {
+            "baseline": stats,
+            "current_value": current,
+            "deviation_score": compute_deviation_score(current, stats["mean"], stats["std"]),
+        }
+
+    def _baseline_stats(self) -> Dict:
+        n = self._n
+        if n < 3:
+            return compute_baseline_stats(list(self.values)[:-1])
+
+        mean = self._mean
+        std = math.sqrt(max(self._m2, 0.0) / n)
+        if not rounds_exactly(mean, std, n):
+            return compute_baseline_stats(list(self.values)[:-1])
+
+        return {
+            "mean": round(mean, 2),
+            "std": round(std, 2),
+            "window": f"{n}_points",
+            "note": None,
+        }
+
+    def _velocities(self):
+        n_values = len(self.values)
+        velocity = _velocity(self.changes, n_values, self.window)
+        if n_values < 2 * self.window + 1:
+            return velocity, 0.0
+        # compute_acceleration's earlier slice, series[-(2w+1):-(w+1)], holds
+        # only w points, one short of what compute_velocity needs, so its
+        # velocity is always 0.0
+        earlier = _velocity((), self.window, self.window)
+        return velocity, round(velocity - earlier, 3)
+
+    def _classify(self):
+        velocity, acceleration = self._velocities()
+        self.momentum_state = classify_momentum_state(velocity, acceleration)
+
+    def momentum(self) -> Dict:
+        """
+        compute_momentum(series).
+        """
+        velocity, acceleration = self._velocities()
+        return {
+            "velocity": velocity,
+            "acceleration": acceleration,
+            "momentum_state": self.momentum_state,
+        }
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def to_json(self) -> str:
+        return json.dumps({
+            "size": self.size,
+            "window": self.window,
+            "bucket": self.bucket,
+            "values": list(self.values),
+            "changes": list(self.changes),
+            "momentum_state": self.momentum_state,
+            "welford": [self._n, self._mean, self._m2, self._slides],
+        })
+
+    @classmethod
+    def from_json(cls, text: str) -> "EntityState":
+        data = json.loads(text)
+        state = cls(size=data["size"], window=data["window"])
+        state.bucket = data["bucket"]
+        state.values.extend(data["values"])
+        state.changes.extend(data["changes"])
+        state.momentum_state = data["momentum_state"]
+        state._n, state._mean, state._m2, state._slides = data["welford"]
+        return state
+
+    @classmethod
+    def from_series(cls, series: List[float], end_bucket: Optional[str] = None,
+                    size: int = SERIES_DAYS, window: int = VELOCITY_WINDOW) -> "EntityState":
+        state = cls(size=size, window=window)
+        for value in series[-size:]:
+            state.push(value, end_bucket)
+        state._resync()
+        return state
+
+
+# -------------------------
+# Persisted states (one row per entity)
+# -------------------------
+LOAD_STATES_SQL = """
+    SELECT entity, state FROM entity_stream_state
+    WHERE entity IN (SELECT value FROM json_each(?))
+"""
+
+UPSERT_STATE_SQL = """
+    INSERT INTO entity_stream_state (entity, bucket, state) VALUES (?, ?, ?)
+    ON CONFLICT (entity) DO UPDATE SET bucket = excluded.bucket, state = excluded.state
+"""
+
+
+def load_entity_states(entities: List[str], db_path=DB_PATH) -> Dict[str, EntityState]:
+    rows = get_connection(db_path).execute(LOAD_STATES_SQL, (json.dumps(list(entities)),))
+    return {entity: EntityState.from_json(state) for entity, state in rows}
+
+
+def save_entity_states(states: Dict[str, EntityState], db_path=DB_PATH):
+    conn = get_connection(db_path)
+    with conn:
+        conn.executemany(
+            UPSERT_STATE_SQL,
+            [(entity, state.bucket, state.to_json()) for entity, state in states.items()],
+        )
+
+
+def _advance(state: Optional[EntityState], series: List[float], end_day: date) -> EntityState:
+    """
+    Brings `state` up to a daily `series` ending at `end_day`: revises the
+    day it last saw and pushes the days since. Rebuilds from the series
+    when there is no usable state or its finished days no longer match
+    (e.g. after a rollup rebuild).
+    """
+    end_bucket = end_day.isoformat()
+    if state is None or state.bucket is None or state.size != len(series):
+        return EntityState.from_series(series, end_bucket)
+
+    gap = (end_day - date.fromisoformat(state.bucket)).days
+    if gap < 0 or gap >= len(series):
+        return EntityState.from_series(series, end_bucket)
+
+    last = len(series) - 1 - gap   # index of the state's newest day in `series`
+    finished = list(state.values)[:-1]
+    # Only the overlap can be checked: the state's `gap` oldest days have
+    # already left the series window
+    if finished[gap:] != series[max(0, last - len(finished) + gap):last]:
+        return EntityState.from_series(series, end_bucket)
+
+    if state.values[-1] != series[last]:
+        state.revise(series[last])
+    for offset in range(1, gap + 1):
+        state.push(series[last + offset], (end_day - timedelta(days=gap - offset)).isoformat())
+    return state
+
+
+def advance_entity_states(series_by_entity: Dict[str, List[float]], end_day: date,
+                          db_path=DB_PATH, persist: bool = True) -> Dict[str, EntityState]:
+    """
+    Loads each entity's persisted state, advances it to its daily series
+    ending at `end_day`, and saves it back (unless `persist` is False, for
+    read paths that must not write). A run a few minutes after the last
+    one only revises today's bucket; the next day's run pushes one.
+    """
+    states = load_entity_states(list(series_by_entity), db_path)
+    states = {
+        entity: _advance(states.get(entity), series, end_day)
+        for entity, series in series_by_entity.items()
+    }
+    if persist:
+        save_entity_states(states, db_path)
+    return states
+
+
+def states_to_batch(states: List[EntityState]):
+    """
+    (baseline, momentum) shaped like batch_baseline_and_deviation and
+    batch_momentum, for run_batch_inference. All states must cover the
+    same number of buckets.
+    """
+    baselines = [state.baseline() for state in states]
+    momenta = [state.momentum() for state in states]
+    stats = [b["baseline"] for b in baselines]
+
+    baseline = {
+        "mean": np.array([s["mean"] for s in stats], dtype=np.float64),
+        "std": np.array([s["std"] for s in stats], dtype=np.float64),
+        "window": stats[0]["window"] if stats else f"{SERIES_DAYS - 1}_points",
+        "note": stats[0]["note"] if stats else None,
+        "deviation_score": np.array([b["deviation_score"] for b in baselines], dtype=np.float64),
+    }
+    momentum = {
+        "velocity": np.array([m["velocity"] for m in momenta], dtype=np.float64),
+        "acceleration": np.array([m["acceleration"] for m in momenta], dtype=np.float64),
+        "momentum_state": np.array([m["momentum_state"] for m in momenta], dtype=object),
+    }
+    return baseline, momentum
@@ -0,0 +1,112 @@
+import bisect
+import hashlib
+import io
+import os
+import threading
+from typing import List, Dict, NamedTuple
+
+import pandas as pd
+
+
+class _Snapshot(NamedTuple):
+    stamps: tuple      # (mtime_ns, size) per source file
+    hashes: tuple      # sha1 of each source file's content
+    dates: list        # holiday dates, ascending
+    rows: list         # (holiday_name, date, popularity_score), same order as dates
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _build_rows(holidays_bytes, popularity_bytes):
+    """
+    Same merge as the original per-request code: every holiday row, left
+    joined to its popularity score (0 when missing), sorted by date.
+    """
+    df_holidays = pd.read_csv(io.BytesIO(holidays_bytes), parse_dates=["date"])
+    df_pop = pd.read_csv(io.BytesIO(popularity_bytes))
+
+    df = pd.merge(
+        df_holidays,
+        df_pop,
+        left_on="name",
+        right_on="holiday_name",
+        how="left"
+    )
+    df["popularity_score"] = df["popularity_score"].fillna(0)
+    df = df[df["date"].notna()].sort_values("date", kind="stable")
+
+    return list(zip(df["name"], df["date"], df["popularity_score"].astype(float)))
+
+
+class HolidayIndex:
+    """
+    Holidays pre-merged with their popularity score and sorted by date, so an
+    upcoming-window query is two binary searches plus a slice.
+
+    Each lookup stats both source files. If mtime/size moved, the files are
+    hashed and the index is rebuilt only when the content really changed.
+    A rebuilt snapshot replaces the old one in a single assignment, so
+    concurrent requests see either the old or the new index, never a mix.
+    """
+
+    def __init__(self, holidays_path, popularity_path):
+        self.holidays_path = holidays_path
+        self.popularity_path = popularity_path
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def snapshot(self) -> _Snapshot:
+        """
+        Current index, reloaded first if a source file changed.
+        Raises FileNotFoundError if either file is missing.
+        """
+        stamps = (_stamp(self.holidays_path), _stamp(self.popularity_path))
+        snap = self._snapshot
+        if snap is not None and snap.stamps == stamps:
+            return snap
+
+        with self._lock:
+            snap = self._snapshot
+            if snap is not None and snap.stamps == stamps:
+                return snap
+
+            # Hash the exact bytes we parse, so the snapshot always matches its hashes
+            holidays_bytes = self.holidays_path.read_bytes()
+            popularity_bytes = self.popularity_path.read_bytes()
+            hashes = (
+                hashlib.sha1(holidays_bytes).hexdigest(),
+                hashlib.sha1(popularity_bytes).hexdigest(),
+            )
+
+            if snap is not None and snap.hashes == hashes:
+                # Touched but not changed
+                snap = snap._replace(stamps=stamps)
+            else:
+                rows = _build_rows(holidays_bytes, popularity_bytes)
+                snap = _Snapshot(stamps, hashes, [r[1] for r in rows], rows)
+
+            self._snapshot = snap
+            return snap
+
+    def upcoming(self, search_date: pd.Timestamp, days: int) -> List[Dict]:
+        """
+        Holidays with 0 <= (date - search_date).days <= days, in date order.
+        """
+        snap = self.snapshot()
+
+        # (date - search_date).days floors, so "<= days" means "< search_date + days + 1"
+        lo = bisect.bisect_left(snap.dates, search_date)
+        hi = bisect.bisect_left(snap.dates, search_date + pd.Timedelta(days=days + 1), lo)
+
+        return [
+            {
+                "holiday_name": name,
+                "date": holiday_date,
+                "days_from_today": (holiday_date - search_date).days,
+                "popularity_score": score,
+            }
+            for name, holiday_date, score in snap.rows[lo:hi]
+        ]
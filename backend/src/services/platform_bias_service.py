@@ -2,6 +2,14 @@
 
 from src.services.platform_profiles import PLATFORM_PROFILES
 
+# Recommended action per adjusted phase
+PLATFORM_ACTIONS = {
+    "PEAKING": "Launch promotion immediately",
+    "EMERGING": "Prepare promo creatives",
+    "FLAT": "Monitor trend",
+    "FATIGUED": "Avoid new campaigns"
+}
+
 
 def adjust_for_platform(raw_signal: dict, platform: str):
     profile = PLATFORM_PROFILES[platform]
@@ -28,18 +36,11 @@ def adjust_for_platform(raw_signal: dict, platform: str):
     else:
         urgency = "LOW"
 
-    action_map = {
-        "PEAKING": "Launch promotion immediately",
-        "EMERGING": "Prepare promo creatives",
-        "FLAT": "Monitor trend",
-        "FATIGUED": "Avoid new campaigns"
-    }
-
     return {
         "adjusted_phase": adjusted_phase,
         "adjusted_confidence": round(adjusted_confidence, 2),
         "urgency": urgency,
-        "recommended_action": action_map.get(adjusted_phase, "Monitor")
+        "recommended_action": PLATFORM_ACTIONS.get(adjusted_phase, "Monitor")
     }
 
 
@@ -1,22 +1,48 @@
 # src/services/platform_profiles.py
 
-PLATFORM_PROFILES = {
-    "uber_eats": {
-        "trend_latency_hours": 18,
-        "impulse_factor": 0.7,
-        "promo_sensitivity": 0.6,
-        "data_maturity": 0.9
-    },
-    "doordash": {
-        "trend_latency_hours": 6,
-        "impulse_factor": 0.9,
-        "promo_sensitivity": 0.8,
-        "data_maturity": 0.85
-    },
-    "retail": {
-        "trend_latency_hours": 72,
-        "impulse_factor": 0.3,
-        "promo_sensitivity": 0.4,
-        "data_maturity": 0.6
-    }
-}
+import json
+from pathlib import Path
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+# One entry per platform: adding a platform is a new entry in this file
+PROFILES_PATH = Path(__file__).resolve().parent / "platform_profiles.json"
+
+PROFILE_FIELDS = ("trend_latency_hours", "impulse_factor", "promo_sensitivity", "data_maturity")
+
+
+def load_platform_profiles(path=PROFILES_PATH) -> Dict[str, Dict]:
+    """
+    {platform: profile} from a JSON file, in file order.
+    """
+    with open(path, encoding="utf-8") as f:
+        profiles = json.load(f)
+
+    for platform, profile in profiles.items():
+        missing = [field for field in PROFILE_FIELDS if field not in profile]
+        if missing:
+            raise ValueError(f"Platform profile {platform!r} in {path} is missing: {', '.join(missing)}")
+    return profiles
+
+
+class PlatformGrid(NamedTuple):
+    platforms: tuple                  # column order of every (entities x platforms) grid
+    trend_latency_hours: np.ndarray
+    impulse_factor: np.ndarray
+    promo_sensitivity: np.ndarray
+    data_maturity: np.ndarray
+
+
+def build_platform_grid(profiles: Dict[str, Dict]) -> PlatformGrid:
+    """
+    The profiles as one array per field, one element per platform.
+    """
+    return PlatformGrid(
+        tuple(profiles),
+        *(np.array([profile[field] for profile in profiles.values()], dtype=np.float64) for field in PROFILE_FIELDS),
+    )
+
+
+PLATFORM_PROFILES = load_platform_profiles()
+PLATFORM_GRID = build_platform_grid(PLATFORM_PROFILES)
@@ -0,0 +1,137 @@
+# src/services/pulse_ranking.py
+
+import base64
+import json
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+SORT_KEYS = ("confidence_score", "deviation_score", "velocity")
+FILTER_FIELDS = ("momentum_state", "risk_level", "urgency")
+# Per-platform filters, applied to insight["platform_bias"][platform][field]
+PLATFORM_FILTER_FIELDS = {"platform_phase": "adjusted_phase", "platform_urgency": "urgency"}
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 500
+
+
+class PulseIndex(NamedTuple):
+    entities: np.ndarray            # entity names, snapshot order
+    scores: Dict[str, np.ndarray]   # sort key -> float64 column ("<platform>.adjusted_confidence" too)
+    fields: Dict[str, np.ndarray]   # filter field -> str column ("<platform>.<field>" too)
+    platforms: tuple
+    items: List[bytes]              # each insight, JSON-encoded
+    insights: List[Dict]            # the same insights, for field projections
+    positions: Dict[str, int]       # entity -> position
+
+
+def build_pulse_index(insights: List[Dict], items: List[bytes]) -> PulseIndex:
+    """
+    Column arrays of everything /pulse/trends can sort or filter on, built
+    once per snapshot so each page is a few vectorized passes.
+    """
+    platforms = tuple(insights[0]["platform_bias"]) if insights else ()
+
+    scores = {key: np.array([i[key] for i in insights], dtype=np.float64) for key in SORT_KEYS}
+    fields = {key: np.array([i[key] for i in insights], dtype=str) for key in FILTER_FIELDS}
+    for platform in platforms:
+        scores[f"{platform}.adjusted_confidence"] = np.array(
+            [i["platform_bias"][platform]["adjusted_confidence"] for i in insights], dtype=np.float64
+        )
+        for field in PLATFORM_FILTER_FIELDS.values():
+            fields[f"{platform}.{field}"] = np.array([i["platform_bias"][platform][field] for i in insights], dtype=str)
+
+    return PulseIndex(
+        entities=np.array([i["entity"] for i in insights], dtype=str),
+        scores=scores,
+        fields=fields,
+        platforms=platforms,
+        items=items,
+        insights=insights,
+        positions={insight["entity"]: position for position, insight in enumerate(insights)},
+    )
+
+
+# -------------------------
+# Cursors
+# -------------------------
+def encode_cursor(sort_column: str, score: float, entity: str) -> str:
+    raw = json.dumps([sort_column, score, entity], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column: str):
+    """
+    (score, entity) of the last row of the previous page. Raises ValueError
+    for a malformed cursor or one issued for a different sort.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, score, entity = json.loads(raw)
+        score = float(score)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort_column or not isinstance(entity, str):
+        raise ValueError("Cursor does not match this sort")
+    return score, entity
+
+
+# -------------------------
+# Page selection
+# -------------------------
+def select_page(index: PulseIndex, sort: str = "confidence_score", limit: int = DEFAULT_LIMIT,
+                cursor: Optional[str] = None, filters: Optional[Dict[str, List[str]]] = None,
+                platform: Optional[str] = None):
+    """
+    Positions of the next `limit` insights matching `filters`, ordered by
+    `sort` descending (ties by entity name), and the cursor for the page
+    after (None on the last page). With `platform`, confidence_score ranks
+    by that platform's adjusted confidence and the platform_* filters
+    apply to it. Only the best candidates are ever sorted.
+    """
+    filters = filters or {}
+    if platform is not None and platform not in index.platforms:
+        raise ValueError(f"Unknown platform: {platform}")
+
+    sort_column = f"{platform}.adjusted_confidence" if platform and sort == "confidence_score" else sort
+    scores = index.scores[sort_column]
+    mask = np.ones(len(index.entities), dtype=bool)
+
+    for name, allowed in filters.items():
+        if not allowed:
+            continue
+        if name in PLATFORM_FILTER_FIELDS:
+            if platform is None:
+                raise ValueError(f"{name} needs a platform")
+            column = index.fields[f"{platform}.{PLATFORM_FILTER_FIELDS[name]}"]
+        else:
+            column = index.fields[name]
+        mask &= np.isin(column, allowed)
+
+    if cursor:
+        last_score, last_entity = decode_cursor(cursor, sort_column)
+        # Keyset: strictly after the previous page's last row in (score desc, entity asc)
+        mask &= (scores < last_score) | ((scores == last_score) & (index.entities > last_entity))
+
+    candidates = np.flatnonzero(mask)
+    candidate_scores = scores[candidates]
+
+    if len(candidates) > limit:
+        # Partial selection: keep every candidate scoring at least the limit-th best
+        # (ties included), then order just those
+        kth = np.partition(candidate_scores, len(candidate_scores) - limit)[len(candidate_scores) - limit]
+        keep = candidate_scores >= kth
+        candidates, candidate_scores = candidates[keep], candidate_scores[keep]
+        remaining = int(mask.sum()) - limit
+    else:
+        remaining = 0
+
+    order = np.lexsort((index.entities[candidates], -candidate_scores))[:limit]
+    positions = candidates[order]
+
+    next_cursor = None
+    if remaining > 0:
+        last = positions[-1]
+        next_cursor = encode_cursor(sort_column, float(scores[last]), str(index.entities[last]))
+
+    return positions.tolist(), next_cursor
@@ -0,0 +1,346 @@
+# src/services/pulse_service.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.core.json_codec import dumps
+from src.schemas.social_signal_schema import SocialSignal
+from src.services.baseline_service import BASELINE_WINDOWS
+from src.services.mock_data_service import generate_mock_social_series, generate_mock_trends
+from src.services.social_ingestion_service import (
+    ingest_social_signals,
+    aggregate_to_trend_signal,
+    build_entity_time_series_batch,
+    compute_entity_platform_stats,
+)
+from src.services.batch_inference_service import INSIGHT_FIELDS, run_batch_inference, batch_to_insights
+from src.services.pulse_ranking import PulseIndex, build_pulse_index
+
+PULSE_SOURCES = ("mock", "social")
+PULSE_REFRESH_SECONDS = 300
+PULSE_STREAM_CHUNK = 500       # entities inferred per step when streaming
+PULSE_SERIES_DAYS = 14         # days in each insight's series
+PULSE_HISTORY_DAYS = max(BASELINE_WINDOWS) + 1   # days read for the multi-window baselines
+PULSE_PROJECTIONS_KEPT = 16    # encoded fields= projections cached across snapshots
+# What /pulse/trends/{entity}/explain needs to word an insight
+EXPLAIN_FIELDS = (
+    "entity", "deviation_score", "momentum_state", "velocity", "acceleration", "confidence_score",
+    "risk_level", "explanation", "action_window_hours", "urgency", "window_explanation",
+)
+
+
+def encode_payload(payload) -> bytes:
+    # Same encoding the API's FastJSONResponse uses
+    return dumps(payload)
+
+
+# -------------------------
+# Pulse computation
+# -------------------------
+def _pulse_trends(source: str, social_signals: Optional[List[SocialSignal]]):
+    if source == "social":
+        trend_signals = aggregate_to_trend_signal(social_signals)
+
+        return [
+            {
+                "entity": t.trend,
+                "category": "Social Trend",
+                "spike": True,
+                "holiday_soon": False,  # social trends not tied to holidays (v1)
+            }
+            for t in trend_signals
+        ]
+    return generate_mock_trends()
+
+
+def parse_fields(values: Optional[List[str]]) -> Optional[tuple]:
+    """
+    The insight fields asked for (repeated and/or comma-separated), in
+    payload order and always including "entity"; None for all fields.
+    Raises ValueError for unknown names.
+    """
+    names = {name.strip() for value in values or [] for name in value.split(",") if name.strip()}
+    if not names:
+        return None
+    unknown = names.difference(INSIGHT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    names.add("entity")
+    return tuple(field for field in INSIGHT_FIELDS if field in names)
+
+
+def _pulse_chunk(source: str, trends, platform_stats, fields: Optional[tuple] = None):
+    # Series + per-entity context, then batch inference for one slice of the trends
+    series_rows = []
+    signal_agreements = []
+    context_confirmations = []
+    platform_leaders = []
+
+    if source == "social":
+        # One grouped query for every entity's daily series. The insights
+        # carry the whole series anyway, so run_batch_inference derives
+        # baseline and momentum from the matrix in one vectorized pass.
+        # The longer history only feeds the multi-window baselines.
+        end_day = datetime.utcnow().date()
+        history_days = PULSE_HISTORY_DAYS if fields is None or "baselines" in fields else PULSE_SERIES_DAYS
+        history_by_entity = build_entity_time_series_batch(
+            [t["entity"] for t in trends], days=history_days, end_day=end_day
+        )
+        series_by_entity = {entity: history[-PULSE_SERIES_DAYS:] for entity, history in history_by_entity.items()}
+
+    for t in trends:
+
+        # 1) Time series
+        if source == "social":
+            series = series_by_entity[t["entity"]]
+        else:
+            series = generate_mock_social_series(
+                days=PULSE_SERIES_DAYS,
+                base=100,
+                spike=t.get("spike", True)
+            )
+        series_rows.append(series)
+
+        # 2) Signal agreement
+        if source == "social":
+            entity_stats = platform_stats.get(t["entity"], {})
+            signal_agreements.append(entity_stats.get("signal_agreement", 0.5))
+        else:
+            signal_agreements.append(0.8 if t["holiday_soon"] else 0.5)
+
+        # 3) Context confirmation
+        context_confirmations.append(1.0 if t["holiday_soon"] else 0.2)
+
+        # 4) Platform leader
+        if source == "social":
+            platform_leaders.append(entity_stats.get("platform_leader", "unknown"))
+        else:
+            platform_leaders.append(None)
+
+    history = None
+    if source == "social" and trends:
+        history = np.array([history_by_entity[t["entity"]] for t in trends], dtype=np.float64)
+
+    # --- Batch inference: baseline, momentum, confidence, action window,
+    # action hint and platform bias for every entity at once ---
+    result = run_batch_inference(
+        np.array(series_rows, dtype=np.float64),
+        signal_agreement=np.array(signal_agreements),
+        context_confirmation=np.array(context_confirmations),
+        platform_leader=platform_leaders,
+        history=history,
+        fields=fields,
+    )
+    return batch_to_insights(trends, series_rows, result, fields)
+
+
+def iter_pulse_insights(source: str = "mock", social_signals: Optional[List[SocialSignal]] = None,
+                        chunk_size: Optional[int] = PULSE_STREAM_CHUNK, fields: Optional[tuple] = None):
+    """
+    Yields the pulse insights in order, computing `chunk_size` entities at
+    a time (None: all at once), so only one chunk's series and insights
+    are alive at any point. In social mode the trends come from
+    `social_signals` (the latest ingested batch) and the series from the
+    DB. With `fields` (see parse_fields), parts nobody asked for are not computed.
+    """
+    social_signals = social_signals or []
+    trends = _pulse_trends(source, social_signals)
+    # One pass over the signals for every entity's platform attribution
+    platform_stats = compute_entity_platform_stats(social_signals) if source == "social" else None
+
+    chunk_size = chunk_size or max(len(trends), 1)
+    for start in range(0, len(trends), chunk_size):
+        yield from _pulse_chunk(source, trends[start:start + chunk_size], platform_stats, fields)
+
+
+def iter_pulse_ndjson(source: str = "mock", social_signals: Optional[List[SocialSignal]] = None,
+                      chunk_size: Optional[int] = PULSE_STREAM_CHUNK, fields: Optional[tuple] = None):
+    """
+    The insights as NDJSON lines (one encoded insight per line), produced
+    as each chunk is inferred.
+    """
+    for insight in iter_pulse_insights(source, social_signals, chunk_size, fields):
+        yield encode_payload(insight) + b"\n"
+
+
+def compute_pulse(source: str = "mock", social_signals: Optional[List[SocialSignal]] = None,
+                  fields: Optional[tuple] = None):
+    """
+    The full /pulse/trends payload (or its `fields` projection), inferred
+    in a single batch.
+    """
+    return {
+        "pulse_generated_at": source,
+        "insights": list(iter_pulse_insights(source, social_signals, chunk_size=None, fields=fields))
+    }
+
+
+def explain_insight(insight: Dict) -> Dict:
+    """
+    The prose for one insight plus the scores it is worded from.
+    """
+    return {field: insight[field] for field in EXPLAIN_FIELDS}
+
+
+# -------------------------
+# Snapshot cache
+# -------------------------
+class PulseSnapshot(NamedTuple):
+    version: int         # bumped only when the payload changes
+    etag: str            # quoted content hash, as sent in the ETag header
+    body: bytes          # the payload, already JSON-encoded
+    generated_at: float  # unix time of the computation
+    index: PulseIndex    # per-insight encodings + sort/filter columns for pages
+
+
+def encode_insights_payload(source: str, items: List[bytes], **extra) -> bytes:
+    """
+    encode_payload({"pulse_generated_at": source, "insights": [...], **extra})
+    from insights that are already encoded.
+    """
+    parts = [b'{"pulse_generated_at":', encode_payload(source), b',"insights":[', b",".join(items), b"]"]
+    for key, value in extra.items():
+        parts += [b",", encode_payload(key), b":", encode_payload(value)]
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def build_snapshot(payload: Dict, generated_at: float, current: Optional[PulseSnapshot] = None) -> PulseSnapshot:
+    """
+    Encodes and indexes a computed payload. Against `current` (the
+    snapshot it replaces), an unchanged payload keeps its version.
+    """
+    items = [encode_payload(insight) for insight in payload["insights"]]
+    body = encode_insights_payload(payload["pulse_generated_at"], items)
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    if current is not None and current.etag == etag:
+        return current._replace(generated_at=generated_at)
+    version = current.version + 1 if current else 1
+    index = build_pulse_index(payload["insights"], items)
+    return PulseSnapshot(version, etag, body, generated_at, index)
+
+
+def project_items(snapshot: PulseSnapshot, fields: tuple) -> List[bytes]:
+    """
+    The snapshot's insights, each JSON-encoded with only `fields`.
+    """
+    return [encode_payload({field: insight[field] for field in fields}) for insight in snapshot.index.insights]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check with weak comparison (W/ prefixes ignored).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class PulseSnapshotCache:
+    """
+    Latest pulse payload per source, pre-encoded, served from memory.
+    A background thread recomputes every source each `refresh_interval_s`;
+    in social mode that refresh is also when new signals are ingested and
+    entity states are saved, so reads never write. refresh() recomputes
+    from the last ingested batch.
+    """
+    def __init__(self, sources=PULSE_SOURCES, refresh_interval_s: float = PULSE_REFRESH_SECONDS,
+                 compute: Callable = compute_pulse, ingest: Optional[Callable] = ingest_social_signals):
+        self.sources = tuple(sources)
+        self.refresh_interval_s = refresh_interval_s
+        self._compute = compute
+        self._ingest = ingest
+        self._snapshots: Dict[str, PulseSnapshot] = {}
+        self._signals: Dict[str, list] = {}
+        self._locks = {source: threading.Lock() for source in self.sources}
+        self._stop = threading.Event()
+        self._thread = None
+        self._projections = OrderedDict()   # (source, etag, fields) -> encoded items
+        self._projection_lock = threading.Lock()
+
+    def get(self, source: str) -> PulseSnapshot:
+        """
+        The current snapshot, computing it first if there is none yet.
+        """
+        snapshot = self._snapshots.get(source)
+        if snapshot is None:
+            snapshot = self.refresh(source)
+        return snapshot
+
+    def items(self, source: str, snapshot: PulseSnapshot, fields: Optional[tuple] = None) -> List[bytes]:
+        """
+        The snapshot's insights, each JSON-encoded, holding only `fields`
+        (all of them when None). A projection is encoded once per snapshot
+        and kept for the next request asking for the same fields.
+        """
+        if fields is None:
+            return snapshot.index.items
+
+        key = (source, snapshot.etag, fields)
+        with self._projection_lock:
+            items = self._projections.get(key)
+            if items is not None:
+                self._projections.move_to_end(key)
+                return items
+
+        items = project_items(snapshot, fields)
+        with self._projection_lock:
+            self._projections[key] = items
+            while len(self._projections) > PULSE_PROJECTIONS_KEPT:
+                self._projections.popitem(last=False)
+        return items
+
+    def refresh(self, source: str, ingest: bool = False, newer_than: Optional[float] = None) -> PulseSnapshot:
+        """
+        Recomputes `source` and swaps in the result. Callers that pass
+        `newer_than` share a snapshot computed after that time instead of
+        queueing up duplicate recomputes.
+        """
+        with self._locks[source]:
+            current = self._snapshots.get(source)
+            if newer_than is not None and current is not None and current.generated_at >= newer_than:
+                return current
+
+            if source == "social" and ingest and self._ingest is not None:
+                self._signals[source] = self._ingest()
+
+            generated_at = time.time()
+            payload = self._compute(source, self._signals.get(source))
+            snapshot = build_snapshot(payload, generated_at, current)
+            self._snapshots[source] = snapshot
+            return snapshot
+
+    def refresh_all(self, ingest: bool = True):
+        for source in self.sources:
+            try:
+                self.refresh(source, ingest=ingest)
+            except Exception as e:
+                # Keep serving the previous snapshot; try again next cycle
+                print(f"⚠️ Pulse refresh failed for {source}: {type(e).__name__}: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval_s):
+            self.refresh_all()
+
+    def start(self, preload: bool = True):
+        if preload:
+            self.refresh_all()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pulse-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,16 +1,18 @@
 # src/services/social_ingestion_service.py
 
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 import random
 import json
-import sqlite3
-from pathlib import Path
-from random import randint
+import time
 from datetime import timedelta
 
+from pydantic import TypeAdapter
+
 from src.schemas.social_signal_schema import SocialSignal
 from src.schemas.trend_signal_schema import TrendSignal
+from src.db.connection import DB_PATH, get_connection
+from src.services.social_rollup_service import apply_signal_rollups, stash_previous_counters
 
 
 # -------------------------
@@ -73,42 +75,106 @@ def ingest_social_signals(source: Optional[SocialSource] = None) -> List[SocialS
 # -------------------------
 # DB Persistence (MVP)
 # -------------------------
-DB_PATH = Path(__file__).resolve().parent.parent / "db" / "foodlens.db"
-
-def save_raw_social_signals(signals: List[SocialSignal]):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    for s in signals:
-        backdated_time = datetime.utcnow() - timedelta(days=randint(0, 6))
-
-        cursor.execute("""
-            INSERT INTO raw_social_signals (
-                platform, post_id, posted_at, text,
-                hashtags, food_entities,
-                likes, comments, shares, views,
-                creator_followers, geo, ingested_at,
-                raw_payload
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+# Re-ingesting a post refreshes its counters; the row keeps its id,
+# posted_at and ingested_at, so it stays in the same day of the series
+UPSERT_RAW_SIGNAL_SQL = """
+    INSERT INTO raw_social_signals (
+        platform, post_id, posted_at, text,
+        hashtags, food_entities,
+        likes, comments, shares, views,
+        creator_followers, geo, ingested_at,
+        raw_payload
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (platform, post_id) DO UPDATE SET
+        likes = excluded.likes,
+        comments = excluded.comments,
+        shares = excluded.shares,
+        views = excluded.views,
+        creator_followers = excluded.creator_followers,
+        raw_payload = excluded.raw_payload
+"""
+
+# Only rows the upsert just created need entity links (updates keep food_entities),
+# and AUTOINCREMENT ids only grow, so they are the rows past the pre-batch MAX(id)
+INSERT_NEW_SIGNAL_ENTITIES_SQL = """
+    INSERT OR IGNORE INTO social_signal_entities (entity, signal_id)
+    SELECT j.value, r.id
+    FROM raw_social_signals r, json_each(r.food_entities) j
+    WHERE r.id > ?
+"""
+
+INGEST_BATCH_SIZE = 10_000
+
+# Compiled list[str] -> JSON encoder; several times cheaper than json.dumps per call.
+# The core serializers are called directly: TypeAdapter.dump_json and
+# model_dump_json add Python-level overhead per call that adds up at 50k rows/s.
+_STR_LIST_JSON = TypeAdapter(List[str]).serializer.to_json
+_SIGNAL_JSON = SocialSignal.__pydantic_serializer__.to_json
+
+def _simulated_ingest_times(n: int, now: datetime) -> List[str]:
+    # 👈 ingestion time (simulated): one of the last 7 days
+    backdated_times = [(now - timedelta(days=d)).isoformat() for d in range(7)]
+    return random.choices(backdated_times, k=n)
+
+
+def _signal_rows(signals: List[SocialSignal], ingested_at: List[str]):
+    dumps = _STR_LIST_JSON
+    payload = _SIGNAL_JSON
+
+    return [
+        (
             s.platform,
             s.post_id,
             s.timestamp,  # assuming s.timestamp is the post time
             s.text,
-            json.dumps(s.hashtags),
-            json.dumps(s.food_entities),
+            dumps(s.hashtags).decode(),
+            dumps(s.food_entities).decode(),
             s.engagement.get("likes", 0),
             s.engagement.get("comments", 0),
             s.engagement.get("shares", 0),
             s.engagement.get("views", 0),   # 👈 new
             s.creator_followers,
             s.geo,
-            backdated_time.isoformat(),     # 👈 ingestion time (simulated)
-            json.dumps(s.dict())            # 👈 store full raw object
-        ))
+            backdated_time,
+            payload(s).decode(),            # 👈 store full raw object
+        )
+        for s, backdated_time in zip(signals, ingested_at)
+    ]
+
+
+def save_raw_social_signals(signals: List[SocialSignal], batch_size: int = INGEST_BATCH_SIZE, db_path=DB_PATH):
+    """
+    Bulk upserts signals on (platform, post_id), `batch_size` per transaction,
+    and updates the engagement rollups in the same transaction. Returns {"rows", "seconds", "rows_per_s"} for the whole call.
+    """
+    conn = get_connection(db_path)
+    now = datetime.utcnow()
+    start = time.perf_counter()
+
+    for i in range(0, len(signals), batch_size):
+        batch = signals[i:i + batch_size]
+        ingested_at = _simulated_ingest_times(len(batch), now)
+        rows = _signal_rows(batch, ingested_at)
+        # One transaction per batch; readers keep using their WAL snapshot meanwhile
+        with conn:
+            # Take the write lock up front: rollup deltas are taken against the
+            # rows as they were before this batch, so no other writer may land
+            # in between
+            conn.execute("BEGIN IMMEDIATE")
+            stash_previous_counters(conn, batch)
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM raw_social_signals").fetchone()[0]
+            conn.executemany(UPSERT_RAW_SIGNAL_SQL, rows)
+            conn.execute(INSERT_NEW_SIGNAL_ENTITIES_SQL, (last_id,))
+            apply_signal_rollups(conn, last_id)
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": len(signals),
+        "seconds": round(seconds, 4),
+        "rows_per_s": round(len(signals) / max(seconds, 1e-9), 1),
+    }
+
 
-    conn.commit()
-    conn.close()
 # -------------------------
 # Aggregation + Adapters (Existing Logic)
 # -------------------------
@@ -164,20 +230,20 @@ def social_signals_to_series(signals, days: int = 14):
     return series
 
 
-def compute_platform_momentum(signals):
-    platform_totals = {}
-
-    for s in signals:
-        engagement = (
-            s.engagement.get("likes", 0)
-            + s.engagement.get("comments", 0)
-            + s.engagement.get("shares", 0)
-        )
+def _engagement(s) -> int:
+    return (
+        s.engagement.get("likes", 0)
+        + s.engagement.get("comments", 0)
+        + s.engagement.get("shares", 0)
+    )
 
-        platform_totals.setdefault(s.platform, 0)
-        platform_totals[s.platform] += engagement
 
+def normalize_platform_totals(platform_totals):
+    """
+    Platform engagement totals scaled to the busiest platform (0-1).
+    """
     max_val = max(platform_totals.values()) if platform_totals else 1
+    max_val = max_val or 1
 
     return {
         platform: round(total / max_val, 2)
@@ -185,9 +251,17 @@ def compute_platform_momentum(signals):
     }
 
 
-def compute_platform_signal_agreement(signals):
-    platform_velocity = compute_platform_momentum(signals)
+def compute_platform_momentum(signals):
+    platform_totals = {}
+
+    for s in signals:
+        platform_totals.setdefault(s.platform, 0)
+        platform_totals[s.platform] += _engagement(s)
 
+    return normalize_platform_totals(platform_totals)
+
+
+def agreement_from_platform_velocity(platform_velocity):
     if len(platform_velocity) <= 1:
         return 0.5
 
@@ -202,9 +276,7 @@ def compute_platform_signal_agreement(signals):
         return 0.4
 
 
-def detect_platform_leader(signals):
-    platform_velocity = compute_platform_momentum(signals)
-
+def leader_from_platform_velocity(platform_velocity):
     if not platform_velocity:
         return "unknown"
 
@@ -219,26 +291,56 @@ def detect_platform_leader(signals):
         return "both"
 
     return top_platform
+
+
+def compute_platform_signal_agreement(signals):
+    return agreement_from_platform_velocity(compute_platform_momentum(signals))
+
+
+def detect_platform_leader(signals):
+    return leader_from_platform_velocity(compute_platform_momentum(signals))
+
+
+def compute_entity_platform_stats(signals):
+    """
+    One pass over the signals building (entity, platform) engagement totals,
+    then platform velocity, agreement and leader per entity.
+    Returns {entity: {"platform_velocity", "signal_agreement", "platform_leader"}}.
+    """
+    totals = {}
+
+    for s in signals:
+        engagement = _engagement(s)
+        for food in set(s.food_entities):
+            platform_totals = totals.setdefault(food, {})
+            platform_totals[s.platform] = platform_totals.get(s.platform, 0) + engagement
+
+    stats = {}
+    for food, platform_totals in totals.items():
+        platform_velocity = normalize_platform_totals(platform_totals)
+        stats[food] = {
+            "platform_velocity": platform_velocity,
+            "signal_agreement": agreement_from_platform_velocity(platform_velocity),
+            "platform_leader": leader_from_platform_velocity(platform_velocity),
+        }
+
+    return stats
 # -------------------------
 # DB Read (Debug)
 # -------------------------
+RECENT_RAW_SIGNALS_SQL = """
+    SELECT
+        platform, post_id, posted_at, text,
+        hashtags, food_entities,
+        likes, comments, shares,
+        creator_followers, geo, ingested_at
+    FROM raw_social_signals
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
 def fetch_recent_raw_social_signals(limit: int = 10):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT
-            platform, post_id, timestamp, text,
-            hashtags, food_entities,
-            likes, comments, shares,
-            creator_followers, geo, ingested_at
-        FROM raw_social_signals
-        ORDER BY id DESC
-        LIMIT ?
-    """, (limit,))
-
-    rows = cursor.fetchall()
-    conn.close()
+    rows = get_connection(DB_PATH).execute(RECENT_RAW_SIGNALS_SQL, (limit,)).fetchall()
 
     results = []
     for r in rows:
@@ -261,38 +363,52 @@ def fetch_recent_raw_social_signals(limit: int = 10):
 # -------------------------
 # Time Series from DB (MVP)
 # -------------------------
-def build_entity_time_series_from_db(food: str, days: int = 14):
+# Entities arrive as one JSON array, so the SQL text (and its cached
+# prepared statement) is the same however many entities are requested.
+# Reads the daily rollup: O(days x platforms) rows per entity, whatever the raw volume
+ENTITY_DAILY_ENGAGEMENT_SQL = """
+    SELECT
+        entity,
+        bucket as day,
+        SUM(likes + comments + shares) as total_engagement
+    FROM social_engagement_rollups
+    WHERE granularity = 'day'
+      AND entity IN (SELECT value FROM json_each(?))
+      AND bucket >= ?
+      AND bucket <= ?
+    GROUP BY entity, bucket
+"""
+
+def build_entity_time_series_batch(foods: List[str], days: int = 14, end_day: Optional[date] = None):
     """
-    Build a simple daily engagement time series for a given food entity
-    from raw_social_signals table.
+    Daily engagement series for many food entities in one grouped query
+    over the daily rollup. Returns {food: [engagement per day]}
+    covering the `days` days up to `end_day` (default: today, UTC, the
+    clock ingested_at is written with). Days without signals are 0.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT
-            substr(ingested_at, 1, 10) as day,
-            SUM(likes + comments + shares) as total_engagement
-        FROM raw_social_signals
-        WHERE food_entities LIKE ?
-        GROUP BY day
-        ORDER BY day ASC
-        LIMIT ?
-    """, (f'%"{food}"%', days))
-
-    rows = cursor.fetchall()
-    conn.close()
-
-    # If no history yet, fallback
-    if not rows:
-        return [0] * days
+    foods = list(dict.fromkeys(foods))
+    end_day = end_day or datetime.utcnow().date()
+    start_day = end_day - timedelta(days=days - 1)
+    day_index = {(start_day + timedelta(days=i)).isoformat(): i for i in range(days)}
+
+    series = {food: [0] * days for food in foods}
+    if not foods or days <= 0:
+        return series
 
-    series = [r[1] for r in rows]
+    rows = get_connection(DB_PATH).execute(
+        ENTITY_DAILY_ENGAGEMENT_SQL,
+        (json.dumps(foods), start_day.isoformat(), end_day.isoformat()),
+    ).fetchall()
 
-    # Pad if fewer days than requested
-    if len(series) < days:
-        padding = [series[0]] * (days - len(series))
-        series = padding + series
+    for food, day, total in rows:
+        series[food][day_index[day]] = total
 
     return series
-datetime.utcnow().isoformat()
\ No newline at end of file
+
+
+def build_entity_time_series_from_db(food: str, days: int = 14):
+    """
+    Build a simple daily engagement time series for a given food entity
+    from raw_social_signals table.
+    """
+    return build_entity_time_series_batch([food], days=days)[food]
@@ -0,0 +1,147 @@
+# src/services/social_rollup_service.py
+
+import argparse
+import json
+from typing import List
+
+from src.db.connection import DB_PATH, get_connection
+from src.schemas.social_signal_schema import SocialSignal
+
+# Buckets are ingested_at prefixes: "YYYY-MM-DD" (day) and "YYYY-MM-DDTHH" (hour)
+GRANULARITIES = {"day": 10, "hour": 13}
+
+
+# -------------------------
+# Incremental maintenance (ingest path)
+# -------------------------
+# Counters of the batch's already-stored posts as they were before its upsert.
+# TEMP: each ingest connection has its own.
+CREATE_PREVIOUS_COUNTERS_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS ingest_previous_counters (
+        id INTEGER PRIMARY KEY,
+        likes INTEGER, comments INTEGER, shares INTEGER, views INTEGER
+    )
+"""
+
+# Keys are [platform, post_id] pairs; OR IGNORE: a post repeated in the batch
+STASH_PREVIOUS_COUNTERS_SQL = """
+    INSERT OR IGNORE INTO temp.ingest_previous_counters (id, likes, comments, shares, views)
+    SELECT r.id, r.likes, r.comments, r.shares, r.views
+    FROM json_each(?) k
+    JOIN raw_social_signals r
+      ON r.platform = json_extract(k.value, '$[0]')
+     AND r.post_id = json_extract(k.value, '$[1]')
+"""
+
+_GRANULARITY_ROWS = ", ".join(f"('{name}', {width})" for name, width in GRANULARITIES.items())
+
+# New posts (ids past the pre-batch MAX(id)) add their counters and one post;
+# re-ingested posts add only the change, in the bucket of their stored
+# ingested_at. Posts are summed per (hour, platform, entity list) first, so
+# each distinct list is expanded into its entities once (first occurrence
+# of a repeated entity only, as social_signal_entities holds it).
+APPLY_ROLLUP_DELTAS_SQL = f"""
+    WITH granularities (granularity, width) AS (VALUES {_GRANULARITY_ROWS}),
+    hourly AS (
+        SELECT
+            r.food_entities, substr(r.ingested_at, 1, {GRANULARITIES['hour']}) AS hour, COALESCE(r.platform, 'unknown') AS platform,
+            SUM(COALESCE(r.likes, 0)) AS likes, SUM(COALESCE(r.comments, 0)) AS comments,
+            SUM(COALESCE(r.shares, 0)) AS shares, SUM(COALESCE(r.views, 0)) AS views, COUNT(*) AS posts
+        FROM raw_social_signals r
+        WHERE r.id > ?1 AND r.ingested_at IS NOT NULL   -- written by this batch: valid JSON
+        GROUP BY hour, platform, r.food_entities
+        UNION ALL
+        SELECT
+            r.food_entities, substr(r.ingested_at, 1, {GRANULARITIES['hour']}) AS hour, COALESCE(r.platform, 'unknown') AS platform,
+            SUM(COALESCE(r.likes, 0) - COALESCE(p.likes, 0)), SUM(COALESCE(r.comments, 0) - COALESCE(p.comments, 0)),
+            SUM(COALESCE(r.shares, 0) - COALESCE(p.shares, 0)), SUM(COALESCE(r.views, 0) - COALESCE(p.views, 0)), 0
+        FROM temp.ingest_previous_counters p
+        CROSS JOIN raw_social_signals r ON r.id = p.id   -- CROSS JOIN: drive from the batch
+        WHERE r.ingested_at IS NOT NULL AND json_valid(r.food_entities)
+        GROUP BY hour, platform, r.food_entities
+    )
+    INSERT INTO social_engagement_rollups (
+        granularity, entity, bucket, platform,
+        likes, comments, shares, views, posts
+    )
+    SELECT
+        g.granularity, j.value AS entity, substr(h.hour, 1, g.width) AS bucket, h.platform,
+        SUM(h.likes), SUM(h.comments), SUM(h.shares), SUM(h.views), SUM(h.posts)
+    FROM hourly h, json_each(h.food_entities) j, granularities g
+    WHERE j.key = (SELECT MIN(k.key) FROM json_each(h.food_entities) k WHERE k.value = j.value)
+    GROUP BY g.granularity, entity, bucket, h.platform
+    ON CONFLICT (granularity, entity, bucket, platform) DO UPDATE SET
+        likes = likes + excluded.likes,
+        comments = comments + excluded.comments,
+        shares = shares + excluded.shares,
+        views = views + excluded.views,
+        posts = posts + excluded.posts
+"""
+
+
+def stash_previous_counters(conn, signals: List[SocialSignal]):
+    """
+    Keeps the stored counters of the batch's already-ingested posts for
+    apply_signal_rollups. Call inside the ingest transaction (holding the
+    write lock), before the raw upsert.
+    """
+    conn.execute(CREATE_PREVIOUS_COUNTERS_SQL)
+    keys = [[s.platform, s.post_id] for s in signals]
+    conn.execute(STASH_PREVIOUS_COUNTERS_SQL, (json.dumps(keys),))
+
+
+def apply_signal_rollups(conn, last_id: int):
+    """
+    Adds the batch's engagement to the rollups in one statement: new posts
+    (ids past `last_id`, MAX(id) before the upsert) in full, re-ingested
+    ones as deltas against their stashed counters. Call inside the ingest
+    transaction, after the raw upsert.
+    """
+    conn.execute(APPLY_ROLLUP_DELTAS_SQL, (last_id,))
+    conn.execute("DELETE FROM temp.ingest_previous_counters")
+
+
+# -------------------------
+# Rebuild / backfill
+# -------------------------
+REBUILD_ROLLUP_SQL = """
+    INSERT INTO social_engagement_rollups (
+        granularity, entity, bucket, platform,
+        likes, comments, shares, views, posts
+    )
+    SELECT
+        ?, e.entity, substr(r.ingested_at, 1, ?) AS bucket, COALESCE(r.platform, 'unknown') AS platform,
+        COALESCE(SUM(r.likes), 0), COALESCE(SUM(r.comments), 0),
+        COALESCE(SUM(r.shares), 0), COALESCE(SUM(r.views), 0),
+        COUNT(*)
+    FROM social_signal_entities e
+    JOIN raw_social_signals r ON r.id = e.signal_id
+    WHERE r.ingested_at IS NOT NULL
+    GROUP BY e.entity, bucket, platform
+"""
+
+
+def rebuild_rollups(db_path=DB_PATH):
+    """
+    Recomputes every rollup bucket from raw_social_signals in one
+    transaction. Returns the number of rollup rows written.
+    """
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute("DELETE FROM social_engagement_rollups")
+        for granularity, width in GRANULARITIES.items():
+            conn.execute(REBUILD_ROLLUP_SQL, (granularity, width))
+    return conn.execute("SELECT COUNT(*) FROM social_engagement_rollups").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild social engagement rollups from raw_social_signals.")
+    parser.add_argument("--db", default=str(DB_PATH), help="SQLite database (default: src/db/foodlens.db)")
+    args = parser.parse_args()
+
+    rows = rebuild_rollups(args.db)
+    print(f"✅ Rebuilt {rows:,} rollup rows in {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# tests/test_baseline_service.py
+
+import numpy as np
+import pytest
+
+from src.services.baseline_service import (
+    BASELINE_WINDOWS,
+    BaselineStore,
+    compute_baseline_and_deviation,
+)
+
+
+@pytest.mark.parametrize("scale, decimals", [(20.0, 2), (0.3, 3), (5.0, None)])
+def test_multi_window_matches_scalar_on_float_series(scale, decimals):
+    rng = np.random.default_rng(11)
+    matrix = rng.normal(100.0, scale, (300, 95))
+    if decimals is not None:
+        matrix = matrix.round(decimals)
+    baselines = BaselineStore(matrix).multi_window()
+
+    for window in BASELINE_WINDOWS:
+        batch = baselines[f"{window}d"]
+        points = min(window, matrix.shape[1] - 1)
+        for row, series in enumerate(matrix.tolist()):
+            expected = compute_baseline_and_deviation(series[-1 - points:-1], series[-1])
+            assert float(batch["mean"][row]) == expected["baseline"]["mean"]
+            assert float(batch["std"][row]) == expected["baseline"]["std"]
+            assert float(batch["deviation_score"][row]) == expected["deviation_score"]
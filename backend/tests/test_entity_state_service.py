@@ -0,0 +1,64 @@
+# tests/test_entity_state_service.py
+
+from datetime import date, timedelta
+
+from src.db.connection import close_connections
+from src.db.init_db import init_db
+from src.services.baseline_service import compute_baseline_and_deviation
+from src.services.entity_state_service import EntityState, _advance, advance_entity_states, load_entity_states
+from src.services.momentum_service import compute_momentum
+
+END_DAY = date(2026, 3, 14)
+
+
+def test_one_day_advance_pushes_without_rebuild(monkeypatch):
+    series = [float(10 + (i * 7) % 5) for i in range(15)]
+    state = EntityState.from_series(series[:-1], (END_DAY - timedelta(days=1)).isoformat())
+
+    pushed = []
+    original_push = EntityState.push
+
+    def spy_push(self, value, bucket=None):
+        pushed.append((value, bucket))
+        original_push(self, value, bucket)
+
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("state was rebuilt from the series")
+
+    monkeypatch.setattr(EntityState, "push", spy_push)
+    monkeypatch.setattr(EntityState, "from_series", no_rebuild)
+
+    advanced = _advance(state, series[1:], END_DAY)
+
+    assert advanced is state
+    assert pushed == [(series[-1], END_DAY.isoformat())]
+    assert advanced.baseline() == compute_baseline_and_deviation(series[1:-1], series[-1])
+    assert advanced.momentum() == compute_momentum(series[1:])
+
+
+def test_changed_finished_day_rebuilds():
+    series = [float(i) for i in range(15)]
+    state = EntityState.from_series(series[:-1], (END_DAY - timedelta(days=1)).isoformat())
+    revised = series[1:]
+    revised[3] += 1.0
+
+    advanced = _advance(state, revised, END_DAY)
+
+    assert advanced is not state
+    assert list(advanced.values) == revised
+
+
+def test_advance_persists_only_when_asked(tmp_path):
+    db_path = tmp_path / "states.db"
+    init_db(db_path)
+    series = {"ramen": [float(i) for i in range(14)]}
+    try:
+        advance_entity_states(series, END_DAY, db_path, persist=False)
+        assert load_entity_states(["ramen"], db_path) == {}
+
+        advance_entity_states(series, END_DAY, db_path)
+        saved = load_entity_states(["ramen"], db_path)["ramen"]
+        assert saved.bucket == END_DAY.isoformat()
+        assert list(saved.values) == series["ramen"]
+    finally:
+        close_connections()
@@ -0,0 +1,50 @@
+# tests/test_init_db.py
+
+import json
+import sqlite3
+
+from src.db.connection import close_connections, get_connection
+from src.db.init_db import init_db
+
+# Schema from before (platform, post_id) became the upsert key
+OLD_SCHEMA = """
+CREATE TABLE raw_social_signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    platform TEXT, post_id TEXT, posted_at TEXT, text TEXT, hashtags TEXT,
+    food_entities TEXT, likes INTEGER, comments INTEGER, shares INTEGER,
+    views INTEGER, creator_followers INTEGER, geo TEXT, ingested_at TEXT,
+    raw_payload TEXT
+);
+CREATE TABLE social_signal_entities (
+    entity TEXT NOT NULL,
+    signal_id INTEGER NOT NULL REFERENCES raw_social_signals(id),
+    PRIMARY KEY (entity, signal_id)
+) WITHOUT ROWID;
+"""
+
+
+def test_upgrade_collapses_duplicates_that_have_mappings(tmp_path):
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(OLD_SCHEMA)
+    for likes in (10, 25):
+        signal_id = conn.execute(
+            "INSERT INTO raw_social_signals (platform, post_id, food_entities, likes, comments, shares, views, ingested_at) "
+            "VALUES ('tiktok', 'p1', ?, ?, 0, 0, 0, '2026-03-14T10:00:00')",
+            (json.dumps(["ramen"]), likes),
+        ).lastrowid
+        conn.execute("INSERT INTO social_signal_entities VALUES ('ramen', ?)", (signal_id,))
+    conn.commit()
+    conn.close()
+
+    try:
+        init_db(db_path)
+        conn = get_connection(db_path)
+        rows = conn.execute("SELECT id, likes FROM raw_social_signals").fetchall()
+        assert [likes for _, likes in rows] == [25]
+        mappings = conn.execute("SELECT entity, signal_id FROM social_signal_entities").fetchall()
+        assert mappings == [("ramen", rows[0][0])]
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        close_connections()
@@ -0,0 +1,31 @@
+# tests/test_json_codec.py
+
+import numpy as np
+import pytest
+
+from src.core import json_codec
+
+PAYLOAD = {
+    "entity": "ramen",
+    "deviation_score": float("nan"),
+    "velocity": np.float64("inf"),
+    "series": np.array([1.5, np.nan, -np.inf, 4.0]),
+    "baselines": {"7d": {"mean": 12.34, "std": float("-inf"), "note": None}},
+    "history": [(1, 2.5), [np.int64(3), True]],
+}
+
+
+def test_stdlib_fallback_writes_non_finite_floats_as_null(monkeypatch):
+    monkeypatch.setattr(json_codec, "orjson", None)
+    assert json_codec.dumps(PAYLOAD) == (
+        b'{"entity":"ramen","deviation_score":null,"velocity":null,"series":[1.5,null,null,4.0],'
+        b'"baselines":{"7d":{"mean":12.34,"std":null,"note":null}},"history":[[1,2.5],[3,true]]}'
+    )
+
+
+def test_fallback_matches_orjson(monkeypatch):
+    if json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    fast = json_codec.dumps(PAYLOAD)
+    monkeypatch.setattr(json_codec, "orjson", None)
+    assert json_codec.dumps(PAYLOAD) == fast
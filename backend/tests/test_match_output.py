@@ -0,0 +1,31 @@
+# tests/test_match_output.py
+
+from src.process.match_output import iter_match_frames, open_match_writer, parse_price
+
+
+def test_parse_price_reads_numbers_out_of_text():
+    assert parse_price("12.99 USD") == 12.99
+    assert parse_price("$1,299.00") == 1299.0
+    assert parse_price("12,99 €") == 12.99
+    assert parse_price(8) == 8.0
+    assert parse_price("market price") is None
+    assert parse_price(None) is None
+    assert parse_price(float("nan")) is None
+
+
+def test_parquet_writer_accepts_string_prices(tmp_path):
+    path = tmp_path / "matches.parquet"
+    writer = open_match_writer(path)
+    writer.write_rows([
+        ("Taco Day", "2026-10-04", "taco", 1, "Fish Taco", 12.5),
+        ("Taco Day", "2026-10-04", "taco", 2, "Birria Taco", "12.99 USD"),
+        ("Taco Day", "2026-10-04", "taco", 3, "Taco Flight", "ask your server"),
+    ])
+    writer.write_rows([("Taco Day", "2026-10-04", "taco", 4, "Al Pastor", None)])
+    writer.close()
+
+    frame = next(iter_match_frames(path, ["restaurant_id", "price"]))
+    prices = dict(zip(frame["restaurant_id"], frame["price"].tolist()))
+    assert prices[1] == 12.5
+    assert prices[2] == 12.99
+    assert prices[3] != prices[3] and prices[4] != prices[4]   # missing -> NaN
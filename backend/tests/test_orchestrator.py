@@ -0,0 +1,121 @@
+# tests/test_orchestrator.py
+
+import time
+
+from src.db.connection import close_connections, get_connection
+from src.db.init_db import init_db
+from src.ingestion.fake_ingestors import BlockingFakeIngestor, FakeLatencyIngestor
+from src.ingestion.orchestrator import ingest_all, register_source
+from src.services.social_ingestion_service import save_raw_social_signals
+
+KEYWORDS = ["nachos", "ramen", "boba", "birria"]
+POSTS_PER_KEYWORD = 5
+
+
+class TimedIngestor(FakeLatencyIngestor):
+    """
+    FakeLatencyIngestor that records when each fetch starts.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = []
+
+    async def fetch_recent_signals(self, keyword):
+        self.started.append(time.monotonic())
+        return await super().fetch_recent_signals(keyword)
+
+
+def _recording_save(saved):
+    def save(batch, batch_size, db_path):
+        saved.extend((s.platform, s.post_id) for s in batch)
+        return save_raw_social_signals(batch, batch_size, db_path)
+    return save
+
+
+def _stored_keys(db_path):
+    rows = get_connection(db_path).execute("SELECT platform, post_id FROM raw_social_signals")
+    return sorted(rows.fetchall())
+
+
+def _expected_keys(platforms):
+    return sorted(
+        (platform, f"{platform}_{keyword}_{i}")
+        for platform in platforms for keyword in KEYWORDS for i in range(POSTS_PER_KEYWORD)
+    )
+
+
+def test_every_row_is_written_exactly_once(tmp_path):
+    db_path = tmp_path / "orchestrator.db"
+    init_db(db_path)
+    platforms = ["tiktok", "instagram", "youtube"]
+    sources = [
+        register_source(FakeLatencyIngestor("tiktok", latency_s=0.01, jitter_s=0.02,
+                                            posts_per_keyword=POSTS_PER_KEYWORD)),
+        register_source(FakeLatencyIngestor("instagram", latency_s=0.0,
+                                            posts_per_keyword=POSTS_PER_KEYWORD)),
+        register_source(BlockingFakeIngestor("youtube", latency_s=0.01,
+                                             posts_per_keyword=POSTS_PER_KEYWORD)),
+    ]
+    saved = []
+    try:
+        # A small batch size splits the run over several writes
+        stats = ingest_all(sources, KEYWORDS, batch_size=7, db_path=db_path, save=_recording_save(saved))
+
+        expected = _expected_keys(platforms)
+        assert sorted(saved) == expected
+        assert _stored_keys(db_path) == expected
+        assert stats["written"] == len(expected)
+        assert stats["writes"] > 1
+        assert all(s["errors"] == 0 for s in stats["sources"].values())
+    finally:
+        close_connections()
+
+
+def test_per_source_rate_limit_holds(tmp_path):
+    db_path = tmp_path / "orchestrator.db"
+    init_db(db_path)
+    rate = 20.0
+    keywords = [f"dish{i}" for i in range(8)]
+    limited = TimedIngestor("tiktok", latency_s=0.0, posts_per_keyword=1)
+    unlimited = TimedIngestor("instagram", latency_s=0.0, posts_per_keyword=1)
+    sources = [
+        register_source(limited, rate_per_s=rate, burst=1, max_concurrency=8),
+        register_source(unlimited, max_concurrency=8),
+    ]
+    try:
+        ingest_all(sources, keywords, db_path=db_path)
+
+        assert len(limited.started) == len(keywords)
+        started = sorted(limited.started)
+        # One token per 1 / rate seconds after the first (small slack for timer granularity)
+        for i in range(1, len(started)):
+            assert started[i] - started[0] >= i / rate - 0.01
+        # The limit is per source: the other one is not held back
+        assert max(unlimited.started) - min(unlimited.started) < (len(keywords) - 1) / rate
+    finally:
+        close_connections()
+
+
+def test_failing_source_neither_hangs_nor_loses_other_rows(tmp_path):
+    db_path = tmp_path / "orchestrator.db"
+    init_db(db_path)
+    sources = [
+        register_source(FakeLatencyIngestor("tiktok", latency_s=0.0, posts_per_keyword=POSTS_PER_KEYWORD)),
+        register_source(FakeLatencyIngestor("instagram", latency_s=0.0, fail_rate=1.0)),
+        # Never answers within its timeout, like a stuck API
+        register_source(FakeLatencyIngestor("youtube", latency_s=60.0), timeout_s=0.2),
+        # Kept short: its abandoned thread still holds interpreter exit until it wakes
+        register_source(BlockingFakeIngestor("reddit", latency_s=1.0), timeout_s=0.2),
+    ]
+    try:
+        start = time.perf_counter()
+        stats = ingest_all(sources, KEYWORDS, db_path=db_path)
+        assert time.perf_counter() - start < 5
+
+        assert _stored_keys(db_path) == _expected_keys(["tiktok"])
+        assert stats["sources"]["tiktok"]["errors"] == 0
+        for name in ("instagram", "youtube", "reddit"):
+            assert stats["sources"][name]["errors"] == len(KEYWORDS)
+            assert stats["sources"][name]["signals"] == 0
+    finally:
+        close_connections()
@@ -0,0 +1,29 @@
+# tests/test_pulse_schema.py
+
+import pytest
+from pydantic import ValidationError
+
+from src.benchmarks.bench_pulse_snapshot import make_compute
+from src.schemas.pulse_schema import PulseInsight, PulseResponse
+from src.services.pulse_service import parse_fields
+
+
+def test_response_model_accepts_full_and_projected_insights():
+    payload = make_compute(5, 14, 7)("mock")
+    PulseResponse.model_validate(payload)
+    for insight in payload["insights"]:
+        PulseInsight.model_validate(insight)
+
+    fields = parse_fields(["confidence_score,risk_level"])
+    projected = {
+        "pulse_generated_at": "mock",
+        "insights": [{field: insight[field] for field in fields} for insight in payload["insights"]],
+    }
+    model = PulseResponse.model_validate(projected)
+    assert model.insights[0].confidence_score == payload["insights"][0]["confidence_score"]
+    assert model.insights[0].series is None
+
+
+def test_response_model_requires_entity():
+    with pytest.raises(ValidationError):
+        PulseResponse.model_validate({"pulse_generated_at": "mock", "insights": [{"risk_level": "LOW"}]})
@@ -0,0 +1,69 @@
+# tests/test_pulse_trends.py
+
+import json
+import random
+
+from src.api import main
+from src.services.pulse_service import PulseSnapshotCache, compute_pulse
+
+DEFAULTS = dict(
+    source="mock", fresh=False, response_format="json", sort=None, limit=None, cursor=None,
+    momentum_state=None, risk_level=None, urgency=None, platform=None, platform_phase=None,
+    platform_urgency=None, fields=None, if_none_match=None,
+)
+
+
+def _pulse_trends(**params):
+    # Called directly, so every Query default has to be filled in
+    return main.pulse_trends(**{**DEFAULTS, **params})
+
+
+def test_uncached_source_honours_paging_and_fields():
+    random.seed(5)
+    insights = json.loads(_pulse_trends(source="other").body)["insights"]
+    random.seed(5)
+    response = _pulse_trends(source="other", sort="confidence_score", limit=2, fields=["risk_level"])
+
+    body = json.loads(response.body)
+    expected = sorted(insights, key=lambda i: (-i["confidence_score"], i["entity"]))[:2]
+    assert body["insights"] == [{"entity": i["entity"], "risk_level": i["risk_level"]} for i in expected]
+    assert body["next_cursor"]
+
+
+def test_uncached_source_applies_filters():
+    random.seed(5)
+    insights = json.loads(_pulse_trends(source="other").body)["insights"]
+    random.seed(5)
+    response = _pulse_trends(source="other", risk_level=["HIGH"], response_format="ndjson")
+
+    lines = [json.loads(line) for line in response.body.splitlines()]
+    assert {i["entity"] for i in lines} == {i["entity"] for i in insights if i["risk_level"] == "HIGH"}
+
+
+def test_ndjson_serves_the_same_snapshot_as_json(monkeypatch):
+    runs = []
+
+    def compute(source, social_signals=None):
+        # Each run sees different mock data, so a recompute shows up in the body
+        runs.append(source)
+        random.seed(len(runs))
+        return compute_pulse(source)
+
+    monkeypatch.setattr(main, "PULSE_CACHE", PulseSnapshotCache(sources=["mock"], compute=compute, ingest=None))
+
+    def insights(**params):
+        return json.loads(_pulse_trends(**params).body)["insights"]
+
+    def ndjson(**params):
+        response = _pulse_trends(response_format="ndjson", **params)
+        return [json.loads(line) for line in response.body.splitlines()], response.headers["ETag"]
+
+    first = insights()
+    assert ndjson()[0] == first
+
+    lines, etag = ndjson(fresh=True)
+    assert len(runs) == 2
+    assert lines != first
+    assert lines == insights()
+    assert etag != _pulse_trends().headers["ETag"]
+    assert _pulse_trends(response_format="ndjson", if_none_match=etag).status_code == 304
@@ -0,0 +1,39 @@
+# tests/test_social_rollup_service.py
+
+from src.benchmarks.bench_ingest import make_signals
+from src.db.connection import close_connections, get_connection
+from src.db.init_db import init_db
+from src.services.social_ingestion_service import save_raw_social_signals
+from src.services.social_rollup_service import rebuild_rollups
+
+ROLLUPS_SQL = """
+    SELECT granularity, entity, bucket, platform, likes, comments, shares, views, posts
+    FROM social_engagement_rollups
+    ORDER BY granularity, entity, bucket, platform
+"""
+
+
+def test_incremental_rollups_match_a_rebuild(tmp_path):
+    db_path = tmp_path / "rollups.db"
+    init_db(db_path)
+    signals = make_signals(600, seed=3)
+    try:
+        save_raw_social_signals(signals[:400], batch_size=150, db_path=db_path)
+
+        # Re-ingest with changed counters (up and down), plus new posts, and a
+        # post repeated within one batch
+        for i, s in enumerate(signals[:400]):
+            s.engagement["likes"] += 7 if i % 2 else -3
+            s.engagement["views"] = i
+        repeated = signals[10].model_copy(deep=True)
+        repeated.engagement["shares"] += 100
+        save_raw_social_signals(signals + [repeated], batch_size=250, db_path=db_path)
+
+        conn = get_connection(db_path)
+        incremental = conn.execute(ROLLUPS_SQL).fetchall()
+        assert incremental
+
+        rebuild_rollups(db_path)
+        assert incremental == conn.execute(ROLLUPS_SQL).fetchall()
+    finally:
+        close_connections()